@@ -0,0 +1,400 @@
+"""
+Benchmark harness for the BillingPlatform client. It starts the mock server with a synthetic dataset,
+runs each client operation in its own process and writes the results as JSON. See README.md in this directory.
+"""
+import argparse
+import importlib.util
+import json
+import multiprocessing
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable
+
+try:
+    import resource
+except ImportError: # Not available on Windows
+    resource = None
+
+
+REPO_ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'src')) # Benchmark the working tree
+
+from billingplatform import BillingPlatform # noqa: E402
+from billingplatform.instrumentation import Instrumentation # noqa: E402
+from billingplatform.ratelimit import RetryPolicy # noqa: E402
+
+
+SQL: str = 'SELECT Id, Name, Description, Status FROM ACCOUNT WHERE 1=1'
+
+
+# Operations
+# Each operation runs one unit of work against the client and returns the number of rows it read or wrote.
+def _records(config: dict, rng: random.Random, with_id: bool = True) -> list[dict]:
+    return [
+        {**({'Id': str(rng.randint(1, config['rows']))} if with_id else {}), 'Name': f'Benchmark {rng.random()}', 'Status': 'ACTIVE'}
+        for _ in range(config['batch_size'])
+    ]
+
+
+def op_query(bp: BillingPlatform, config: dict, rng: random.Random) -> int:
+    return len(bp.query(SQL, offset=rng.randint(0, max(config['rows'] - config['page_size'], 0)), limit=config['page_size'])['queryResponse'])
+
+
+def op_page_query(bp: BillingPlatform, config: dict, rng: random.Random) -> int:
+    _rows: int = 0
+
+    for _page, _response in enumerate(bp.page_query(SQL, page_size=config['page_size']), start=1):
+        _rows += len(_response.get('queryResponse', []))
+        if _page >= config['pages']:
+            break
+
+    return _rows
+
+
+def op_iter_rows(bp: BillingPlatform, config: dict, rng: random.Random) -> int:
+    _rows: int = 0
+
+    for _ in bp.iter_rows(SQL, page_size=config['page_size'], row_type='tuple'):
+        _rows += 1
+        if _rows >= config['pages'] * config['page_size']:
+            break
+
+    return _rows
+
+
+def op_retrieve_by_id(bp: BillingPlatform, config: dict, rng: random.Random) -> int:
+    bp.retrieve_by_id('ACCOUNT', rng.randint(1, config['rows']))
+    return 1
+
+
+def op_retrieve_by_query(bp: BillingPlatform, config: dict, rng: random.Random) -> int:
+    _records: object = bp.retrieve_by_query('ACCOUNT', f'Id = {rng.randint(1, config["rows"])}')['retrieveResponse']
+    return len(_records) if isinstance(_records, list) else 1
+
+
+def op_retrieve_by_ids(bp: BillingPlatform, config: dict, rng: random.Random) -> int:
+    return len(bp.retrieve_by_ids('ACCOUNT', [rng.randint(1, config['rows']) for _ in range(config['batch_size'])]).records)
+
+
+def op_create(bp: BillingPlatform, config: dict, rng: random.Random) -> int:
+    bp.create('ACCOUNT', _records(config, rng, with_id=False))
+    return config['batch_size']
+
+
+def op_update(bp: BillingPlatform, config: dict, rng: random.Random) -> int:
+    bp.update('ACCOUNT', _records(config, rng))
+    return config['batch_size']
+
+
+def op_upsert(bp: BillingPlatform, config: dict, rng: random.Random) -> int:
+    bp.upsert('ACCOUNT', _records(config, rng), externalIDFieldName='Id')
+    return config['batch_size']
+
+
+def op_delete(bp: BillingPlatform, config: dict, rng: random.Random) -> int:
+    bp.delete('ACCOUNT', [{'Id': str(rng.randint(1, config['rows']))} for _ in range(config['batch_size'])])
+    return config['batch_size']
+
+
+def op_undelete(bp: BillingPlatform, config: dict, rng: random.Random) -> int:
+    bp.undelete('ACCOUNT', [{'Id': str(rng.randint(1, config['rows']))} for _ in range(config['batch_size'])])
+    return config['batch_size']
+
+
+def op_batch_write(bp: BillingPlatform, config: dict, rng: random.Random) -> int:
+    _records_to_write: list[dict] = [_record for _ in range(10) for _record in _records(config, rng, with_id=False)]
+    return bp.batch_write('create', 'ACCOUNT', _records_to_write).succeeded
+
+
+OPERATIONS: dict[str, Callable[[BillingPlatform, dict, random.Random], int]] = {
+    'query': op_query,
+    'page_query': op_page_query,
+    'iter_rows': op_iter_rows,
+    'retrieve_by_id': op_retrieve_by_id,
+    'retrieve_by_query': op_retrieve_by_query,
+    'retrieve_by_ids': op_retrieve_by_ids,
+    'create': op_create,
+    'update': op_update,
+    'upsert': op_upsert,
+    'delete': op_delete,
+    'undelete': op_undelete,
+    'batch_write': op_batch_write,
+}
+
+
+# Harness
+def _peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+
+    _maxrss: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return _maxrss / (1024 * 1024) if sys.platform == 'darwin' else _maxrss / 1024 # Bytes on macOS, KiB on Linux
+
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+
+    return statistics.quantiles(values, n=100, method='inclusive')[min(max(round(q * 100) - 1, 0), 98)]
+
+
+def run_operation(name: str, config: dict) -> dict:
+    """
+    Run one operation for the configured number of iterations and measure it. Runs in a fresh process, so the peak RSS belongs to this operation alone.
+
+    :param name: The name of the operation (a key of OPERATIONS).
+    :param config: The benchmark configuration.
+    :return: The measurements of the operation.
+    """
+    _request_latencies: list[float] = []
+    _instrumentation: Instrumentation = Instrumentation(after_request=[lambda _event: _request_latencies.append(_event.elapsed)])
+    _bp: BillingPlatform = BillingPlatform(base_url=config['base_url'],
+                                           username='benchmark',
+                                           password='benchmark',
+                                           pool_maxsize=max(config['concurrency'], 10),
+                                           retry_policy=RetryPolicy(max_retries=config['retries']) if config['retries'] else None,
+                                           instrumentation=_instrumentation)
+    _operation: Callable = OPERATIONS[name]
+    _errors: list[Exception] = []
+
+    for _ in range(config['warmup']):
+        try:
+            _operation(_bp, config, random.Random(config['seed']))
+        except Exception as e: # Injected faults can fail warmup calls too
+            _errors.append(e)
+
+    _request_latencies.clear()
+    _errors.clear()
+    _call_latencies: list[float] = []
+
+    def _timed(_iteration: int) -> int:
+        _start: float = time.perf_counter()
+
+        try:
+            _rows: int = _operation(_bp, config, random.Random(config['seed'] + _iteration))
+        except Exception as e: # Calls that still fail after retries are counted, not fatal, so degraded runs can be measured
+            _errors.append(e)
+            _rows = 0
+
+        _call_latencies.append(time.perf_counter() - _start)
+        return _rows
+
+    _start: float = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=config['concurrency']) as _executor:
+        _rows: int = sum(_executor.map(_timed, range(config['iterations'])))
+
+    _seconds: float = time.perf_counter() - _start
+    _peak_rss: float | None = _peak_rss_mb()
+
+    return {
+        'operation': name,
+        'iterations': config['iterations'],
+        'concurrency': config['concurrency'],
+        'rows': _rows,
+        'requests': len(_request_latencies),
+        'errors': len(_errors),
+        'seconds': round(_seconds, 4),
+        'rows_per_sec': round(_rows / _seconds, 1),
+        'requests_per_sec': round(len(_request_latencies) / _seconds, 1),
+        'request_p50_ms': round(_percentile(_request_latencies, 0.5) * 1000, 3),
+        'request_p99_ms': round(_percentile(_request_latencies, 0.99) * 1000, 3),
+        'call_p50_ms': round(_percentile(_call_latencies, 0.5) * 1000, 3),
+        'call_p99_ms': round(_percentile(_call_latencies, 0.99) * 1000, 3),
+        'peak_rss_mb': round(_peak_rss, 1) if _peak_rss is not None else None,
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as _socket:
+        _socket.bind(('127.0.0.1', 0))
+        return _socket.getsockname()[1]
+
+
+def start_server(rows: int, port: int, threads: int = 16, faults: str | None = None, timeout: float = 300.0) -> subprocess.Popen:
+    """
+    Start the mock server with a synthetic dataset and wait until it accepts connections.
+    The server runs on waitress when it is installed, and on the Flask development server otherwise.
+
+    :param rows: The number of rows in the synthetic dataset.
+    :param port: The port to listen on.
+    :param threads: The number of server threads, when running on waitress (default is 16).
+    :param faults: The fault profile of the server: a built-in profile name or the path of a JSON profile (optional).
+    :param timeout: The number of seconds to wait for the server (default is 300).
+    :return: The server process.
+    :raises RuntimeError: If the server exits or does not start in time.
+    """
+    _environment: dict = {**os.environ, 'PYTHONPATH': os.path.join(REPO_ROOT, 'mock_server'), 'MOCK_SERVER_ROWS': str(rows)}
+
+    if faults:
+        _environment['MOCK_SERVER_FAULTS'] = os.path.abspath(faults) if os.path.isfile(faults) else faults
+
+    # Prefer the production WSGI server, falling back to the Flask development server
+    if importlib.util.find_spec('waitress') is not None:
+        _command: list[str] = [sys.executable, 'mock_server/server.py', '--server', 'waitress', '--host', '127.0.0.1', '--port', str(port), '--threads', str(threads)]
+    else:
+        _command = [sys.executable, '-m', 'flask', '--app', 'mock_server/server.py', 'run', '--port', str(port), '--with-threads']
+
+    _process: subprocess.Popen = subprocess.Popen(_command, cwd=REPO_ROOT, env=_environment, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    _deadline: float = time.monotonic() + timeout
+
+    while time.monotonic() < _deadline:
+        if _process.poll() is not None:
+            raise RuntimeError(f'Mock server exited with code {_process.returncode}.')
+
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                return _process
+        except OSError:
+            time.sleep(0.2)
+
+    _process.terminate()
+    raise RuntimeError(f'Mock server did not start within {timeout} seconds.')
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Compare results against a baseline run and print the change of each operation.
+
+    :param results: The current results.
+    :param baseline: The baseline results (ex. from the previous release).
+    :param threshold: The throughput drop, in percent, that counts as a regression.
+    :return: The names of the operations that regressed.
+    """
+    _baseline: dict = {_result['operation']: _result for _result in baseline['results']}
+    _regressions: list[str] = []
+
+    print(f'\n{"operation":<20}{"rows/s":>14}{"change":>10}{"p99 ms":>12}{"change":>10}')
+
+    for _result in results['results']:
+        _before: dict | None = _baseline.get(_result['operation'])
+
+        if _before is None:
+            continue
+
+        _throughput_change: float = (_result['rows_per_sec'] / _before['rows_per_sec'] - 1) * 100 if _before['rows_per_sec'] else 0.0
+        _latency_change: float = (_result['request_p99_ms'] / _before['request_p99_ms'] - 1) * 100 if _before['request_p99_ms'] else 0.0
+        print(f'{_result["operation"]:<20}{_result["rows_per_sec"]:>14.1f}{_throughput_change:>+9.1f}%{_result["request_p99_ms"]:>12.2f}{_latency_change:>+9.1f}%')
+
+        if _throughput_change < -threshold:
+            _regressions.append(_result['operation'])
+
+    return _regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    _parser: argparse.ArgumentParser = argparse.ArgumentParser(description='Benchmark the BillingPlatform client against the mock server.')
+    _parser.add_argument('--rows', type=int, default=100_000, help='Rows in the synthetic dataset (default: 100000).')
+    _parser.add_argument('--operations', nargs='+', choices=sorted(OPERATIONS), default=list(OPERATIONS), help='Operations to run (default: all).')
+    _parser.add_argument('--iterations', type=int, default=50, help='Measured calls per operation (default: 50).')
+    _parser.add_argument('--warmup', type=int, default=2, help='Unmeasured calls per operation (default: 2).')
+    _parser.add_argument('--concurrency', type=int, default=1, help='Threads calling each operation (default: 1).')
+    _parser.add_argument('--page-size', type=int, default=1000, help='Rows per page for query operations (default: 1000).')
+    _parser.add_argument('--pages', type=int, default=5, help='Pages read by each paging call (default: 5).')
+    _parser.add_argument('--batch-size', type=int, default=50, help='Records per write or retrieve_by_ids call (default: 50).')
+    _parser.add_argument('--seed', type=int, default=0, help='Random seed for Ids and payloads (default: 0).')
+    _parser.add_argument('--faults', help='Fault profile of the mock server: a built-in profile name or a JSON profile file (default: none).')
+    _parser.add_argument('--retries', type=int, default=0, help='Retries per request, with the default RetryPolicy backoff (default: 0).')
+    _parser.add_argument('--base-url', help='Benchmark an already running server instead of starting the mock server.')
+    _parser.add_argument('--output', help='Where to write the JSON results (default: benchmarks/results/<timestamp>.json).')
+    _parser.add_argument('--compare', help='A previous results file to compare against.')
+    _parser.add_argument('--threshold', type=float, default=10.0, help='Throughput drop in percent that fails --compare (default: 10).')
+    _args: argparse.Namespace = _parser.parse_args(argv)
+
+    _server: subprocess.Popen | None = None
+    _base_url: str = _args.base_url
+
+    if _base_url is None:
+        _port: int = _free_port()
+        print(f'Starting mock server with {_args.rows} rows on port {_port}...')
+        _server = start_server(_args.rows, _port, threads=max(_args.concurrency * 2, 16), faults=_args.faults)
+        _base_url = f'http://127.0.0.1:{_port}'
+
+    _config: dict = {
+        'base_url': _base_url,
+        'rows': _args.rows,
+        'iterations': _args.iterations,
+        'warmup': _args.warmup,
+        'concurrency': _args.concurrency,
+        'page_size': _args.page_size,
+        'pages': _args.pages,
+        'batch_size': _args.batch_size,
+        'seed': _args.seed,
+        'faults': _args.faults,
+        'retries': _args.retries,
+    }
+    _results: dict = {
+        'meta': {
+            'version': _package_version(),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'config': {_key: _value for _key, _value in _config.items() if _key != 'base_url'},
+        },
+        'results': [],
+    }
+
+    try:
+        _context = multiprocessing.get_context('spawn')
+
+        for _name in _args.operations:
+            with _context.Pool(1) as _pool:
+                _result: dict = _pool.apply(run_operation, (_name, _config))
+
+            _results['results'].append(_result)
+            print(f'{_name:<20}{_result["rows_per_sec"]:>12.1f} rows/s{_result["requests_per_sec"]:>10.1f} req/s'
+                  f'  p50 {_result["request_p50_ms"]:.2f} ms  p99 {_result["request_p99_ms"]:.2f} ms  peak RSS {_result["peak_rss_mb"]} MB'
+                  + (f'  errors {_result["errors"]}' if _result['errors'] else ''))
+    finally:
+        if _server is not None:
+            _server.terminate()
+            _server.wait()
+
+    _output: str = _args.output or os.path.join(REPO_ROOT, 'benchmarks', 'results', f'{datetime.now():%Y%m%d-%H%M%S}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(_output)), exist_ok=True)
+
+    with open(_output, 'w') as _file:
+        json.dump(_results, _file, indent=2)
+
+    print(f'Results written to {_output}')
+
+    if _args.compare:
+        with open(_args.compare) as _file:
+            _regressions: list[str] = compare(_results, json.load(_file), _args.threshold)
+
+        if _regressions:
+            print(f'Throughput regressed by more than {_args.threshold}% for: {", ".join(_regressions)}')
+            return 1
+
+    return 0
+
+
+def _package_version() -> str | None:
+    try:
+        from importlib.metadata import version
+        return version('billingplatform')
+    except Exception:
+        return None
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,350 @@
+"""
+Fault and latency injection for the mock server, so client concurrency and retry behavior can be exercised against
+a server that degrades like production does.
+
+A fault profile is a JSON-compatible dictionary:
+
+    {
+        "name": "degraded",
+        "seed": 42,
+        "default": {
+            "latency": {"distribution": "lognormal", "median": 0.05, "sigma": 0.5, "max": 2.0},
+            "error_rate": 0.01,
+            "throttle_rate": 0.02,
+            "retry_after": 1,
+            "drip": {"chunk_size": 16384, "interval": 0.005}
+        },
+        "routes": {
+            "query": {"latency": {"distribution": "uniform", "low": 0.1, "high": 0.3}},
+            "POST cruu_methods": {"error_rate": 0.05}
+        },
+        "quota": {"requests": 100, "window": 60}
+    }
+
+Routes are keyed by the name of their Flask view function, optionally prefixed by an HTTP method. Route settings
+override the default ones field by field. The login, logout and OAuth routes only get faults when they are listed
+explicitly, so a profile degrades API calls without failing the client before it starts.
+
+Quotas are counted per session (the 'sessionid' or 'Authorization' header) over a fixed window. Requests without a
+session and the login, logout and OAuth routes are not counted.
+"""
+import math
+import random
+import threading
+import time
+
+from dataclasses import dataclass, field
+from typing import Iterator
+
+
+LATENCY_DISTRIBUTIONS: tuple[str, ...] = ('constant', 'uniform', 'normal', 'lognormal', 'exponential')
+
+# Routes that fall back to no faults, rather than the default ones, when a profile does not list them
+AUTH_ENDPOINTS: tuple[str, ...] = ('login', 'logout', 'oauth_login')
+
+
+@dataclass
+class Latency:
+    """
+    A distribution of added response latency, in seconds.
+    """
+    distribution: str = 'constant'
+    value: float = 0.0 # constant
+    low: float = 0.0 # uniform
+    high: float = 0.0 # uniform
+    mean: float = 0.0 # normal, exponential
+    stddev: float = 0.0 # normal
+    median: float = 0.0 # lognormal
+    sigma: float = 0.0 # lognormal
+    max: float | None = None # Upper bound of every distribution (optional)
+
+    @classmethod
+    def from_dict(cls, spec: dict | float | int | None) -> 'Latency':
+        """
+        Build a latency distribution from its profile settings. A bare number is a constant latency.
+
+        :param spec: The latency settings of a route.
+        :return: A Latency instance.
+        :raises ValueError: If the distribution or its parameters are invalid.
+        """
+        if spec is None:
+            return cls()
+        if isinstance(spec, (int, float)):
+            return cls(value=float(spec))
+        if not isinstance(spec, dict):
+            raise ValueError(f"Invalid latency: {spec!r}")
+
+        _latency: Latency = cls(**spec)
+
+        if _latency.distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution '{_latency.distribution}', expected one of {', '.join(LATENCY_DISTRIBUTIONS)}")
+
+        return _latency
+
+    def sample(self, rng: random.Random) -> float:
+        """
+        Draw a latency from the distribution.
+
+        :param rng: The random number generator of the fault profile.
+        :return: The number of seconds to delay the response.
+        """
+        if self.distribution == 'uniform':
+            _seconds: float = rng.uniform(self.low, self.high)
+        elif self.distribution == 'normal':
+            _seconds = rng.gauss(self.mean, self.stddev)
+        elif self.distribution == 'lognormal':
+            _seconds = rng.lognormvariate(math.log(self.median), self.sigma) if self.median > 0 else 0.0
+        elif self.distribution == 'exponential':
+            _seconds = rng.expovariate(1 / self.mean) if self.mean > 0 else 0.0
+        else:
+            _seconds = self.value
+
+        if self.max is not None:
+            _seconds = min(_seconds, self.max)
+
+        return max(_seconds, 0.0)
+
+
+@dataclass
+class RouteFaults:
+    """
+    The faults injected into the responses of one route.
+    """
+    latency: Latency = field(default_factory=Latency)
+    error_rate: float = 0.0 # Probability of a 500 response
+    throttle_rate: float = 0.0 # Probability of a 429 response
+    retry_after: float | None = 1.0 # Retry-After header of throttled responses, in seconds (None to omit it)
+    drip_chunk_size: int = 0 # Send the response body in chunks of this many bytes (0 to send it at once)
+    drip_interval: float = 0.0 # Seconds between the chunks of a dripped body
+
+    @classmethod
+    def from_dict(cls, spec: dict) -> 'RouteFaults':
+        """
+        Build the faults of a route from its profile settings.
+
+        :param spec: The route settings, already merged with the default settings.
+        :return: A RouteFaults instance.
+        :raises ValueError: If a setting is invalid.
+        """
+        _unknown: set[str] = set(spec) - {'latency', 'error_rate', 'throttle_rate', 'retry_after', 'drip'}
+
+        if _unknown:
+            raise ValueError(f"Unknown fault settings: {', '.join(sorted(_unknown))}")
+
+        _drip: dict = spec.get('drip') or {}
+        _faults: RouteFaults = cls(latency=Latency.from_dict(spec.get('latency')),
+                                   error_rate=float(spec.get('error_rate', 0.0)),
+                                   throttle_rate=float(spec.get('throttle_rate', 0.0)),
+                                   retry_after=spec.get('retry_after', 1.0),
+                                   drip_chunk_size=int(_drip.get('chunk_size', 0)),
+                                   drip_interval=float(_drip.get('interval', 0.0)))
+
+        if not 0 <= _faults.error_rate + _faults.throttle_rate <= 1:
+            raise ValueError("error_rate and throttle_rate must be probabilities that add up to at most 1")
+
+        return _faults
+
+
+@dataclass
+class FaultProfile:
+    """
+    A named set of route faults and an optional per-session request quota.
+    """
+    name: str = 'none'
+    default: RouteFaults = field(default_factory=RouteFaults)
+    routes: dict[str, RouteFaults] = field(default_factory=dict)
+    quota_requests: int | None = None
+    quota_window: float = 60.0
+    seed: int | None = None
+    spec: dict = field(default_factory=dict) # The settings the profile was built from, as reported by the admin endpoint
+
+    @classmethod
+    def from_dict(cls, spec: dict) -> 'FaultProfile':
+        """
+        Build a fault profile from its JSON settings (see the module docstring for the format).
+
+        :param spec: The profile settings.
+        :return: A FaultProfile instance.
+        :raises ValueError: If a setting is invalid.
+        """
+        if not isinstance(spec, dict):
+            raise ValueError("A fault profile must be a JSON object")
+
+        _default: dict = spec.get('default') or {}
+        _quota: dict = spec.get('quota') or {}
+
+        try:
+            return cls(name=str(spec.get('name', 'custom')),
+                       default=RouteFaults.from_dict(_default),
+                       routes={route: RouteFaults.from_dict({**_default, **settings}) for route, settings in (spec.get('routes') or {}).items()},
+                       quota_requests=int(_quota['requests']) if 'requests' in _quota else None,
+                       quota_window=float(_quota.get('window', 60.0)),
+                       seed=spec.get('seed'),
+                       spec=spec)
+        except TypeError as e:
+            raise ValueError(f"Invalid fault profile: {e}")
+
+    def faults_for(self, method: str, endpoint: str) -> RouteFaults:
+        """
+        Look up the faults of a route, falling back to the default faults.
+
+        :param method: The HTTP method of the request.
+        :param endpoint: The name of the Flask view function handling the request.
+        :return: The RouteFaults of the route.
+        """
+        _faults: RouteFaults | None = self.routes.get(f'{method} {endpoint}') or self.routes.get(endpoint)
+
+        if _faults is None:
+            _faults = RouteFaults() if endpoint in AUTH_ENDPOINTS else self.default
+
+        return _faults
+
+
+# Built-in profiles, selectable by name through the admin endpoint, --faults or MOCK_SERVER_FAULTS
+PROFILES: dict[str, dict] = {
+    'none': {'name': 'none'},
+    'slow': {
+        'name': 'slow',
+        'default': {'latency': {'distribution': 'lognormal', 'median': 0.05, 'sigma': 0.6, 'max': 2.0}},
+        'routes': {'query': {'latency': {'distribution': 'lognormal', 'median': 0.2, 'sigma': 0.6, 'max': 5.0}}}
+    },
+    'flaky': {
+        'name': 'flaky',
+        'default': {'error_rate': 0.05, 'throttle_rate': 0.05, 'retry_after': 1}
+    },
+    'throttled': {
+        'name': 'throttled',
+        'default': {'throttle_rate': 0.1, 'retry_after': 2},
+        'quota': {'requests': 50, 'window': 10}
+    },
+    'degraded': {
+        'name': 'degraded',
+        'default': {
+            'latency': {'distribution': 'lognormal', 'median': 0.03, 'sigma': 0.8, 'max': 3.0},
+            'error_rate': 0.02,
+            'throttle_rate': 0.05,
+            'retry_after': 1
+        },
+        'routes': {
+            'query': {'drip': {'chunk_size': 16384, 'interval': 0.005}},
+            'bulk_file': {'drip': {'chunk_size': 65536, 'interval': 0.005}}
+        }
+    }
+}
+
+
+def load_profile(spec: dict | str) -> FaultProfile:
+    """
+    Load a built-in fault profile by name, or build one from its settings.
+
+    :param spec: The name of a built-in profile, or the settings of a profile.
+    :return: A FaultProfile instance.
+    :raises ValueError: If the profile is unknown or invalid.
+    """
+    if isinstance(spec, str):
+        if spec not in PROFILES:
+            raise ValueError(f"Unknown fault profile '{spec}', expected one of {', '.join(PROFILES)}")
+        spec = PROFILES[spec]
+
+    return FaultProfile.from_dict(spec)
+
+
+class FaultInjector:
+    """
+    Applies the active fault profile to requests. Thread-safe, and switchable at runtime.
+    """
+    def __init__(self, profile: FaultProfile | None = None):
+        self._lock: threading.Lock = threading.Lock()
+        self.activate(profile or FaultProfile())
+
+
+    def activate(self, profile: FaultProfile) -> None:
+        """
+        Switch to another fault profile, resetting the session quotas and statistics.
+
+        :param profile: The FaultProfile to apply from now on.
+        """
+        with self._lock:
+            self.profile: FaultProfile = profile
+            self._rng: random.Random = random.Random(profile.seed)
+            self._quotas: dict[str, list] = {} # Session -> [window start, requests in the window]
+            self._stats: dict[str, dict] = {}
+
+
+    def _count(self, endpoint: str, key: str, amount: float = 1) -> None:
+        _stats: dict = self._stats.setdefault(endpoint, {'requests': 0, 'throttled': 0, 'errors': 0, 'quota_exceeded': 0, 'dripped': 0, 'latency_added': 0.0})
+        _stats[key] += amount
+
+
+    def before_request(self, method: str, endpoint: str, session: str | None) -> tuple[RouteFaults, tuple | None]:
+        """
+        Delay a request and decide whether it fails.
+
+        :param method: The HTTP method of the request.
+        :param endpoint: The name of the Flask view function handling the request.
+        :param session: The session the request belongs to, if any.
+        :return: The RouteFaults of the request, and an injected (body, status, headers) response or None to handle it normally.
+        """
+        with self._lock:
+            _faults: RouteFaults = self.profile.faults_for(method, endpoint)
+            _delay: float = _faults.latency.sample(self._rng)
+            _draw: float = self._rng.random()
+            self._count(endpoint, 'requests')
+            self._count(endpoint, 'latency_added', _delay)
+
+        if _delay:
+            time.sleep(_delay)
+
+        with self._lock:
+            if session is not None and self.profile.quota_requests is not None and endpoint not in AUTH_ENDPOINTS:
+                _now: float = time.monotonic()
+                _window: list = self._quotas.setdefault(session, [_now, 0])
+
+                if _now - _window[0] >= self.profile.quota_window:
+                    _window[:] = [_now, 0]
+
+                _window[1] += 1
+
+                if _window[1] > self.profile.quota_requests:
+                    self._count(endpoint, 'quota_exceeded')
+                    _reset: int = math.ceil(self.profile.quota_window - (_now - _window[0]))
+                    return _faults, ({"error": "Request quota exceeded"}, 429, {"Retry-After": str(max(_reset, 1))})
+
+            if _draw < _faults.throttle_rate:
+                self._count(endpoint, 'throttled')
+                _headers: dict = {"Retry-After": str(_faults.retry_after)} if _faults.retry_after is not None else {}
+                return _faults, ({"error": "Too many requests"}, 429, _headers)
+
+            if _draw < _faults.throttle_rate + _faults.error_rate:
+                self._count(endpoint, 'errors')
+                return _faults, ({"error": "Injected server error"}, 500, {})
+
+        return _faults, None
+
+
+    def drip(self, endpoint: str, body: bytes, faults: RouteFaults) -> Iterator[bytes]:
+        """
+        Send a response body slowly, in chunks separated by the drip interval of the route.
+
+        :param endpoint: The name of the Flask view function handling the request.
+        :param body: The full response body.
+        :param faults: The RouteFaults of the request.
+        :return: An iterator over the chunks of the body.
+        """
+        with self._lock:
+            self._count(endpoint, 'dripped')
+
+        for _start in range(0, len(body), faults.drip_chunk_size):
+            if _start:
+                time.sleep(faults.drip_interval)
+            yield body[_start:_start + faults.drip_chunk_size]
+
+
+    def stats(self) -> dict:
+        """
+        The number of requests and injected faults per route since the profile was activated.
+
+        :return: A dictionary of statistics keyed by route.
+        """
+        with self._lock:
+            return {endpoint: dict(stats) for endpoint, stats in self._stats.items()}
@@ -1,8 +1,19 @@
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
 import pandas as pd
+import re
+import threading
+import time
+import uuid
 
-from flask import Flask, request
+from faults import FaultInjector, PROFILES, load_profile
+from flask import Flask, g, request
 from logging.config import dictConfig
-from utils import QueryParser
+from table import Table
 
 
 # Configure logging for the Flask application
@@ -29,10 +40,309 @@ dictConfig({
 
 # Standup Flask application
 app = Flask(__name__)
+app.json.sort_keys = False # Sorting the keys of every row is the most expensive part of serializing large pages
 
-# Simulate a database with a CSV file
-data_df: pd.DataFrame = pd.read_csv('mock_server/data.csv')
-data: dict = data_df.to_dict(orient='records')
+# Content encoding settings (see README.md). Responses are gzip compressed when the client accepts it, and gzip
+# compressed request bodies are decoded, unless turned off through /admin/compression.
+compression_settings: dict = {"responses": True, "requests": True, "min_size": 1024}
+compression_stats: dict = {"responses_compressed": 0, "response_bytes": 0, "response_bytes_compressed": 0, "requests_decompressed": 0}
+
+
+class DecompressRequests:
+    """
+    WSGI middleware that decodes gzip compressed request bodies before Flask reads them, and answers 415 to content
+    encodings it does not support (or to any encoding while request compression is turned off).
+    """
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        encoding: str = environ.get("HTTP_CONTENT_ENCODING", "").strip().lower()
+
+        if encoding in ("", "identity"):
+            return self.wsgi_app(environ, start_response)
+
+        if encoding != "gzip" or not compression_settings["requests"]:
+            start_response("415 UNSUPPORTED MEDIA TYPE", [("Content-Type", "application/json"), ("Accept-Encoding", "identity")])
+            return [b'{"error": "Unsupported Content-Encoding."}']
+
+        try:
+            body: bytes = gzip.decompress(environ["wsgi.input"].read(int(environ.get("CONTENT_LENGTH") or 0)))
+        except (OSError, EOFError):
+            start_response("400 BAD REQUEST", [("Content-Type", "application/json")])
+            return [b'{"error": "Invalid gzip request body."}']
+
+        compression_stats["requests_decompressed"] += 1
+        environ.update({"wsgi.input": io.BytesIO(body), "CONTENT_LENGTH": str(len(body))})
+        del environ["HTTP_CONTENT_ENCODING"]
+
+        return self.wsgi_app(environ, start_response)
+
+
+app.wsgi_app = DecompressRequests(app.wsgi_app)
+
+def synthetic_data(rows: int) -> list[dict]:
+    """
+    Build a synthetic dataset shaped like data.csv, for benchmarks that need more than its 100 rows.
+
+    :param rows: The number of rows to build.
+    :return: A list of records with Ids 1 to rows.
+    """
+    return [
+        {"Id": i, "Name": f"Account {i}", "Description": f"Account Description {i}", "Status": "ACTIVE" if i % 10 else "INACTIVE"}
+        for i in range(1, rows + 1)
+    ]
+
+
+# Simulate a database with a CSV file, or with a synthetic dataset when MOCK_SERVER_ROWS is set
+if os.environ.get('MOCK_SERVER_ROWS'):
+    data: list[dict] = synthetic_data(int(os.environ['MOCK_SERVER_ROWS']))
+else:
+    data_df: pd.DataFrame = pd.read_csv(os.environ.get('MOCK_SERVER_DATA', 'mock_server/data.csv'))
+    data: list[dict] = data_df.to_dict(orient='records')
+
+# Index the records by Id so queries can filter, order and page them
+table: Table = Table(data)
+data = table.rows
+
+def load_faults(spec: str) -> FaultInjector:
+    """
+    Build the fault injector from a built-in profile name or the path of a JSON profile file.
+
+    :param spec: The name of a built-in profile (see faults.PROFILES) or a path to a JSON file.
+    :return: A FaultInjector applying the profile.
+    """
+    if spec in PROFILES:
+        return FaultInjector(load_profile(spec))
+
+    with open(spec) as f:
+        return FaultInjector(load_profile(json.load(f)))
+
+
+# Inject latency and failures into responses according to the active fault profile (see README.md)
+faults: FaultInjector = load_faults(os.environ.get('MOCK_SERVER_FAULTS', 'none'))
+
+# Session IDs and OAuth tokens issued by the login routes, with their expiry times. They are only checked once
+# session validation is turned on through /admin/sessions (see README.md), so existing clients keep working by default.
+sessions: dict[str, float] = {}
+session_settings: dict = {"validate": False, "ttl": 3600.0}
+session_stats: dict = {"logins": 0}
+sessions_lock: threading.Lock = threading.Lock()
+SESSION_EXEMPT_ENDPOINTS: tuple[str, ...] = ("login", "logout", "oauth_login", "fault_profile", "session_admin", "compression_admin", "static")
+
+
+def issue_session(prefix: str) -> str:
+    """
+    Issue a new session ID or token that expires after the configured session TTL.
+
+    :param prefix: The prefix of the credential (ex. 'session').
+    :return: The credential.
+    """
+    credential: str = f"{prefix}-{uuid.uuid4().hex}"
+
+    with sessions_lock:
+        sessions[credential] = time.time() + session_settings["ttl"]
+        session_stats["logins"] += prefix != "refresh" # Count logins: an OAuth login issues an access and a refresh token
+
+    return credential
+
+# Simulate bulk API requests and their result batches (see README.md for the assumed contract)
+bulk_requests: dict[int, dict] = {}
+bulk_batches: dict[int, dict] = {}
+next_bulk_request_id: int = 8675309
+
+
+def build_bulk_batches(request_id: int, bulk_request: dict) -> list[dict]:
+    """
+    Split the mock data into result batch files for a bulk request.
+
+    :param request_id: The ID of the bulk request.
+    :param bulk_request: The 'brmObjects' of the bulk request.
+    :return: A list of batch records.
+    """
+    records_per_batch: int = int(bulk_request.get('RequestsPerBatch') or 10000)
+    columns: list[str] = bulk_request.get('Columns') or list(data[0].keys())
+    response_format: str = str(bulk_request.get('ResponseFormat', 'JSON')).upper()
+    batches: list[dict] = []
+
+    for number, start in enumerate(range(0, len(data), records_per_batch), start=1):
+        rows: list[dict] = [{column: row.get(column) for column in columns} for row in data[start:start + records_per_batch]]
+
+        if response_format == 'CSV':
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, 
+                                    fieldnames=columns, 
+                                    delimiter=bulk_request.get('CSVDelimiter', ','), 
+                                    quotechar=bulk_request.get('CSVQualifier', '"'), 
+                                    lineterminator={'CR': '\r', 'LF': '\n'}.get(bulk_request.get('CSVEndLineFormat'), '\r\n'))
+            writer.writeheader()
+            writer.writerows(rows)
+            content: bytes = buffer.getvalue().encode('utf-8')
+        else:
+            content = json.dumps(rows).encode('utf-8')
+
+        batch_id: int = request_id * 1000 + number
+        bulk_batches[batch_id] = {'content': content}
+        batches.append({
+            "Id": batch_id,
+            "BulkApiRequestId": request_id,
+            "BatchNumber": number,
+            "RecordCount": len(rows)
+        })
+
+    return batches
+
+
+@app.before_request
+def inject_faults():
+    """
+    Delay the request, and throttle or fail it, according to the active fault profile.
+
+    :return: An injected error response, or None to handle the request normally.
+    """
+    if request.endpoint in (None, 'fault_profile', 'session_admin', 'compression_admin', 'static'):
+        return None
+
+    session: str | None = request.headers.get('sessionid') or request.headers.get('Authorization')
+    g.faults, response = faults.before_request(request.method, request.endpoint, session)
+
+    return response
+
+
+@app.before_request
+def validate_session():
+    """
+    Reject requests whose session ID or bearer token is unknown, revoked or expired, when session validation is on.
+
+    :return: A 401 response, or None to handle the request normally.
+    """
+    if not session_settings["validate"] or request.endpoint is None or request.endpoint in SESSION_EXEMPT_ENDPOINTS:
+        return None
+
+    credential: str = request.headers.get("sessionid") or request.headers.get("Authorization", "").removeprefix("Bearer ")
+
+    with sessions_lock:
+        expires: float | None = sessions.get(credential)
+
+    if expires is None or expires < time.time():
+        return {"error": "Invalid or expired session."}, 401
+
+    return None
+
+
+@app.after_request
+def drip_response(response):
+    """
+    Send the response body in slow chunks when the route of the request is configured to drip.
+
+    :param response: The response to send.
+    :return: The response, streaming its body if it drips.
+    """
+    route_faults = g.get('faults')
+
+    if route_faults is not None and route_faults.drip_chunk_size > 0 and response.is_sequence:
+        body: bytes = response.get_data()
+        response.response = faults.drip(request.endpoint, body, route_faults)
+        response.headers['Content-Length'] = str(len(body))
+
+    return response
+
+
+# Registered after drip_response so it runs first, and slow-drip responses send the compressed body
+@app.after_request
+def compress_response(response):
+    """
+    Gzip compress the response body when the client accepts gzip and the body is large enough.
+
+    :param response: The response to send.
+    :return: The response, compressed if possible.
+    """
+    if (not compression_settings["responses"] or response.direct_passthrough or not response.is_sequence
+            or "Content-Encoding" in response.headers or "gzip" not in request.headers.get("Accept-Encoding", "")):
+        return response
+
+    body: bytes = response.get_data()
+
+    if len(body) < compression_settings["min_size"]:
+        return response
+
+    response.set_data(gzip.compress(body, compresslevel=5))
+    response.headers["Content-Encoding"] = "gzip"
+    response.vary.add("Accept-Encoding")
+    compression_stats["responses_compressed"] += 1
+    compression_stats["response_bytes"] += len(body)
+    compression_stats["response_bytes_compressed"] += response.content_length
+
+    return response
+
+
+@app.route("/admin/compression", methods=["GET", "PUT", "POST"])
+def compression_admin():
+    """
+    Admin endpoint to turn response compression and compressed request bodies on or off
+    ({"responses": true, "requests": false, "min_size": 1024}).
+
+    :return: The compression settings and statistics.
+    """
+    if request.method in ["PUT", "POST"]:
+        settings = request.get_json(silent=True) or {}
+        compression_settings.update({key: settings[key] for key in compression_settings if key in settings})
+
+    return {**compression_settings, "stats": compression_stats}
+
+
+@app.route("/admin/faults", methods=["GET", "PUT", "POST", "DELETE"])
+def fault_profile():
+    """
+    Admin endpoint to inspect and switch the fault profile at runtime. Not subject to fault injection.
+
+    GET returns the active profile and its statistics. PUT or POST activates a built-in profile ({"profile": "<name>"})
+    or a custom one (the profile settings), and DELETE turns fault injection off.
+
+    :return: The active profile, the built-in profile names and the injection statistics.
+    """
+    if request.method == "DELETE":
+        faults.activate(load_profile('none'))
+    elif request.method in ["PUT", "POST"]:
+        spec = request.get_json(silent=True)
+
+        try:
+            faults.activate(load_profile(spec['profile'] if isinstance(spec, dict) and isinstance(spec.get('profile'), str) else spec))
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        app.logger.info(f"Activated fault profile: {faults.profile.name}")
+
+    return {
+        "profile": {"name": faults.profile.name, **faults.profile.spec},
+        "profiles": list(PROFILES),
+        "stats": faults.stats()
+    }
+
+
+@app.route("/admin/sessions", methods=["GET", "PUT", "POST", "DELETE"])
+def session_admin():
+    """
+    Admin endpoint to control session validation. PUT or POST updates the settings ({"validate": true, "ttl": 60}),
+    and DELETE revokes every session and token issued so far.
+
+    :return: The session settings, the number of active sessions and the number of logins so far.
+    """
+    if request.method == "DELETE":
+        with sessions_lock:
+            sessions.clear()
+    elif request.method in ["PUT", "POST"]:
+        settings = request.get_json(silent=True) or {}
+
+        if not isinstance(settings.get("validate", False), bool) or not isinstance(settings.get("ttl", 1), (int, float)) or settings.get("ttl", 1) <= 0:
+            return {"error": "'validate' must be a boolean and 'ttl' a positive number of seconds."}, 400
+
+        session_settings.update({key: settings[key] for key in ("validate", "ttl") if key in settings})
+
+    with sessions_lock:
+        active: int = sum(expires >= time.time() for expires in sessions.values())
+
+    return {**session_settings, "active": active, "logins": session_stats["logins"]}
 
 
 @app.route("/auth/1.0/authenticate", methods=["POST"])
@@ -43,10 +353,10 @@ def oauth_login():
     :return: A mock login response containing a fake access token.
     """
     oauth_response = {
-        "access_token": "my_access_token",
-        "refresh_token": "my_refresh_token",
+        "access_token": issue_session("access"),
+        "refresh_token": issue_session("refresh"),
         "token_type": "Bearer",
-        "expires_in": 9999
+        "expires_in": session_settings["ttl"]
     }
 
     return oauth_response
@@ -62,7 +372,7 @@ def login():
     login_response = {
         "loginResponse": [
             {
-                "SessionID": "thisIsASessionID",
+                "SessionID": issue_session("session"),
                 "ErrorCode": "0",
                 "ErrorText": []
             }
@@ -100,15 +410,22 @@ def query():
     :return: A mock query response containing the results of a query as a dictionary or JSON payload of records.
     """
     sql_query: str = request.args.get('sql')
-    
-    if sql_query:
-        # Parse the incoming SQL query
-        query = QueryParser(sql_query)
-        parsed_query = query.parse()
-        app.logger.debug(f"Parsed SQL Query: {parsed_query}")
-    
+
+    if not sql_query:
+        return {"error": "Missing sql parameter"}, 400
+
+    # Parsed queries are cached, so the pages of a paged query are only parsed once
+    try:
+        rows: list[dict] = table.query(sql_query)
+    except ValueError as e:
+        app.logger.debug(f"Unsupported SQL Query: {sql_query} ({e})")
+        return {"error": str(e)}, 500
+
+    if not rows:
+        return {"error": "No rows found"}, 404
+
     query_response = {
-        "queryResponse": data
+        "queryResponse": rows
     }
 
     return query_response
@@ -123,8 +440,30 @@ def retrieve_by_id(entity: str, record_id: int):
     :param record_id: The ID of the record to retrieve.
     :return: A mock retrieve response containing the results of the request as a dictionary or JSON payload of records.
     """
+    if entity.upper() == 'BULK_API_REQUEST':
+        # Bulk requests report 'Processing' on the first status poll and 'Completed' afterwards
+        if record_id not in bulk_requests:
+            return {"error": "Bulk request not found"}, 404
+
+        bulk_requests[record_id]['polls'] += 1
+
+        return {
+            "retrieveResponse": [
+                {
+                    "Id": record_id,
+                    "RequestName": bulk_requests[record_id]['request'].get('RequestName'),
+                    "Status": "Processing" if bulk_requests[record_id]['polls'] < 2 else "Completed"
+                }
+            ]
+        }
+
+    record: dict | None = table.get(record_id)
+
+    if record is None:
+        return {"error": "Record not found"}, 404
+
     retrieve_response = {
-        "retrieveResponse": data[record_id] if record_id < len(data) else {}
+        "retrieveResponse": [record]
     }
 
     return retrieve_response
@@ -150,8 +489,25 @@ def cruu_methods(entity: str):
             # Parse the incoming ANSI SQL query
             app.logger.debug(f"ANSI SQL: {ansi_sql}")
 
+        if entity.upper() == 'BULK_API_BATCH':
+            match = re.search(r'BulkApiRequestId\s*=\s*(\d+)', ansi_sql or '')
+            bulk_request: dict | None = bulk_requests.get(int(match.group(1))) if match else None
+
+            if not bulk_request:
+                return {"error": "No batches found"}, 404
+
+            return {"retrieveResponse": bulk_request['batches']}
+
+        try:
+            rows: list[dict] = table.retrieve(ansi_sql)
+        except ValueError as e:
+            return {"error": str(e)}, 500
+
+        if not rows:
+            return {"error": "No rows found"}, 404
+
         retrieve_response = {
-            "retrieveResponse": data
+            "retrieveResponse": rows
         }
 
         return retrieve_response
@@ -271,16 +627,28 @@ def bulk_request():
     :param entity: The entity to request a bulk extract for.
     :return: A mock response for the bulk request as a dictionary or JSON payload.
     """
+    global next_bulk_request_id
+
     # Bulk API requests
     app.logger.debug(f"Received BULK REQUEST data: {request.json}")
 
+    bulk_request: dict = request.json.get('brmObjects', {})
+    request_id: int = next_bulk_request_id
+    next_bulk_request_id += 1
+
+    bulk_requests[request_id] = {
+        'request': bulk_request,
+        'polls': 0,
+        'batches': build_bulk_batches(request_id, bulk_request)
+    }
+
     bulk_response = {
         "createResponse": [
             {
                 "ErrorCode": "0",
                 "ErrorText": " ",
                 "ErrorElementField": " ",
-                "Id": "8675309"
+                "Id": str(request_id)
             }
         ]
     }
@@ -288,6 +656,49 @@ def bulk_request():
     return bulk_response
 
 
+@app.route("/rest/2.0/bulk_api_file/<int:batch_id>")
+def bulk_file(batch_id: int):
+    """
+    Mock bulk result file download endpoint. Supports 'Range: bytes=<start>-' requests for resumable downloads.
+
+    :param batch_id: The ID of the bulk batch to download.
+    :return: The batch file contents, or the requested byte range of it.
+    """
+    if batch_id not in bulk_batches:
+        return {"error": "Batch not found"}, 404
+
+    content: bytes = bulk_batches[batch_id]['content']
+    match = re.match(r'bytes=(\d+)-$', request.headers.get('Range', ''))
+
+    if match:
+        start: int = int(match.group(1))
+
+        if start >= len(content):
+            return "", 416, {"Content-Range": f"bytes */{len(content)}"}
+
+        return content[start:], 206, {"Content-Range": f"bytes {start}-{len(content) - 1}/{len(content)}"}
+
+    return content, 200, {"Content-Type": "application/octet-stream"}
+
+
 if __name__ == "__main__":
-    app.run(debug=True, host="0.0.0.0", port=80)
+    parser = argparse.ArgumentParser(description="Run the BillingPlatform mock server.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=80)
+    parser.add_argument("--server", choices=["flask", "waitress"], default="flask",
+                        help="'flask' runs the debug server; 'waitress' runs a production WSGI server (pip install waitress).")
+    parser.add_argument("--threads", type=int, default=16, help="Worker threads of the waitress server (default: 16).")
+    parser.add_argument("--faults", default=None,
+                        help=f"Fault profile to start with: one of {', '.join(PROFILES)}, or the path of a JSON profile (default: none).")
+    args = parser.parse_args()
+
+    if args.faults:
+        faults = load_faults(args.faults)
+
+    if args.server == "waitress":
+        from waitress import serve
+
+        serve(app, host=args.host, port=args.port, threads=args.threads)
+    else:
+        app.run(debug=True, host=args.host, port=args.port)
     
\ No newline at end of file
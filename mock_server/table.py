@@ -0,0 +1,641 @@
+"""
+An indexed, read-only in-memory table that evaluates the subset of SQL the client sends:
+
+    SELECT <columns | *> FROM <entity> [WHERE <condition>] [ORDER BY <column> [ASC|DESC], ...]
+    [OFFSET <n> ROWS] [FETCH {NEXT|FIRST} <n> ROWS ONLY] [LIMIT <n>]
+
+Conditions support AND, OR, NOT, parentheses, =, !=, <>, <, <=, >, >=, [NOT] IN (...), [NOT] LIKE,
+[NOT] BETWEEN ... AND ..., and IS [NOT] NULL. Joins, subqueries, functions and GROUP BY are not supported.
+"""
+import bisect
+import heapq
+import re
+
+from functools import lru_cache
+from itertools import islice
+from typing import Callable, Iterable, Iterator
+
+
+_TOKEN_PATTERN: re.Pattern = re.compile(r"""
+    \s*(?:
+        (?P<string>'(?:[^']|'')*')
+      | (?P<number>-?\d+(?:\.\d+)?)
+      | (?P<identifier>[A-Za-z_][A-Za-z0-9_.]*|"[^"]+")
+      | (?P<operator><=|>=|<>|!=|=|<|>|\(|\)|,|\*)
+    )""", re.VERBOSE)
+
+# Words that end a column list or table name, so they are never taken for an alias
+_CLAUSE_WORDS: tuple[str, ...] = ('FROM', 'WHERE', 'ORDER', 'OFFSET', 'FETCH', 'LIMIT', 'GROUP', 'HAVING', 'JOIN', 'INNER', 'LEFT', 'RIGHT', 'OUTER')
+
+_COMPARISONS: dict[str, Callable[[object, object], bool]] = {
+    '=': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+    '<>': lambda a, b: a != b,
+    '<': lambda a, b: a < b,
+    '<=': lambda a, b: a <= b,
+    '>': lambda a, b: a > b,
+    '>=': lambda a, b: a >= b,
+}
+
+
+class Token:
+    __slots__ = ('kind', 'value', 'upper')
+
+    def __init__(self, kind: str, value: object):
+        self.kind: str = kind
+        self.value: object = value
+        self.upper: str = value.upper() if kind == 'identifier' else value if kind == 'operator' else ''
+
+
+def tokenize(sql: str) -> list[Token]:
+    """
+    Split a SQL statement into tokens.
+
+    :param sql: The SQL statement.
+    :return: The list of tokens.
+    :raises ValueError: If the statement contains a character that cannot be tokenized.
+    """
+    _tokens: list[Token] = []
+    _position: int = 0
+    _sql: str = sql.rstrip().rstrip(';')
+
+    while _position < len(_sql):
+        _match: re.Match | None = _TOKEN_PATTERN.match(_sql, _position)
+
+        if _match is None or _match.end() == _position:
+            if _sql[_position:].strip() == '':
+                break
+            raise ValueError(f'Unexpected character at position {_position}: {_sql[_position:_position + 20]!r}')
+
+        _position = _match.end()
+
+        if _match.group('string') is not None:
+            _tokens.append(Token('literal', _match.group('string')[1:-1].replace("''", "'")))
+        elif _match.group('number') is not None:
+            _number: str = _match.group('number')
+            _tokens.append(Token('literal', float(_number) if '.' in _number else int(_number)))
+        elif _match.group('identifier') is not None:
+            _tokens.append(Token('identifier', _match.group('identifier').strip('"')))
+        else:
+            _tokens.append(Token('operator', _match.group('operator')))
+
+    return _tokens
+
+
+class Query:
+    """A parsed SELECT statement. Conditions are kept as nested tuples so they can be compiled against any table."""
+    def __init__(self):
+        self.columns: list[tuple[str, str]] | None = None # (column, output name); None means *
+        self.entity: str = ''
+        self.where: tuple | None = None
+        self.order_by: list[tuple[str, bool]] = [] # (column, descending)
+        self.offset: int = 0
+        self.fetch: int | None = None
+
+
+class _Parser:
+    def __init__(self, sql: str):
+        self.tokens: list[Token] = tokenize(sql)
+        self.position: int = 0
+
+    def peek(self, offset: int = 0) -> Token | None:
+        _index: int = self.position + offset
+        return self.tokens[_index] if _index < len(self.tokens) else None
+
+    def at(self, *words: str) -> bool:
+        _token: Token | None = self.peek()
+        return _token is not None and _token.kind != 'literal' and _token.upper in words
+
+    def accept(self, *words: str) -> Token | None:
+        if self.at(*words):
+            self.position += 1
+            return self.tokens[self.position - 1]
+        return None
+
+    def expect(self, *words: str) -> Token:
+        _token: Token | None = self.accept(*words)
+
+        if _token is None:
+            _found: Token | None = self.peek()
+            raise ValueError(f"Expected {' or '.join(words)} but found {_found.value if _found else 'end of statement'!r}.")
+
+        return _token
+
+    def identifier(self) -> str:
+        _token: Token | None = self.peek()
+
+        if _token is None or _token.kind != 'identifier':
+            raise ValueError(f"Expected a column name but found {_token.value if _token else 'end of statement'!r}.")
+
+        self.position += 1
+        return _token.value.rsplit('.', 1)[-1] # Drop table aliases (ex. a.Name)
+
+    def integer(self) -> int:
+        _token: Token | None = self.peek()
+
+        if _token is None or _token.kind != 'literal' or not isinstance(_token.value, int) or _token.value < 0:
+            raise ValueError('Expected a non-negative integer.')
+
+        self.position += 1
+        return _token.value
+
+    def parse(self) -> Query:
+        _query: Query = Query()
+        self.expect('SELECT')
+
+        if self.accept('*'):
+            _query.columns = None
+        else:
+            _query.columns = []
+
+            while True:
+                if self.peek(1) is not None and self.peek(1).upper == '(':
+                    raise ValueError('Functions are not supported by the mock server.')
+
+                _column: str = self.identifier()
+                _alias: str = _column
+
+                if self.accept('AS') or (self.peek() is not None and self.peek().kind == 'identifier' and not self.at(*_CLAUSE_WORDS)):
+                    _alias = self.identifier()
+
+                _query.columns.append((_column, _alias))
+
+                if not self.accept(','):
+                    break
+
+        self.expect('FROM')
+        _query.entity = self.identifier()
+
+        if self.peek() is not None and self.peek().kind == 'identifier' and not self.at(*_CLAUSE_WORDS):
+            self.position += 1 # Table alias
+
+        if self.at('JOIN', 'INNER', 'LEFT', 'RIGHT', 'OUTER', 'GROUP', 'HAVING'):
+            raise ValueError(f'{self.peek().upper} is not supported by the mock server.')
+
+        if self.accept('WHERE'):
+            _query.where = self.expression()
+
+        if self.accept('ORDER'):
+            self.expect('BY')
+
+            while True:
+                _column: str = self.identifier()
+                _descending: bool = self.accept('ASC', 'DESC') is not None and self.tokens[self.position - 1].upper == 'DESC'
+                _query.order_by.append((_column, _descending))
+
+                if not self.accept(','):
+                    break
+
+        if self.accept('OFFSET'):
+            _query.offset = self.integer()
+            self.expect('ROWS', 'ROW')
+
+        if self.accept('FETCH'):
+            self.expect('NEXT', 'FIRST')
+            _query.fetch = self.integer()
+            self.expect('ROWS', 'ROW')
+            self.expect('ONLY')
+
+        if self.accept('LIMIT'):
+            _query.fetch = self.integer()
+
+            if self.accept('OFFSET'):
+                _query.offset = self.integer()
+
+        if self.peek() is not None:
+            raise ValueError(f'Unexpected {self.peek().value!r} at the end of the statement.')
+
+        return _query
+
+    # Conditions, from the lowest to the highest precedence
+    def expression(self) -> tuple:
+        _node: tuple = self.conjunction()
+
+        while self.accept('OR'):
+            _node = ('or', _node, self.conjunction())
+
+        return _node
+
+    def conjunction(self) -> tuple:
+        _node: tuple = self.negation()
+
+        while self.accept('AND'):
+            _node = ('and', _node, self.negation())
+
+        return _node
+
+    def negation(self) -> tuple:
+        if self.accept('NOT'):
+            return ('not', self.negation())
+
+        if self.accept('('):
+            _node: tuple = self.expression()
+            self.expect(')')
+            return _node
+
+        return self.predicate()
+
+    def operand(self) -> tuple:
+        _token: Token | None = self.peek()
+
+        if _token is None:
+            raise ValueError('Unexpected end of statement.')
+
+        if _token.kind == 'literal':
+            self.position += 1
+            return ('value', _token.value)
+
+        if self.accept('NULL'):
+            return ('value', None)
+
+        if self.at('TRUE', 'FALSE'):
+            return ('value', self.expect('TRUE', 'FALSE').upper == 'TRUE')
+
+        if self.peek(1) is not None and self.peek(1).upper == '(':
+            raise ValueError('Functions are not supported by the mock server.')
+
+        return ('column', self.identifier())
+
+    def predicate(self) -> tuple:
+        _left: tuple = self.operand()
+        _negated: bool = self.accept('NOT') is not None
+
+        if self.accept('IN'):
+            self.expect('(')
+            _values: list = [self.operand()]
+
+            while self.accept(','):
+                _values.append(self.operand())
+
+            self.expect(')')
+
+            if any(_value[0] != 'value' for _value in _values):
+                raise ValueError('IN lists may only contain literal values.')
+
+            _node: tuple = ('in', _left, tuple(_value[1] for _value in _values))
+        elif self.accept('LIKE'):
+            _node = ('like', _left, self.operand())
+        elif self.accept('BETWEEN'):
+            _low: tuple = self.operand()
+            self.expect('AND')
+            _node = ('between', _left, _low, self.operand())
+        elif not _negated and self.accept('IS'):
+            _is_not: bool = self.accept('NOT') is not None
+            self.expect('NULL')
+            return ('not', ('null', _left)) if _is_not else ('null', _left)
+        elif not _negated and self.peek() is not None and self.peek().kind == 'operator' and self.peek().upper in _COMPARISONS:
+            _operator: str = self.tokens[self.position].upper
+            self.position += 1
+            return ('compare', _operator, _left, self.operand())
+        else:
+            _found: Token | None = self.peek()
+            raise ValueError(f"Expected a condition but found {_found.value if _found else 'end of statement'!r}.")
+
+        return ('not', _node) if _negated else _node
+
+
+@lru_cache(maxsize=4096)
+def parse_query(sql: str) -> Query:
+    """
+    Parse a SELECT statement. Results are cached, so repeated statements (ex. the pages of a paged query) are parsed once.
+
+    :param sql: The SQL statement.
+    :return: The parsed query.
+    :raises ValueError: If the statement is not supported.
+    """
+    return _Parser(sql).parse()
+
+
+@lru_cache(maxsize=4096)
+def parse_condition(condition: str) -> tuple | None:
+    """
+    Parse a bare condition (ex. the queryAnsiSql filter of a retrieve request). Results are cached.
+
+    :param condition: The condition.
+    :return: The parsed condition, or None if it is empty.
+    :raises ValueError: If the condition is not supported.
+    """
+    if not condition.strip():
+        return None
+
+    _parser: _Parser = _Parser(condition)
+    _node: tuple = _parser.expression()
+
+    if _parser.peek() is not None:
+        raise ValueError(f'Unexpected {_parser.peek().value!r} at the end of the condition.')
+
+    return _node
+
+
+def _coerce(left: object, right: object) -> tuple[object, object]:
+    """Compare numbers with numeric strings as numbers, like a database comparing a number column with a string literal."""
+    if isinstance(left, (int, float)) and isinstance(right, str):
+        try:
+            return left, float(right) if '.' in right else int(right)
+        except ValueError:
+            return str(left), right
+    if isinstance(right, (int, float)) and isinstance(left, str):
+        _right, _left = _coerce(right, left)
+        return _left, _right
+    return left, right
+
+
+def _index_key(value: object) -> str:
+    """Key of a value in an equality index, so that 5, 5.0 and '5' find the same rows."""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _sort_key(value: object) -> tuple:
+    """Sort key that places NULL values last."""
+    return (True, 0) if value is None else (False, value)
+
+
+def _like_pattern(pattern: str) -> re.Pattern:
+    return re.compile(''.join('.*' if _char == '%' else '.' if _char == '_' else re.escape(_char) for _char in pattern) + r'\Z', re.DOTALL)
+
+
+class Table:
+    """
+    Read-only table of records, kept in key order with a key index for range and point lookups,
+    and equality indexes built on first use for other columns.
+    """
+    def __init__(self, rows: Iterable[dict], key: str = 'Id'):
+        self.rows: list[dict] = sorted(rows, key=lambda _row: _row[key])
+        self.key: str = key
+        self.keys: list = [_row[key] for _row in self.rows]
+        self.positions: dict = {_key: _position for _position, _key in enumerate(self.keys)}
+        self.columns: dict[str, str] = {_column.upper(): _column for _row in self.rows[:1] for _column in _row}
+        self._indexes: dict[str, dict] = {}
+        self.compile = lru_cache(maxsize=4096)(self._compile)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def column(self, name: str) -> str:
+        """Resolve a column name case-insensitively."""
+        _column: str | None = self.columns.get(name.upper())
+
+        if _column is None:
+            raise ValueError(f'Unknown column {name!r}.')
+
+        return _column
+
+    def get(self, key: object) -> dict | None:
+        """Return the row with a key, or None."""
+        _position: int | None = self.positions.get(_coerce(self.keys[0], key)[1] if self.keys else key)
+        return self.rows[_position] if _position is not None else None
+
+    # Compilation of conditions into row predicates
+    def _value(self, node: tuple) -> Callable[[dict], object]:
+        if node[0] == 'value':
+            _value: object = node[1]
+            return lambda _row: _value
+
+        _column: str = self.column(node[1])
+        return lambda _row: _row.get(_column)
+
+    def _predicate(self, node: tuple) -> Callable[[dict], bool]:
+        _kind: str = node[0]
+
+        if _kind == 'and':
+            _left, _right = self._predicate(node[1]), self._predicate(node[2])
+            return lambda _row: _left(_row) and _right(_row)
+        elif _kind == 'or':
+            _left, _right = self._predicate(node[1]), self._predicate(node[2])
+            return lambda _row: _left(_row) or _right(_row)
+        elif _kind == 'not':
+            _inner: Callable = self._predicate(node[1])
+            return lambda _row: not _inner(_row)
+        elif _kind == 'null':
+            _get: Callable = self._value(node[1])
+            return lambda _row: _get(_row) is None
+        elif _kind == 'compare':
+            _compare: Callable = _COMPARISONS[node[1]]
+            _get_left, _get_right = self._value(node[2]), self._value(node[3])
+
+            def _compare_values(_row: dict) -> bool:
+                _left_value, _right_value = _get_left(_row), _get_right(_row)
+
+                if _left_value is None or _right_value is None:
+                    return False
+
+                try:
+                    return _compare(*_coerce(_left_value, _right_value))
+                except TypeError:
+                    return _compare(str(_left_value), str(_right_value))
+
+            return _compare_values
+        elif _kind == 'in':
+            _get = self._value(node[1])
+            _values: set = set(node[2]) | {str(_value) for _value in node[2]}
+            return lambda _row: _get(_row) in _values or str(_get(_row)) in _values
+        elif _kind == 'like':
+            _get = self._value(node[1])
+            _pattern: re.Pattern = _like_pattern(str(node[2][1]))
+            return lambda _row: _get(_row) is not None and _pattern.match(str(_get(_row))) is not None
+        elif _kind == 'between':
+            _low: Callable = self._predicate(('compare', '>=', node[1], node[2]))
+            _high: Callable = self._predicate(('compare', '<=', node[1], node[3]))
+            return lambda _row: _low(_row) and _high(_row)
+
+        raise ValueError(f'Unsupported condition {_kind!r}.')
+
+    # Index selection
+    def _conjuncts(self, node: tuple | None) -> Iterator[tuple]:
+        if node is None:
+            return
+        if node[0] == 'and':
+            yield from self._conjuncts(node[1])
+            yield from self._conjuncts(node[2])
+        else:
+            yield node
+
+    def _candidates(self, where: tuple | None) -> Iterable[int]:
+        """
+        Use the key index and the equality indexes to narrow the rows a condition can match, returning their positions in key order.
+        """
+        _low, _high = 0, len(self.keys)
+        _sets: list[list[int]] = []
+
+        for _node in self._conjuncts(where):
+            if _node[0] == 'compare' and _node[2][0] == 'column' and _node[3][0] == 'value':
+                _operator, _column, _value = _node[1], _node[2][1], _node[3][1]
+            elif _node[0] == 'compare' and _node[3][0] == 'column' and _node[2][0] == 'value':
+                _operator = {'<': '>', '<=': '>=', '>': '<', '>=': '<='}.get(_node[1], _node[1])
+                _column, _value = _node[3][1], _node[2][1]
+            elif _node[0] == 'between' and _node[1][0] == 'column' and _node[2][0] == 'value' and _node[3][0] == 'value':
+                if self.column(_node[1][1]) == self.key and self.keys:
+                    _low = max(_low, bisect.bisect_left(self.keys, _coerce(self.keys[0], _node[2][1])[1]))
+                    _high = min(_high, bisect.bisect_right(self.keys, _coerce(self.keys[0], _node[3][1])[1]))
+                continue
+            elif _node[0] == 'in' and _node[1][0] == 'column':
+                if self.column(_node[1][1]) == self.key:
+                    _sets.append(sorted({_position for _value in _node[2] if (_position := self._key_position(_value)) is not None}))
+                continue
+            else:
+                continue
+
+            if _value is None or _operator in ('!=', '<>'):
+                continue
+
+            _column = self.column(_column)
+
+            if _column == self.key and self.keys:
+                _key: object = _coerce(self.keys[0], _value)[1]
+
+                try:
+                    if _operator == '=':
+                        _position: int | None = self.positions.get(_key)
+                        _sets.append([_position] if _position is not None else [])
+                    elif _operator == '>':
+                        _low = max(_low, bisect.bisect_right(self.keys, _key))
+                    elif _operator == '>=':
+                        _low = max(_low, bisect.bisect_left(self.keys, _key))
+                    elif _operator == '<':
+                        _high = min(_high, bisect.bisect_left(self.keys, _key))
+                    elif _operator == '<=':
+                        _high = min(_high, bisect.bisect_right(self.keys, _key))
+                except TypeError:
+                    pass # The literal cannot be compared with the keys; the full condition decides
+            elif _operator == '=':
+                _sets.append(self._index(_column).get(_index_key(_value), []))
+
+        if _sets:
+            _smallest: list[int] = min(_sets, key=len)
+            return [_position for _position in _smallest if _low <= _position < _high]
+
+        return range(_low, max(_low, _high))
+
+    def _key_position(self, value: object) -> int | None:
+        return self.positions.get(_coerce(self.keys[0], value)[1]) if self.keys else None
+
+    def _index(self, column: str) -> dict:
+        _index: dict | None = self._indexes.get(column)
+
+        if _index is None:
+            _index = {}
+
+            for _position, _row in enumerate(self.rows):
+                if _row.get(column) is not None:
+                    _index.setdefault(_index_key(_row.get(column)), []).append(_position)
+
+            self._indexes[column] = _index
+
+        return _index
+
+    def _fold(self, node: tuple) -> tuple | bool:
+        """
+        Fold the parts of a condition that do not depend on the row (ex. 'WHERE 1=1') into True or False.
+        """
+        if node[0] == 'compare' and node[2][0] == 'value' and node[3][0] == 'value':
+            return self._predicate(node)({})
+        elif node[0] == 'not':
+            _inner: tuple | bool = self._fold(node[1])
+            return (not _inner) if isinstance(_inner, bool) else ('not', _inner)
+        elif node[0] in ('and', 'or'):
+            _left, _right = self._fold(node[1]), self._fold(node[2])
+            _absorbing: bool = node[0] == 'or' # True absorbs an OR, False absorbs an AND
+
+            if _left is _absorbing or _right is _absorbing:
+                return _absorbing
+            if isinstance(_left, bool):
+                return _right
+            if isinstance(_right, bool):
+                return _left
+
+            return (node[0], _left, _right)
+
+        return node
+
+    def _compile(self, where: tuple | None) -> Callable[[dict], bool] | None:
+        """
+        Compile a condition into a row predicate, or None if every row matches.
+        """
+        _where: tuple | bool = self._fold(where) if where is not None else True
+
+        if _where is True:
+            return None
+        if _where is False:
+            return lambda _row: False
+
+        return self._predicate(_where)
+
+    # Execution
+    def select(self,
+               where: tuple | None = None,
+               order_by: list[tuple[str, bool]] | None = None,
+               offset: int = 0,
+               fetch: int | None = None) -> list[dict]:
+        """
+        Return the rows that match a condition, in order, after skipping `offset` rows and keeping at most `fetch` rows.
+        Rows are read in key order and stop being read once the page is full, unless the order requires sorting.
+
+        :param where: The parsed condition, or None for all rows.
+        :param order_by: The (column, descending) ordering, or None for key order.
+        :param offset: The number of matching rows to skip.
+        :param fetch: The maximum number of rows to return, or None for all rows.
+        :return: The matching rows.
+        """
+        _predicate: Callable[[dict], bool] | None = self.compile(where)
+        _positions: Iterable[int] = self._candidates(where)
+        _order: list[tuple[str, bool]] = [(self.column(_column), _descending) for _column, _descending in order_by or []]
+
+        if len(_order) == 1 and _order[0][0] == self.key:
+            if _order[0][1]:
+                _positions = reversed(_positions if isinstance(_positions, (list, range)) else list(_positions))
+            _order = []
+
+        if _predicate is None and not _order:
+            # Every candidate matches, so the page can be sliced out of the candidates directly
+            _page: Iterable[int] = islice(_positions, offset, offset + fetch if fetch is not None else None) \
+                if not isinstance(_positions, (list, range)) else _positions[offset:offset + fetch if fetch is not None else None]
+            return [self.rows[_position] for _position in _page]
+
+        _rows: Iterator[dict] = (self.rows[_position] for _position in _positions)
+
+        if _predicate is not None:
+            _rows = filter(_predicate, _rows)
+
+        if not _order:
+            return list(islice(_rows, offset, offset + fetch if fetch is not None else None))
+
+        if fetch is not None and all(not _descending for _, _descending in _order):
+            return heapq.nsmallest(offset + fetch, _rows, key=lambda _row: tuple(_sort_key(_row.get(_column)) for _column, _ in _order))[offset:]
+
+        _matches: list[dict] = list(_rows)
+
+        # Stable sorts from the last ordering column to the first
+        for _column, _descending in reversed(_order):
+            _matches.sort(key=lambda _row: _sort_key(_row.get(_column)), reverse=_descending)
+
+        return _matches[offset:offset + fetch if fetch is not None else None]
+
+    def query(self, sql: str) -> list[dict]:
+        """
+        Execute a SELECT statement.
+
+        :param sql: The SQL statement.
+        :return: The selected rows, holding only the selected columns.
+        :raises ValueError: If the statement is not supported.
+        """
+        _query: Query = parse_query(sql)
+        _rows: list[dict] = self.select(_query.where, _query.order_by, _query.offset, _query.fetch)
+
+        if _query.columns is None:
+            return _rows
+
+        _columns: list[tuple[str, str]] = [(self.column(_column), _alias) for _column, _alias in _query.columns]
+
+        return [{_alias: _row.get(_column) for _column, _alias in _columns} for _row in _rows]
+
+    def retrieve(self, condition: str | None) -> list[dict]:
+        """
+        Return the whole rows that match a bare condition (ex. 'Id > 0').
+
+        :param condition: The condition, or None for all rows.
+        :return: The matching rows.
+        :raises ValueError: If the condition is not supported.
+        """
+        return self.select(parse_condition(condition or ''))
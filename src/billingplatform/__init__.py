@@ -1 +1,3 @@
 from .api import BillingPlatform
+from .async_api import AsyncBillingPlatform
+from .tenants import BillingPlatformPool
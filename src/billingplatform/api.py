@@ -1,13 +1,39 @@
 import atexit
 import base64
+import hashlib
 import logging
+import queue
 import requests
+import threading
+import time
 
 from . import exceptions
-from typing import Iterator, Literal
+from .auth import AuthManager, Credential, CredentialCache, default_credential_cache
+from .bulk import BULK_REQUEST_ENTITY, BulkJob
+from .cache import ResponseCache
+from .compression import accept_encoding, compress_body
+from .coalesce import DEFAULT_MAX_URL_LENGTH, RetrieveCoalescer, RetrieveResult, format_id, group_ids
+from .instrumentation import Instrumentation, RequestEvent
+from .mirror import Mirror
+from .multi import Operation, OperationResult, execute_many
+from .pipeline import PageResult, process_pages
+from .models import Record, convert_response
+from .batch import DEFAULT_CHUNK_SIZE, BatchError, BatchResult, chunk_records, record_error, record_results
+from .ratelimit import RateLimiter, RetryPolicy, parse_retry_after
+from .serialization import Serializer, get_id, get_serializer
+from .sql import clause_positions, has_pagination, keyset_page_sql, normalize, referenced_tables, set_order_by, use_keyset
+from .streaming import iter_json_array, row_converter
+from .sync import IncrementalSync, StateStore, SyncResult
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
+from typing import Callable, Iterable, Iterator, Literal
 from urllib.parse import quote # for URL encoding
 
 
+# Marks the end of a partition's pages in parallel_page_query
+_END_OF_PARTITION: object = object()
+
+
 class BillingPlatform:
     def __init__(self, 
                  base_url: str,
@@ -19,7 +45,28 @@ class BillingPlatform:
                  requests_parameters: dict | None = None,
                  auth_api_version: str = '1.0', # /auth endpoint version
                  rest_api_version: str = '2.0', # /rest endpoint version
-                 logout_at_exit: bool = True
+                 logout_at_exit: bool = True,
+                 rate_limiter: RateLimiter | None = None,
+                 retry_policy: RetryPolicy | None = None,
+                 pool_connections: int = 10,
+                 pool_maxsize: int = 10,
+                 pool_block: bool = False,
+                 keep_alive: bool = True,
+                 timeout: float | tuple[float, float] | None = None,
+                 cache: ResponseCache | None = None,
+                 coalesce_window: float | None = None,
+                 instrumentation: Instrumentation | None = None,
+                 serializer: Serializer | Literal['auto', 'orjson', 'msgspec', 'json'] = 'auto',
+                 refresh_margin: float = 60.0,
+                 session_lifetime: float | None = None,
+                 compress_responses: bool = True,
+                 request_compression_threshold: int | None = None,
+                 concurrency_limit: threading.Semaphore | None = None,
+                 lazy_login: bool = False,
+                 session_id: str | None = None,
+                 token: str | None = None,
+                 credential_cache: CredentialCache | bool = False,
+                 _pooled: bool = False
                 ):
         """
         Initialize the BillingPlatform API client.
@@ -33,8 +80,29 @@ class BillingPlatform:
         :param requests_parameters: Additional parameters to pass to each request made by the client (optional).
         :param auth_api_version: Version of the authentication API (default is '1.0').
         :param rest_api_version: Version of the REST API (default is '2.0').
-        :param logout_at_exit: Whether to log out of the session automatically at exit (default is True).        
-        :raises ValueError: If neither username/password nor client_id/client_secret is provided.
+        :param logout_at_exit: Whether to log out of the session automatically at exit (default is True).
+        :param rate_limiter: Optional client-wide RateLimiter that paces requests and backs off when the API throttles them.
+        :param retry_policy: Optional RetryPolicy for retrying throttled and failed requests with jittered exponential backoff.
+        :param pool_connections: Number of per-host connection pools to cache (default is 10).
+        :param pool_maxsize: Maximum number of connections kept per host. Set this to at least the number of threads sharing the client (default is 10).
+        :param pool_block: Whether threads wait for a free connection when the pool is full instead of opening a throwaway connection (default is False).
+        :param keep_alive: Whether to reuse connections between requests (default is True).
+        :param timeout: Default request timeout in seconds, either a single value or a (connect, read) tuple (default is None, which waits indefinitely).
+        :param cache: Optional ResponseCache for query and retrieve responses. Writes made through this client invalidate the written entity.
+        :param coalesce_window: Optional number of seconds to collect concurrent retrieve_by_id calls for, sending them as one retrieve_by_ids call per entity (default is None, which sends each call on its own).
+        :param instrumentation: Optional Instrumentation that receives request hooks and keeps per-endpoint latency histograms and counters.
+        :param serializer: The JSON backend for request and response bodies: a Serializer, or 'auto' to use orjson or msgspec when installed and the standard library otherwise (default is 'auto').
+        :param refresh_margin: The number of seconds before a credential expires to refresh it in the background (default is 60).
+        :param session_lifetime: The lifetime in seconds to assume for session IDs and tokens whose login response does not report one (default is None, which re-authenticates only after a 401).
+        :param compress_responses: Whether to ask for compressed responses with every encoding the client can decode (default is True). False asks for uncompressed responses.
+        :param request_compression_threshold: Optional size in bytes from which request bodies are sent gzip compressed (ex. 8192). Compression is turned off if the server answers 415 (default is None, which never compresses).
+        :param concurrency_limit: Optional semaphore that caps the requests in flight, shared by several clients to cap their combined concurrency (ex. across tenants).
+        :param lazy_login: Whether to log in on the first request instead of in the constructor (default is False).
+        :param session_id: Optional session ID obtained earlier, used instead of logging in. The client logs in with its credentials, if any, once the session is rejected.
+        :param token: Optional OAuth token obtained earlier, used instead of logging in. The client logs in with its credentials, if any, once the token is rejected.
+        :param credential_cache: Optional process-local CredentialCache whose valid credentials are used instead of logging in, and which keeps the client's new credentials. True uses the cache shared by the whole process (default is False).
+        :param _pooled: Internal. Whether the client belongs to a BillingPlatformPool, which logs it out instead (default is False).
+        :raises ValueError: If neither username/password, client_id/client_secret nor a session ID or token is provided.
         :raises BillingPlatformException: If login fails or response does not contain expected data.
         """
         self.base_url: str = base_url.rstrip('/')
@@ -43,13 +111,39 @@ class BillingPlatform:
         self.client_id: str | None = client_id
         self.client_secret: str | None = client_secret
         self.use_token: str | None = use_token
-        self.token: str | None = None
-        self.requests_parameters: dict = requests_parameters or {}
+        self.token: str | None = token
+        self.requests_parameters: dict = dict(requests_parameters or {})
         self.auth_api_version: str = auth_api_version
         self.rest_api_version: str = rest_api_version
         self.logout_at_exit: bool = logout_at_exit
+        self.rate_limiter: RateLimiter | None = rate_limiter
+        self.retry_policy: RetryPolicy | None = retry_policy
+        self.cache: ResponseCache | None = cache
+        self.instrumentation: Instrumentation | None = instrumentation
+        self.serializer: Serializer = get_serializer(serializer) if isinstance(serializer, str) else serializer
+        self._coalescer: RetrieveCoalescer | None = RetrieveCoalescer(self.retrieve_by_ids, coalesce_window) if coalesce_window else None
         self.session: requests.Session = requests.Session()
 
+        # Size the connection pool for the threads sharing this client
+        _adapter: HTTPAdapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+        self.session.mount('https://', _adapter)
+        self.session.mount('http://', _adapter)
+        self.pool_maxsize: int = pool_maxsize
+
+        if not keep_alive:
+            self.session.headers.update({'Connection': 'close'})
+
+        # Negotiate compressed responses explicitly; they are decoded transparently
+        self.session.headers.update({'Accept-Encoding': accept_encoding() if compress_responses else 'identity'})
+        self.request_compression_threshold: int | None = request_compression_threshold
+        self.concurrency_limit: threading.Semaphore | None = concurrency_limit
+        self.credential_cache: CredentialCache | None = default_credential_cache if credential_cache is True else (
+            credential_cache if isinstance(credential_cache, CredentialCache) else None
+        )
+
+        if timeout is not None:
+            self.requests_parameters.setdefault('timeout', timeout)
+
         # Construct base URLs
         self.auth_base_url: str = f'{self.base_url}/auth/{self.auth_api_version}'
         self.rest_base_url: str = f'{self.base_url}/rest/{self.rest_api_version}'
@@ -57,24 +151,49 @@ class BillingPlatform:
 
         # Authenticate based on provided credentials
         if all([self.username, self.password]):
-            self._login()
+            self._login_method: Callable[[], float | None] = self._login
+            # The secret is part of the key, so a client with a wrong password does not reuse a cached session
+            self._credential_key: tuple = ('login', self.rest_base_url, self.username, hashlib.sha256(self.password.encode()).hexdigest())
+
+            if self.logout_at_exit:
+                atexit.register(self.logout)
+            elif not _pooled:
+                logging.warning('Automatic logout at exit has been disabled. You must call logout() manually to close the session.')
         elif all([self.client_id, self.client_secret, self.use_token]):
-            self._oauth_login()
+            self._login_method = self._oauth_login
+            self._credential_key = ('oauth', self.auth_base_url, self.client_id, hashlib.sha256(self.client_secret.encode()).hexdigest(), self.use_token)
+        elif session_id or token:
+            self._login_method = self._no_login
+            self._credential_key = ('credential', self.base_url, hashlib.sha256((session_id or token).encode()).hexdigest())
         else:
-            raise ValueError("Either username/password or client_id/client_secret must be provided.")
+            raise ValueError("Either username/password, client_id/client_secret or a session_id/token must be provided.")
+
+        # Re-authenticates before credentials expire and after a 401
+        self.auth: AuthManager = AuthManager(self._authenticate, refresh_margin, session_lifetime)
+
+        if session_id or token:
+            self._set_credential({'sessionid': session_id} if session_id else {'Authorization': f'Bearer {token}'})
+            self.auth.adopt()
 
+            if self.credential_cache is not None:
+                self.credential_cache.put(self._credential_key, self._credential_headers(), session_lifetime)
+        elif not lazy_login:
+            self.auth.authenticate()
 
-    def _response_handler(self, response: requests.Response) -> dict:
+
+    def _response_handler(self, response: requests.Response, entity: str | None = None) -> dict:
         """
         Handle the response from the BillingPlatform API.
 
         :param response: The response object returned from the request.
+        :param entity: The entity the response was read from, for decoding its records into a typed record (optional).
         :return: The response data as a dictionary.
         :raises BillingPlatformException: If the response status code is not 200.
         """
         if response.status_code == 200:
-            logging.debug(f'Success Response: {response.text}')
-            return response.json()
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                logging.debug('Success Response: %s', response.text)
+            return self.serializer.loads_response(response.content, entity)
         elif response.status_code == 400:
             raise exceptions.BillingPlatform400Exception(response)
         elif response.status_code == 401:
@@ -89,20 +208,229 @@ class BillingPlatform:
             raise exceptions.BillingPlatformException(response)
 
 
-    def _login(self) -> None:
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
         """
-        Authenticate with the BillingPlatform API using username and password. If successful, updates the session headers with the session ID.
+        Send a request with the client session, pacing it with the rate limiter and retrying it according to the retry policy.
+        The request is reported to the client instrumentation, if any.
+
+        :param method: The HTTP method of the request.
+        :param url: The URL of the request.
+        :param kwargs: Additional keyword arguments passed to requests.Session.request (ex. json).
+        :return: The final response object (which may still be an error response once retries are exhausted).
+        :raises requests.RequestException: If the request fails and cannot be retried.
+        """
+        if 'json' in kwargs:
+            # Encode JSON bodies with the client serializer rather than the requests' standard library path
+            kwargs['data'] = self.serializer.dumps(kwargs.pop('json'))
+            kwargs['headers'] = {'Content-Type': 'application/json', **(kwargs.get('headers') or {})}
+
+        if self.instrumentation is None:
+            return self._send_attempts(method, url, None, **kwargs)
+
+        _event: RequestEvent = self.instrumentation.start(method, url)
+
+        try:
+            _response: requests.Response = self._send_attempts(method, url, _event, **kwargs)
+        except Exception as e:
+            _event.error = str(e)
+            self.instrumentation.finish(_event)
+            raise
+
+        _body: bytes | str | None = _response.request.body if _response.request is not None else None
+        _content_length: str = _response.headers.get('Content-Length', '')
+        _event.status_code = _response.status_code
+        _event.bytes_sent = len(_body.encode('utf-8') if isinstance(_body, str) else _body or b'')
+        _event.content_encoding = _response.headers.get('Content-Encoding')
+
+        if not kwargs.get('stream'):
+            _event.payload_bytes_received = len(_response.content)
+            # Bytes read off the wire, before the content encoding was decoded
+            _wire_bytes: int = _response.raw.tell() if hasattr(_response.raw, 'tell') else 0
+            _event.bytes_received = _wire_bytes or (int(_content_length) if _content_length.isdigit() else _event.payload_bytes_received)
+        elif _content_length.isdigit():
+            _event.bytes_received = int(_content_length)
+
+        self.instrumentation.finish(_event)
+
+        return _response
+
+
+    def _send_attempts(self, method: str, url: str, event: RequestEvent | None, **kwargs) -> requests.Response:
+        """
+        Send a request, retrying it according to the retry policy. See _send().
+
+        :param method: The HTTP method of the request.
+        :param url: The URL of the request.
+        :param event: The instrumentation event of the request, whose retry count is kept up to date (optional).
+        :param kwargs: Additional keyword arguments passed to requests.Session.request (ex. json).
+        :return: The final response object.
+        :raises requests.RequestException: If the request fails and cannot be retried.
+        """
+        _retryable: bool = self.retry_policy is not None and self.retry_policy.is_retryable(method)
+        _attempt: int = 0
+        _generation: int = self.auth.ensure_fresh()
+        _reauthenticated: bool = False
+        _payload: bytes | None = kwargs.get('data') if isinstance(kwargs.get('data'), bytes) else None
+
+        if _payload is not None and self.request_compression_threshold is not None and len(_payload) >= self.request_compression_threshold:
+            kwargs['data'] = compress_body(_payload)
+            kwargs['headers'] = {**(kwargs.get('headers') or {}), 'Content-Encoding': 'gzip'}
+            logging.debug('Compressed %s byte request body to %s bytes', len(_payload), len(kwargs['data']))
+
+        if event is not None and _payload is not None:
+            event.payload_bytes_sent = len(_payload)
+
+        while True:
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+
+            try:
+                _response: requests.Response = self._session_request(method, url, **kwargs)
+            except BaseException as e:
+                # Free the slot whatever the error (ex. ChunkedEncodingError), or later requests would wait for it forever
+                if self.rate_limiter:
+                    self.rate_limiter.release()
+
+                if not isinstance(e, (requests.ConnectionError, requests.Timeout)) or not _retryable or _attempt >= self.retry_policy.max_retries:
+                    raise
+
+                _delay: float = self.retry_policy.backoff(_attempt)
+                logging.warning('%s request failed (%s). Retrying in %.2f seconds.', method, e, _delay)
+                time.sleep(_delay)
+                _attempt += 1
+
+                if event is not None:
+                    event.retries = _attempt
+                continue
+
+            _retry_after: float | None = parse_retry_after(_response.headers.get('Retry-After'))
+
+            if self.rate_limiter:
+                self.rate_limiter.release(_response.status_code, _retry_after)
+
+            if _retryable and _response.status_code in self.retry_policy.retry_statuses and _attempt < self.retry_policy.max_retries:
+                _delay = self.retry_policy.backoff(_attempt, _retry_after)
+                logging.warning('%s request returned %s. Retrying in %.2f seconds.', method, _response.status_code, _delay)
+                _response.close()
+                time.sleep(_delay)
+                _attempt += 1
+
+                if event is not None:
+                    event.retries = _attempt
+                continue
+
+            if _response.status_code == 401 and not _reauthenticated:
+                # The credential expired or was revoked: log in again (once for all threads that saw it) and resend once
+                logging.warning('%s request returned 401. Re-authenticating and retrying once.', method)
+                _response.close()
+                _generation = self.auth.refresh(_generation)
+                _reauthenticated = True
+                continue
+
+            if _response.status_code == 415 and 'Content-Encoding' in (kwargs.get('headers') or {}):
+                # The server does not accept compressed bodies: stop compressing and resend this one as it is
+                logging.warning('%s request with a compressed body returned 415. Sending request bodies uncompressed from now on.', method)
+                _response.close()
+                self.request_compression_threshold = None
+                kwargs['data'] = _payload
+                kwargs['headers'] = {_name: _value for _name, _value in kwargs['headers'].items() if _name != 'Content-Encoding'}
+                continue
+
+            return _response
+
+
+    def _session_request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send one request with the client session, holding a slot of the shared concurrency limit while it is sent, if the client has one.
+
+        :param method: The HTTP method of the request.
+        :param url: The URL of the request.
+        :param kwargs: Additional keyword arguments passed to requests.Session.request (ex. data).
+        :return: The response object.
+        """
+        if self.concurrency_limit is None:
+            return self.session.request(method, url, **self._request_parameters(**kwargs))
+
+        with self.concurrency_limit:
+            return self.session.request(method, url, **self._request_parameters(**kwargs))
+
+
+    def _request_parameters(self, **kwargs) -> dict:
+        """
+        Merge the parameters of one request into the client's requests_parameters. Headers are merged header by header,
+        so request headers (ex. Content-Type) do not drop the custom headers of requests_parameters.
+
+        :param kwargs: The keyword arguments of the request.
+        :return: The keyword arguments to pass to requests.Session.request.
+        """
+        _parameters: dict = {**self.requests_parameters, **kwargs}
 
+        if self.requests_parameters.get('headers') and kwargs.get('headers'):
+            _parameters['headers'] = {**self.requests_parameters['headers'], **kwargs['headers']}
+
+        return _parameters
+
+
+    def _request(self, method: str, url: str, entity: str | None = None, **kwargs) -> dict:
+        """
+        Send a request to the BillingPlatform API and handle the response.
+
+        :param method: The HTTP method of the request.
+        :param url: The URL of the request.
+        :param entity: The entity the response is read from, for decoding its records into a typed record (optional).
+        :param kwargs: Additional keyword arguments passed to requests.Session.request (ex. json).
+        :return: The response data as a dictionary.
+        :raises BillingPlatformException: If the response status code is not 200.
+        """
+        return self._response_handler(self._send(method, url, **kwargs), entity)
+
+
+    def _cached_request(self, key: str, entities: set[str], fetch: Callable[[], dict], entity: str | None = None) -> dict:
+        """
+        Read a response through the response cache, if the client has one.
+
+        :param key: The cache key of the response.
+        :param entities: The uppercased entities the response is read from, used for TTLs and invalidation.
+        :param fetch: The function that requests the response from the API on a cache miss.
+        :param entity: The entity the response is read from, for decoding cached records into a typed record (optional).
+        :return: The response data, from the cache or from the API.
+        """
+        if self.cache is None:
+            return fetch()
+
+        _cached_response: dict | None = self.cache.get(key, lambda _value: self.serializer.loads_response(_value, entity))
+
+        if _cached_response is not None:
+            logging.debug('Cache hit: %s', key)
+            return _cached_response
+
+        _response: dict = fetch()
+        self.cache.set(key, _response, entities, self.serializer.dumps)
+
+        return _response
+
+
+    def _invalidate(self, entity: str) -> None:
+        """
+        Drop the cached responses of an entity after a write, if the client has a response cache.
+
+        :param entity: The entity that was written.
         :return: None
+        """
+        if self.cache is not None:
+            _removed: int = self.cache.invalidate(entity)
+            logging.debug('Invalidated %s cached response(s) for %s', _removed, entity)
+
+
+    def _login(self) -> float | None:
+        """
+        Authenticate with the BillingPlatform API using username and password. If successful, updates the session headers with the session ID.
+
+        :return: None, since the login response does not report the lifetime of the session.
         :raises Exception: If the login response does not contain a session ID.
         """
-        if self.logout_at_exit:
-            atexit.register(self.logout)
-        else:
-            logging.warning('Automatic logout at exit has been disabled. You must call logout() manually to close the session.')
-        
         _login_url: str = f'{self.rest_base_url}/login'
-        logging.debug(f'Login URL: {_login_url}')
+        logging.debug('Login URL: %s', _login_url)
         
         # Update session headers
         _login_payload: dict = {
@@ -125,41 +453,138 @@ class BillingPlatform:
                 self.session.headers.update({'sessionid': _session_id})
             else:
                 raise Exception('Login response did not contain a session ID.')
+
+            return None
         except requests.RequestException as e:
             raise Exception(f'Failed to login: {e}')
     
 
-    def _oauth_login(self) -> None:
+    def _no_login(self) -> float | None:
         """
-        Authenticate with the BillingPlatform API using OAuth and return an access and/or refresh token. if successful, updates the session headers with the authorization token.
+        Stand in for a login when the client was given a session ID or token but no credentials to log in with.
+
+        :raises Exception: Always, since the client cannot replace a rejected credential.
+        """
+        raise Exception('Failed to login: the session ID or token was rejected and no username/password or client_id/client_secret was provided.')
+
+
+    def _credential_headers(self) -> dict[str, str]:
+        """
+        Get the session headers of the current credential, as kept in the credential cache.
+
+        :return: The session headers that carry the current credential (the session ID or the bearer token).
+        """
+        return {_header: self.session.headers[_header] for _header in ('sessionid', 'Authorization') if _header in self.session.headers}
+
 
+    def _set_credential(self, headers: dict[str, str]) -> None:
+        """
+        Send requests with a credential obtained without logging in (ex. from the credential cache).
+
+        :param headers: The session headers that carry the credential.
         :return: None
+        """
+        self.session.headers.update(headers)
+
+        if 'Authorization' in headers:
+            self.token = headers['Authorization'].removeprefix('Bearer ')
+
+
+    def _authenticate(self) -> float | None:
+        """
+        Log in, unless the credential cache holds a valid credential other than the current one (which was rejected or is
+        due for a refresh). New credentials are added to the credential cache.
+
+        :return: The lifetime of the credential in seconds, or None if unknown.
+        """
+        if self.credential_cache is None:
+            return self._login_method()
+
+        _current: dict[str, str] = self._credential_headers()
+        _credential: Credential | None = self.credential_cache.get(self._credential_key, self.auth.refresh_margin)
+
+        if _credential is not None and _credential.headers != _current:
+            logging.debug('Using a cached credential instead of logging in')
+            self._set_credential(_credential.headers)
+            return _credential.lifetime
+
+        self.credential_cache.discard(self._credential_key, _current)
+        _lifetime: float | None = self._login_method()
+        self.credential_cache.put(self._credential_key, self._credential_headers(), _lifetime or self.auth.session_lifetime)
+
+        return _lifetime
+
+
+    def _oauth_login(self) -> float | None:
+        """
+        Authenticate with the BillingPlatform API using OAuth and return an access and/or refresh token. if successful, updates the session headers with the authorization token.
+
+        :return: The lifetime of the token in seconds ('expires_in'), or None if the response does not report it.
         :raises BillingPlatformException: If the OAuth response does not contain the expected token.
         :raises Exception: If the authentication request fails.
         """
         _authenticate_url: str = f'{self.auth_base_url}/authenticate?grant_type=client_credentials'
-        logging.debug(f'Authenticate URL: {_authenticate_url}')
+        logging.debug('Authenticate URL: %s', _authenticate_url)
 
         # Encode client credentials into base64
         _base64_credentials: str = base64.b64encode(f'{self.client_id}:{self.client_secret}'.encode('utf-8')).decode('utf-8')
 
-        self.session.headers.update({'Authorization': f'Basic {_base64_credentials}'})
-
         try:
-            _oauth_response: requests.Response = self._response_handler(
-                self.session.post(_authenticate_url, **self.requests_parameters)
+            # Send the client credentials with this request only, so concurrent requests keep the current token while it is refreshed
+            _oauth_response: dict = self._response_handler(
+                self.session.post(_authenticate_url, **self._request_parameters(headers={'Authorization': f'Basic {_base64_credentials}'}))
             )
 
             # Update session headers with the token
             if self.use_token in _oauth_response:
                 self.token = _oauth_response[self.use_token]
                 self.session.headers.update({'Authorization': f'Bearer {self.token}'})
+
+                _expires_in: object = _oauth_response.get('expires_in')
+                return float(_expires_in) if _expires_in else None
             else:
                 raise exceptions.BillingPlatformException(f'OAuth response did not contain {self.use_token}. Ensure BillingPlatform is configured correctly to accept OAuth.')
         except requests.RequestException as e:
             raise Exception(f'Failed to authenticate with OAuth: {e}')
 
 
+    def warm_up(self, connections: int | None = None) -> int:
+        """
+        Open connections to the BillingPlatform host ahead of time so the first requests do not pay for TCP and TLS handshakes.
+        The connections are opened concurrently and returned to the session's connection pool.
+
+        :param connections: The number of connections to open (default is the pool_maxsize of the client).
+        :return: The number of connections that were opened.
+        """
+        _connections: int = min(connections or self.pool_maxsize, self.pool_maxsize)
+        _barrier: threading.Barrier = threading.Barrier(_connections)
+
+        def _open_connection() -> bool:
+            _response: requests.Response | None = None
+
+            try:
+                # Hold the (streamed) response until every thread has one, so each thread gets its own connection
+                _response = self.session.head(self.base_url, stream=True, **self.requests_parameters)
+            except requests.RequestException as e:
+                logging.debug('Failed to warm up connection: %s', e)
+
+            try:
+                _barrier.wait(timeout=10)
+            except threading.BrokenBarrierError:
+                pass
+            finally:
+                if _response is not None:
+                    _response.close()
+
+            return _response is not None
+
+        with ThreadPoolExecutor(max_workers=_connections) as _executor:
+            _opened: int = sum(_executor.map(lambda _: _open_connection(), range(_connections)))
+
+        logging.debug('Warmed up %s connections to %s', _opened, self.base_url)
+        return _opened
+
+
     def logout(self) -> None:
         """
         Log out of the BillingPlatform session. This should be called to close the session and clean up resources.
@@ -167,10 +592,17 @@ class BillingPlatform:
         :return: None
         :raises Exception: If the logout request fails.
         """
+        self.auth.close()
+
         try:
-            if self.session.headers.get('sessionid', False):
+            if self.auth.generation == 0:
+                logging.debug('Never logged in. Skipping logout.')
+            elif self.credential_cache is not None and not self.credential_cache.discard(self._credential_key, self._credential_headers()):
+                # The session was shared through the credential cache, and another client already logged out of it or replaced it
+                logging.debug('Cached session already logged out. Skipping logout.')
+            elif self.session.headers.get('sessionid', False):
                 _logout_url: str = f'{self.rest_base_url}/logout'
-                logging.debug(f'Logout URL: {_logout_url}')
+                logging.debug('Logout URL: %s', _logout_url)
 
                 _logout_response: dict = self._response_handler(
                     self.session.post(_logout_url, **self.requests_parameters)
@@ -185,23 +617,22 @@ class BillingPlatform:
             raise Exception(f"Failed to logout: {e}")
 
 
-    def query(self, 
-              sql: str,
-              offset: int = 0,
-              limit: int = 0) -> dict:
+    def _query_url(self,
+                   sql: str,
+                   offset: int = 0,
+                   limit: int = 0) -> str:
         """
-        Execute a SQL query against the BillingPlatform API.
+        Build the URL of a query request, appending the BillingPlatform pagination syntax when an offset or limit is given.
 
-        :param sql: The SQL query to execute. It should be a valid SQL statement that the BillingPlatform API can process.
+        :param sql: The SQL query to execute.
         :param offset: The number of rows to skip before starting to return rows (default is 0).
         :param limit: The maximum number of rows to return (default is 0, which means no limit).
-        :return: The query response data.
-        :raises Exception: If the query request fails.
+        :return: The query URL with the URL encoded SQL query.
         """
         # Encode the SQL query for URL
         _url_encoded_sql: str = ''
 
-        if 'OFFSET' in sql.upper() or 'LIMIT' in sql.upper():
+        if has_pagination(sql):
             _url_encoded_sql = quote(sql)
         else:
             if offset:
@@ -212,13 +643,61 @@ class BillingPlatform:
             
             _url_encoded_sql = quote(sql)
 
-        _query_url: str = f'{self.rest_base_url}/query?sql={_url_encoded_sql}'
-        logging.debug(f'Query URL: {_query_url}')
+        return f'{self.rest_base_url}/query?sql={_url_encoded_sql}'
+
+
+    def query(self, 
+              sql: str,
+              offset: int = 0,
+              limit: int = 0,
+              record_type: type[Record] | Literal['auto'] | None = None) -> dict:
+        """
+        Execute a SQL query against the BillingPlatform API.
+
+        :param sql: The SQL query to execute. It should be a valid SQL statement that the BillingPlatform API can process.
+        :param offset: The number of rows to skip before starting to return rows (default is 0).
+        :param limit: The maximum number of rows to return (default is 0, which means no limit).
+        :param record_type: Optional slotted Record type to return rows as (see billingplatform.models), or 'auto' to generate one from the selected columns (default is None, which returns dicts).
+        :return: The query response data.
+        :raises Exception: If the query request fails.
+        """
+        return self._query(sql, offset, limit, record_type, cached=True)
+
+
+    def _query(self,
+               sql: str,
+               offset: int = 0,
+               limit: int = 0,
+               record_type: type[Record] | Literal['auto'] | None = None,
+               cached: bool = False) -> dict:
+        """
+        Execute a SQL query, through the response cache only if cached is True. Paged fetches are not cached, so a
+        scan of a large entity does not evict the cached responses of direct queries.
+
+        :param sql: The SQL query to execute.
+        :param offset: The number of rows to skip before starting to return rows (default is 0).
+        :param limit: The maximum number of rows to return (default is 0, which means no limit).
+        :param record_type: Optional slotted Record type to return rows as, or 'auto' to generate one from the selected columns (default is None, which returns dicts).
+        :param cached: Whether to read and store the response in the response cache (default is False).
+        :return: The query response data.
+        :raises Exception: If the query request fails.
+        """
+        _query_url: str = self._query_url(sql, offset, limit)
+        logging.debug('Query URL: %s', _query_url)
+        _tables: set[str] = referenced_tables(sql)
+        _entity: str | None = next(iter(_tables)) if len(_tables) == 1 else None # Only single-entity results are typed
 
         try:
-            _query_response: dict = self._response_handler(
-                self.session.get(_query_url, **self.requests_parameters)
-            )
+            if cached:
+                _query_response: dict = self._cached_request(f'query:{normalize(sql)}|{offset}|{limit}', 
+                                                             _tables, 
+                                                             lambda: self._request('GET', _query_url, _entity),
+                                                             _entity)
+            else:
+                _query_response = self._request('GET', _query_url, _entity)
+
+            if record_type is not None:
+                convert_response(_query_response, record_type, _entity)
 
             return _query_response
         except requests.RequestException as e:
@@ -228,15 +707,23 @@ class BillingPlatform:
     def page_query(self, 
                    sql: str,
                    page_size: int = 1000,
-                   offset: int = 0) -> Iterator[dict]:
+                   offset: int = 0,
+                   record_type: type[Record] | Literal['auto'] | None = None,
+                   keyset: bool | Literal['auto'] = 'auto') -> Iterator[dict]:
         """
         Execute a paginated SQL query against the BillingPlatform API (as a generator).
         Yields each page of results as a dict.
+
+        Queries that allow it (see sql.keyset_eligible) are paged with 'Id > <last Id>' predicates ordered by Id rather
+        than with OFFSET, so every page costs the same regardless of depth.
         
         :param sql: The SQL query to execute. It should be a valid SQL statement that the BillingPlatform API can process.
         :param page_size: The number of rows to return per page (default is 1000).
         :param offset: The number of rows to skip before starting to return rows (default is 0).
+        :param record_type: Optional slotted Record type to return rows as, or 'auto' to generate one from the selected columns (default is None, which returns dicts).
+        :param keyset: Whether to page with keyset predicates: 'auto' when the query allows it, True to require it, or False to always page with OFFSET (default is 'auto').
         :return: A generator that yields query response data for each page.
+        :raises ValueError: If keyset is True and the query cannot be paged with keyset predicates.
         :raises Exception: If the query request fails.
         """
         _offset: int = offset
@@ -245,9 +732,13 @@ class BillingPlatform:
             logging.warning('BillingPlatform API has a limit of 10,000 records per page. Setting page_size to 10,000.')
         _limit: int = min(page_size, 10000)
 
+        if use_keyset(sql, keyset):
+            yield from self._keyset_pages(sql, None, None, _limit, _offset, record_type)
+            return
+
         while True:
             try:
-                _query_response: dict = self.query(sql, offset=_offset, limit=_limit)
+                _query_response: dict = self._query(sql, offset=_offset, limit=_limit, record_type=record_type)
                 yield _query_response
                 _offset += _limit
             except exceptions.BillingPlatform404Exception:
@@ -256,24 +747,281 @@ class BillingPlatform:
                 raise Exception(f'Failed to execute paginated query: {e}')
 
 
+    def iter_rows(self,
+                  sql: str,
+                  page_size: int = 1000,
+                  offset: int = 0,
+                  row_type: Literal['dict', 'tuple', 'namedtuple'] = 'dict',
+                  chunk_size: int = 65536,
+                  keyset: bool | Literal['auto'] = 'auto') -> Iterator[dict | tuple]:
+        """
+        Execute a paginated SQL query against the BillingPlatform API and yield one row at a time (as a generator).
+        Each page is streamed and decoded incrementally, so memory use stays constant regardless of the page size.
+
+        :param sql: The SQL query to execute. It should be a valid SQL statement that the BillingPlatform API can process.
+        :param page_size: The number of rows to request per page (default is 1000).
+        :param offset: The number of rows to skip before starting to return rows (default is 0).
+        :param row_type: 'dict' for dictionaries, 'tuple' for tuples in column order, or 'namedtuple' for a compact named row type (default is 'dict').
+        :param chunk_size: The number of bytes read from the response body at a time (default is 65536).
+        :param keyset: Whether to page with keyset predicates ordered by Id: 'auto' when the query allows it, True to require it, or False to always page with OFFSET (default is 'auto').
+        :return: A generator that yields each row of the query response.
+        :raises ValueError: If the row type is not supported, or keyset is True and the query cannot be paged with keyset predicates.
+        :raises Exception: If the query request fails.
+        """
+        if row_type not in ('dict', 'tuple', 'namedtuple'):
+            raise ValueError(f"Unsupported row type '{row_type}'. Use 'dict', 'tuple' or 'namedtuple'.")
+
+        _offset: int = offset
+
+        if page_size > 10000:
+            logging.warning('BillingPlatform API has a limit of 10,000 records per page. Setting page_size to 10,000.')
+        _limit: int = min(page_size, 10000)
+        _convert = None
+        _keyset: bool = use_keyset(sql, keyset)
+        _last_id: object | None = None
+
+        while True:
+            if not _keyset:
+                _query_url: str = self._query_url(sql, _offset, _limit)
+            else:
+                _query_url = self._query_url(keyset_page_sql(sql, _last_id), _offset if _last_id is None else 0, _limit)
+            logging.debug('Query URL: %s', _query_url)
+
+            try:
+                _response: requests.Response = self._send('GET', _query_url, stream=True)
+            except requests.RequestException as e:
+                raise Exception(f'Failed to execute paginated query: {e}')
+
+            with _response:
+                if _response.status_code == 404:
+                    break  # No more records to fetch
+                elif _response.status_code != 200:
+                    self._response_handler(_response)  # Raises the matching exception
+
+                _rows: int = 0
+
+                for _row in iter_json_array(_response.iter_content(chunk_size), 'queryResponse'):
+                    if _convert is None:
+                        _convert = row_converter(row_type, _row.keys())
+
+                    if _keyset:
+                        _last_id = get_id(_row)
+
+                    yield _convert(_row)
+                    _rows += 1
+
+            if _rows < _limit:
+                break  # A short page is the last page
+
+            if _keyset:
+                if _last_id is None:
+                    raise ValueError('Keyset pagination requires the SQL query to select the Id column.')
+
+                _last_id = int(_last_id)
+
+            _offset += _limit
+
+
+    def _keyset_pages(self,
+                      sql: str,
+                      lower_id: int | None,
+                      upper_id: int | None,
+                      page_size: int,
+                      offset: int = 0,
+                      record_type: type[Record] | Literal['auto'] | None = None) -> Iterator[dict]:
+        """
+        Page through the rows of a SQL query whose 'Id' falls within an inclusive range using keyset predicates (as a generator).
+        Each page is requested with 'Id > <last Id seen>' rather than an OFFSET, so every page costs the same regardless of depth.
+
+        :param sql: The SQL query to execute. It must select the 'Id' column and must not contain ORDER BY or pagination clauses.
+        :param lower_id: The lowest 'Id' to return, or None for no lower bound.
+        :param upper_id: The highest 'Id' to return, or None for no upper bound.
+        :param page_size: The number of rows to return per page.
+        :param offset: The number of rows of the range to skip, applied to the first page only (default is 0).
+        :param record_type: Optional slotted Record type to return rows as (default is None, which returns dicts).
+        :return: A generator that yields query response data for each page.
+        :raises ValueError: If the query response rows do not contain an 'Id' column.
+        """
+        _last_id: int | None = lower_id - 1 if lower_id is not None else None
+        _offset: int = offset
+
+        while upper_id is None or _last_id is None or _last_id < upper_id:
+            _page_sql: str = keyset_page_sql(sql, _last_id, upper_id)
+
+            try:
+                _query_response: dict = self._query(_page_sql, offset=_offset, limit=page_size, record_type=record_type)
+                _offset = 0
+            except exceptions.BillingPlatform404Exception:
+                break  # No more records in this range
+
+            _rows: list[dict] = _query_response.get('queryResponse', [])
+
+            if not _rows:
+                break
+
+            if get_id(_rows[-1]) is None:
+                raise ValueError('Keyset pagination requires the SQL query to select the Id column.')
+
+            yield _query_response
+
+            if len(_rows) < page_size:
+                break  # A short page is the last page of the range
+
+            _last_id = int(get_id(_rows[-1]))
+
+
+    def parallel_page_query(self,
+                            sql: str,
+                            page_size: int = 1000,
+                            partitions: int = 4,
+                            max_workers: int = 4,
+                            id_range: tuple[int, int] | None = None,
+                            prefetch: int = 2) -> Iterator[dict]:
+        """
+        Execute a SQL query against the BillingPlatform API by splitting the result set into 'Id' ranges and paging through
+        each range concurrently (as a generator). Pages are yielded in ascending 'Id' order regardless of which worker fetched them.
+
+        :param sql: The SQL query to execute. It must select the 'Id' column and must not contain ORDER BY or pagination clauses.
+        :param page_size: The number of rows to return per page (default is 1000).
+        :param partitions: The number of 'Id' ranges to split the result set into (default is 4).
+        :param max_workers: The maximum number of ranges fetched at the same time (default is 4).
+        :param id_range: Optional inclusive (lowest, highest) 'Id' bounds. If None, the bounds are looked up with two single row queries.
+        :param prefetch: The number of pages each worker may fetch ahead of the consumer (default is 2).
+        :return: A generator that yields query response data for each page.
+        :raises ValueError: If the SQL query is not suitable for keyset pagination.
+        :raises Exception: If the query request fails.
+        """
+        if any(_keyword in ('ORDER BY', 'OFFSET', 'FETCH', 'LIMIT') for _keyword, _, _ in clause_positions(sql)):
+            raise ValueError('Parallel page queries cannot contain ORDER BY, OFFSET, FETCH or LIMIT clauses.')
+
+        if page_size > 10000:
+            logging.warning('BillingPlatform API has a limit of 10,000 records per page. Setting page_size to 10,000.')
+        _limit: int = min(page_size, 10000)
+
+        if id_range is None:
+            try:
+                _first: list[dict] = self._query(set_order_by(sql, 'Id ASC'), limit=1).get('queryResponse', [])
+                _last: list[dict] = self._query(set_order_by(sql, 'Id DESC'), limit=1).get('queryResponse', [])
+            except exceptions.BillingPlatform404Exception:
+                return  # No records to fetch
+
+            if not _first or not _last:
+                return
+
+            if get_id(_first[0]) is None or get_id(_last[0]) is None:
+                raise ValueError('Parallel page queries require the SQL query to select the Id column.')
+
+            id_range = (int(get_id(_first[0])), int(get_id(_last[0])))
+
+        _lower_id, _upper_id = id_range
+        _partitions: int = max(1, min(partitions, _upper_id - _lower_id + 1))
+        _width: int = -(-(_upper_id - _lower_id + 1) // _partitions)  # Ceiling division
+        _ranges: list[tuple[int, int]] = [
+            (_start, min(_start + _width - 1, _upper_id)) for _start in range(_lower_id, _upper_id + 1, _width)
+        ]
+        logging.debug('Parallel page query Id ranges: %s', _ranges)
+
+        _stop: threading.Event = threading.Event()
+        _queues: list[queue.Queue] = [queue.Queue(maxsize=max(prefetch, 1)) for _ in _ranges]
+
+        def _put(_queue: queue.Queue, _item: object) -> bool:
+            while not _stop.is_set():
+                try:
+                    _queue.put(_item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def _fetch_range(_range: tuple[int, int], _queue: queue.Queue) -> None:
+            try:
+                for _page in self._keyset_pages(sql, _range[0], _range[1], _limit):
+                    if not _put(_queue, _page):
+                        return  # The consumer stopped iterating
+                _put(_queue, _END_OF_PARTITION)
+            except Exception as e:
+                _put(_queue, e)
+
+        _executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=max(max_workers, 1))
+
+        try:
+            # Ranges are submitted in order, so the range being consumed has always been started by a worker.
+            for _range, _queue in zip(_ranges, _queues):
+                _executor.submit(_fetch_range, _range, _queue)
+
+            for _queue in _queues:
+                while True:
+                    _item: object = _queue.get()
+
+                    if _item is _END_OF_PARTITION:
+                        break
+                    if isinstance(_item, Exception):
+                        raise _item
+
+                    yield _item
+        finally:
+            _stop.set()
+            _executor.shutdown(wait=True, cancel_futures=True)
+
+
+    def process_pages(self,
+                      sql: str,
+                      transform: Callable[[list[dict]], object] | None = None,
+                      page_size: int = 1000,
+                      offset: int = 0,
+                      io_workers: int = 4,
+                      processes: int | None = None,
+                      ordered: bool = True,
+                      max_pending: int | None = None,
+                      executor: Executor | None = None,
+                      raise_errors: bool = True) -> Iterator[PageResult]:
+        """
+        Execute a paginated SQL query with I/O threads fetching the raw pages and a process pool decoding them and applying
+        a transform to their rows (as a generator). Use this when the work on each page, rather than the API, is the bottleneck.
+
+        :param sql: The SQL query to execute. It must not contain OFFSET, FETCH or LIMIT clauses.
+        :param transform: Optional function applied to the rows of each page in a worker process. It must be picklable (a module-level function).
+        :param page_size: The number of rows to request per page (default is 1000).
+        :param offset: The number of rows to skip before starting to return rows (default is 0).
+        :param io_workers: The number of pages fetched at the same time (default is 4).
+        :param processes: The number of worker processes (default is None, which uses the number of CPUs).
+        :param ordered: Whether to yield pages in offset order (default is True) or as they are decoded.
+        :param max_pending: The maximum number of pages fetched, decoded or waiting to be yielded at a time (default is twice io_workers plus the number of processes).
+        :param executor: Optional executor to decode pages with (ex. a ProcessPoolExecutor shared between calls). It is not shut down.
+        :param raise_errors: Whether to raise a failed page's PageError (default is True) or yield it as a PageResult.
+        :return: A generator that yields one PageResult (offset, result, rows) per page.
+        :raises ValueError: If the SQL query contains pagination clauses.
+        :raises PageError: If a page fails to fetch or decode, with the offset of the page.
+        """
+        return process_pages(self, sql, transform, page_size, offset, io_workers, processes, ordered, max_pending, executor, raise_errors)
+
+
     def retrieve_by_id(self, 
                        entity: str, 
-                       record_id: int) -> dict:
+                       record_id: int,
+                       record_type: type[Record] | Literal['auto'] | None = None) -> dict:
         """
         Retrieve an individual record from the BillingPlatform API.
         
         :param entity: The entity to retrieve records from.
         :param record_id: The 'Id' of the record to retrieve.
+        :param record_type: Optional slotted Record type to return the record as, or 'auto' to generate one from its fields (default is None, which returns a dict).
         :return: The retrieve response data.
         :raises Exception: If the retrieve request fails.
         """
         _retrieve_url: str = f'{self.rest_base_url}/{entity}/{record_id}'
-        logging.debug(f'Retrieve URL: {_retrieve_url}')
+        logging.debug('Retrieve URL: %s', _retrieve_url)
 
         try:
-            _retrieve_response: dict = self._response_handler(
-                self.session.get(_retrieve_url, **self.requests_parameters)
-            )
+            if self._coalescer is not None and entity.upper() != BULK_REQUEST_ENTITY:
+                _fetch: Callable[[], dict] = lambda: self._coalescer.retrieve(entity, record_id)
+            else:
+                _fetch: Callable[[], dict] = lambda: self._request('GET', _retrieve_url, entity)
+
+            _retrieve_response: dict = self._cached_request(f'retrieve:{entity.upper()}:{record_id}', {entity.upper()}, _fetch, entity)
+
+            if record_type is not None:
+                convert_response(_retrieve_response, record_type, entity)
 
             return _retrieve_response
         except requests.RequestException as e:
@@ -282,29 +1030,90 @@ class BillingPlatform:
 
     def retrieve_by_query(self, 
                           entity: str, 
-                          queryAnsiSql: str) -> dict:
+                          queryAnsiSql: str,
+                          record_type: type[Record] | Literal['auto'] | None = None) -> dict:
         """
         Retrieve whole records from the BillingPlatform API with a query.
         
         :param entity: The entity to retrieve records from.
         :param queryAnsiSql: Optional ANSI SQL query to filter records.
+        :param record_type: Optional slotted Record type to return records as, or 'auto' to generate one from their fields (default is None, which returns dicts).
         :return: The retrieve response data.
         :raises Exception: If the retrieve request fails.
         """
         _url_encoded_sql: str = quote(queryAnsiSql)
         _retrieve_url: str = f'{self.rest_base_url}/{entity}?queryAnsiSql={_url_encoded_sql}'
-        logging.debug(f'Retrieve URL: {_retrieve_url}')
+        logging.debug('Retrieve URL: %s', _retrieve_url)
 
         try:
-            _retrieve_response: dict = self._response_handler(
-                self.session.get(_retrieve_url, **self.requests_parameters)
-            )
+            _retrieve_response: dict = self._cached_request(f'retrieve:{entity.upper()}?{normalize(queryAnsiSql)}', 
+                                                            {entity.upper()} | referenced_tables(queryAnsiSql), 
+                                                            lambda: self._request('GET', _retrieve_url, entity),
+                                                            entity)
+
+            if record_type is not None:
+                convert_response(_retrieve_response, record_type, entity)
 
             return _retrieve_response
         except requests.RequestException as e:
             raise Exception(f'Failed to retrieve records: {e}')
 
 
+    def retrieve_by_ids(self,
+                        entity: str,
+                        ids: Iterable[int | str],
+                        max_url_length: int = DEFAULT_MAX_URL_LENGTH,
+                        max_workers: int = 4,
+                        record_type: type[Record] | Literal['auto'] | None = None) -> RetrieveResult:
+        """
+        Retrieve many records by 'Id', grouping the Ids into concurrent retrieve_by_query calls with 'Id IN (...)' filters.
+
+        :param entity: The entity to retrieve records from.
+        :param ids: The 'Id' values of the records to retrieve. Duplicates are retrieved once.
+        :param max_url_length: The maximum length of each request URL; Ids are grouped to stay under it (default is 4000).
+        :param max_workers: The maximum number of groups retrieved at the same time (default is 4).
+        :param record_type: Optional slotted Record type to return records as, or 'auto' to generate one from their fields (default is None, which returns dicts).
+        :return: A RetrieveResult with the records keyed by Id and the Ids that were not found.
+        :raises ValueError: If a single Id does not fit in a request URL.
+        :raises Exception: If a retrieve request fails.
+        """
+        _ids: dict[str, int | str] = {}
+
+        for _id in ids:
+            _ids.setdefault(str(_id).strip(), _id)
+
+        _base_length: int = len(f'{self.rest_base_url}/{entity}?queryAnsiSql={quote("Id IN ()")}')
+        _groups: list[list] = list(group_ids(_ids.values(), _base_length, max_url_length))
+        _result: RetrieveResult = RetrieveResult(requests=len(_groups))
+        logging.debug('Retrieving %s %s record(s) in %s request(s)', len(_ids), entity, len(_groups))
+
+        def _retrieve_group(_group: list) -> list[dict]:
+            try:
+                _response: dict = self.retrieve_by_query(entity, f'Id IN ({",".join(format_id(_id) for _id in _group)})', record_type)
+            except exceptions.BillingPlatform404Exception:
+                return []  # None of the Ids exist
+
+            _records: object = next(iter(_response.values()), [])
+
+            if isinstance(_records, dict):
+                return [_records] if _records else []
+
+            return _records or []
+
+        if _groups:
+            with ThreadPoolExecutor(max_workers=max(min(max_workers, len(_groups)), 1)) as _executor:
+                for _records in _executor.map(_retrieve_group, _groups):
+                    for _record in _records:
+                        _key: str = str(get_id(_record) or '').strip()
+
+                        if _key in _ids:
+                            _result.records[_ids[_key]] = _record
+
+        _result.missing = [_id for _id in _ids.values() if _id not in _result.records]
+
+        return _result
+
+
     # Post
     def create(self, 
                entity: str, 
@@ -318,7 +1127,7 @@ class BillingPlatform:
         :raises Exception: If the create request fails.
         """
         _create_url: str = f'{self.rest_base_url}/{entity}'
-        logging.debug(f'Create URL: {_create_url}')
+        logging.debug('Create URL: %s', _create_url)
 
         _data: dict = data.copy() 
 
@@ -327,16 +1136,16 @@ class BillingPlatform:
                 'brmObjects': data
             }
 
-        logging.debug(f'Create data payload: {_data}')
+        logging.debug('Create data payload: %s', _data)
 
         try:
-            _create_response: dict = self._response_handler(
-                self.session.post(_create_url, json=_data, **self.requests_parameters)
-            )
+            _create_response: dict = self._request('POST', _create_url, json=_data)
 
             return _create_response
         except requests.RequestException as e:
             raise Exception(f'Failed to create record: {e}')
+        finally:
+            self._invalidate(entity)
 
 
     # Put
@@ -352,7 +1161,7 @@ class BillingPlatform:
         :raises Exception: If the update request fails.
         """
         _update_url: str = f'{self.rest_base_url}/{entity}'
-        logging.debug(f'Update URL: {_update_url}')
+        logging.debug('Update URL: %s', _update_url)
 
         _data: dict = data.copy()
 
@@ -361,16 +1170,16 @@ class BillingPlatform:
                 'brmObjects': data
             }
 
-        logging.debug(f'Update data payload: {_data}')
+        logging.debug('Update data payload: %s', _data)
 
         try:
-            _update_response: requests.Response = self._response_handler(
-                self.session.put(_update_url, json=_data, **self.requests_parameters)
-            )
+            _update_response: requests.Response = self._request('PUT', _update_url, json=_data)
 
             return _update_response
         except requests.RequestException as e:
             raise Exception(f'Failed to update record: {e}')
+        finally:
+            self._invalidate(entity)
 
 
     # Patch
@@ -388,7 +1197,7 @@ class BillingPlatform:
         :raises Exception: If the upsert request fails.
         """
         _upsert_url: str = f'{self.rest_base_url}/{entity}'
-        logging.debug(f'Upsert URL: {_upsert_url}')
+        logging.debug('Upsert URL: %s', _upsert_url)
 
         _data: dict = data.copy()
 
@@ -400,16 +1209,16 @@ class BillingPlatform:
         else:
             _data['externalIDFieldName'] = externalIDFieldName
 
-        logging.debug(f'Upsert data payload: {_data}')
+        logging.debug('Upsert data payload: %s', _data)
 
         try:
-            _upsert_response: dict = self._response_handler(
-                self.session.patch(_upsert_url, json=_data, **self.requests_parameters)
-            )
+            _upsert_response: dict = self._request('PATCH', _upsert_url, json=_data)
 
             return _upsert_response
         except requests.RequestException as e:
             raise Exception(f'Failed to upsert record: {e}')
+        finally:
+            self._invalidate(entity)
 
 
     # Delete
@@ -427,7 +1236,7 @@ class BillingPlatform:
         :raises Exception: If the delete request fails.
         """
         _delete_url: str = f'{self.rest_base_url}/delete/{entity}'
-        logging.debug(f'Delete URL: {_delete_url}')
+        logging.debug('Delete URL: %s', _delete_url)
 
         _data: dict = data.copy()
         _EmptyRecycleBin: str = '0' if not EmptyRecycleBin else '1'
@@ -441,16 +1250,16 @@ class BillingPlatform:
             if 'EmptyRecycleBin' not in _data:
                 _data['EmptyRecycleBin'] = _EmptyRecycleBin
 
-        logging.debug(f'Delete data payload: {_data}')
+        logging.debug('Delete data payload: %s', _data)
 
         try:
-            _delete_response: dict = self._response_handler(
-                self.session.delete(_delete_url, json=_data, **self.requests_parameters)
-            )
+            _delete_response: dict = self._request('DELETE', _delete_url, json=_data)
 
             return _delete_response
         except requests.RequestException as e:
             raise Exception(f'Failed to delete records: {e}')
+        finally:
+            self._invalidate(entity)
 
 
     def undelete(self, 
@@ -465,7 +1274,7 @@ class BillingPlatform:
         :raises Exception: If the undelete request fails.
         """
         _undelete_url: str = f'{self.rest_base_url}/undelete/{entity}'
-        logging.debug(f'Undelete URL: {_undelete_url}')
+        logging.debug('Undelete URL: %s', _undelete_url)
 
         _data: dict = data.copy()
 
@@ -474,17 +1283,120 @@ class BillingPlatform:
                 'brmObjects': data
             }
 
-        logging.debug(f'Undelete data payload: {_data}')
+        logging.debug('Undelete data payload: %s', _data)
 
         try:
-            _undelete_response: dict = self._response_handler(
-                self.session.delete(_undelete_url, json=_data, **self.requests_parameters)
-            )
+            _undelete_response: dict = self._request('DELETE', _undelete_url, json=_data)
 
             return _undelete_response
         except requests.RequestException as e:
             raise Exception(f'Failed to undelete records: {e}')
-        
+        finally:
+            self._invalidate(entity)
+
+
+    def batch_write(self,
+                    method: Literal['create', 'update', 'upsert', 'delete', 'undelete'],
+                    entity: str,
+                    records: Iterable[dict],
+                    chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    max_in_flight: int = 4,
+                    **kwargs) -> BatchResult:
+        """
+        Write an arbitrarily large iterable of records by splitting it into chunks and sending the chunks concurrently.
+        Failed chunks and records that the API rejects are collected in the result instead of aborting the run.
+
+        :param method: The write method to use for each chunk ('create', 'update', 'upsert', 'delete' or 'undelete').
+        :param entity: The entity to write records for.
+        :param records: The records to write. The iterable is consumed lazily, one chunk at a time.
+        :param chunk_size: The maximum number of records sent in one request (default is 200).
+        :param max_in_flight: The maximum number of chunk requests running at the same time (default is 4).
+        :param kwargs: Additional keyword arguments passed to the write method (ex. externalIDFieldName for upsert or EmptyRecycleBin for delete).
+        :return: A BatchResult with one result per input record (in input order) and a list of errors.
+        :raises ValueError: If the method is not a supported write method.
+        """
+        if method not in ('create', 'update', 'upsert', 'delete', 'undelete'):
+            raise ValueError(f"Unsupported batch write method '{method}'.")
+
+        _write = getattr(self, method)
+        _result: BatchResult = BatchResult()
+        _in_flight: dict[Future, tuple[int, list[dict]]] = {}
+
+        def _collect(_future: Future) -> None:
+            _start, _chunk = _in_flight.pop(_future)
+
+            try:
+                _results: list[dict] = record_results(_future.result(), len(_chunk))
+            except Exception as e:
+                logging.warning('Batch %s of %s %s records starting at index %s failed: %s', method, len(_chunk), entity, _start, e)
+                _result.errors.extend(BatchError(_start + i, _record, str(e), e) for i, _record in enumerate(_chunk))
+                return
+
+            _result.results[_start:_start + len(_chunk)] = _results
+
+            for i, (_record, _record_result) in enumerate(zip(_chunk, _results)):
+                _message: str | None = record_error(_record_result)
+                if _message is not None:
+                    _result.errors.append(BatchError(_start + i, _record, _message))
+
+        with ThreadPoolExecutor(max_workers=max(max_in_flight, 1)) as _executor:
+            _start: int = 0
+
+            for _chunk in chunk_records(records, max(chunk_size, 1)):
+                # Wait for a free slot before reading the next chunk, so memory stays bounded by max_in_flight chunks
+                while len(_in_flight) >= max(max_in_flight, 1):
+                    _done, _ = wait(_in_flight, return_when=FIRST_COMPLETED)
+                    for _future in _done:
+                        _collect(_future)
+
+                _result.results.extend([None] * len(_chunk))
+                _in_flight[_executor.submit(_write, entity, _chunk, **kwargs)] = (_start, _chunk)
+                _result.chunks += 1
+                _start += len(_chunk)
+
+            for _future in list(_in_flight):
+                _future.exception()  # Wait for the remaining chunks
+                _collect(_future)
+
+        _result.errors.sort(key=lambda _error: _error.index)
+        logging.debug('Batch %s of %s %s records in %s chunks: %s failed.', method, len(_result.results), entity, _result.chunks, _result.failed)
+
+        return _result
+
+
+    def execute_many(self,
+                     operations: Iterable[Operation | tuple],
+                     max_workers: int | None = None,
+                     timeout: float | None = None,
+                     ordered: bool = True) -> Iterator[OperationResult]:
+        """
+        Dispatch a mix of reads and writes concurrently over this client's session and connection pool. The operations
+        start right away, and each one's result or error is captured in an OperationResult, so one failure does not abort the others.
+
+        :param operations: The operations, as Operation objects or tuples of a method name and its positional arguments (ex. ('retrieve_by_id', 'ACCOUNT', 10)).
+        :param max_workers: The maximum number of operations running at the same time (default is pool_maxsize).
+        :param timeout: Optional overall deadline in seconds. Operations still pending at the deadline are cancelled and reported with a TimeoutError.
+        :param ordered: Whether to yield results in input order (default is True) or as they complete.
+        :return: A generator that yields one OperationResult per operation. Closing it early cancels the operations that have not started.
+        :raises ValueError: If an operation is not a supported client method.
+        """
+        return execute_many(self, operations, max_workers, timeout, ordered)
+
+
+    def query_many(self,
+                   sqls: Iterable[str],
+                   max_workers: int | None = None,
+                   timeout: float | None = None) -> list[OperationResult]:
+        """
+        Execute independent SQL queries concurrently and gather their results.
+
+        :param sqls: The SQL queries to execute.
+        :param max_workers: The maximum number of queries running at the same time (default is pool_maxsize).
+        :param timeout: Optional overall deadline in seconds. Queries still pending at the deadline are reported with a TimeoutError.
+        :return: One OperationResult per query, in input order. Failed queries carry their exception instead of a result.
+        """
+        return list(execute_many(self, (Operation('query', (_sql,)) for _sql in sqls), max_workers, timeout))
+
 
     def bulk_query_request(self,
                            RequestName: str,
@@ -492,8 +1404,8 @@ class BillingPlatform:
                            RequestsPerBatch: int = 10000,
                            ResponseFormat: Literal['CSV', 'JSON'] = "JSON") -> dict:
         """
-        Make a bulk query request to the BillingPlatform API. The request will be processed asynchronously, and you can check the status 
-        of the request within the BillingPlatform UI.
+        Make a bulk query request to the BillingPlatform API. The request will be processed asynchronously. Use bulk_job() to follow 
+        the request and download its results.
 
         :param RequestName: Descriptive name of the new request.
         :param RequestBody: The request payload created using the BillingPlatform Query Language. The payload length cannot exceed 4000 characters.
@@ -503,7 +1415,7 @@ class BillingPlatform:
         :raises Exception: If the query request fails.
         """
         _bulk_query_url: str = f'{self.rest_base_url}/bulk_api_request'
-        logging.debug(f'Bulk query request URL: {_bulk_query_url}')
+        logging.debug('Bulk query request URL: %s', _bulk_query_url)
 
         _data: dict = {
             'brmObjects': {
@@ -515,12 +1427,10 @@ class BillingPlatform:
             }
         }
 
-        logging.debug(f'Bulk query request payload: {_data}')
+        logging.debug('Bulk query request payload: %s', _data)
 
         try:
-            _bulk_query_response: dict = self._response_handler(
-                self.session.post(_bulk_query_url, json=_data, **self.requests_parameters)
-            )
+            _bulk_query_response: dict = self._request('POST', _bulk_query_url, json=_data)
 
             return _bulk_query_response
         except requests.RequestException as e:
@@ -537,8 +1447,8 @@ class BillingPlatform:
                               CSVQualifier: str = '\"',
                               CSVEndLineFormat: Literal['CR', 'LF', 'CRLF'] = "CRLF") -> dict:
         """
-        Perform a bulk retrieve request to the BillingPlatform API. The request will be processed asynchronously, and you can check the status 
-        of the request within the BillingPlatform UI.
+        Perform a bulk retrieve request to the BillingPlatform API. The request will be processed asynchronously. Use bulk_job() to follow 
+        the request and download its results.
 
         :param RequestName: Descriptive name of the new request.
         :param RequestBody: The request payload created using a standard ANSI SQL query.
@@ -552,7 +1462,7 @@ class BillingPlatform:
         :raises Exception: If the retrieve request fails.
         """
         _bulk_query_url: str = f'{self.rest_base_url}/bulk_api_request'
-        logging.debug(f'Bulk retrieve request URL: {_bulk_query_url}')
+        logging.debug('Bulk retrieve request URL: %s', _bulk_query_url)
 
         _data: dict = {
             'brmObjects': {
@@ -569,13 +1479,96 @@ class BillingPlatform:
             }
         }
 
-        logging.debug(f'Bulk retrieve request payload: {_data}')
+        logging.debug('Bulk retrieve request payload: %s', _data)
 
         try:
-            _bulk_retrieve_response: dict = self._response_handler(
-                self.session.post(_bulk_query_url, json=_data, **self.requests_parameters)
-            )
+            _bulk_retrieve_response: dict = self._request('POST', _bulk_query_url, json=_data)
 
             return _bulk_retrieve_response
         except requests.RequestException as e:
             raise Exception(f'Failed to post bulk retrieve request: {e}')
+
+
+    def bulk_job(self,
+                 request: dict | str | int,
+                 ResponseFormat: Literal['CSV', 'JSON'] = 'JSON',
+                 CSVDelimiter: str = ',',
+                 CSVQualifier: str = '\"',
+                 CSVEndLineFormat: Literal['CR', 'LF', 'CRLF'] = 'CRLF') -> BulkJob:
+        """
+        Create a handle to follow a bulk request: poll its status, download its result batches and stream their rows.
+        The format and CSV settings must match the ones used when the request was submitted (bulk retrieve requests always produce CSV).
+
+        :param request: The response of bulk_query_request/bulk_retrieve_request, or the 'Id' of the bulk request.
+        :param ResponseFormat: The format of the result files ('CSV' or 'JSON', default is 'JSON').
+        :param CSVDelimiter: Delimiter of the CSV result files (default is ',').
+        :param CSVQualifier: Qualifier of the CSV result files (default is '\"').
+        :param CSVEndLineFormat: End line format of the CSV result files (default is 'CRLF').
+        :return: A BulkJob handle.
+        :raises ValueError: If the response does not contain the Id of the bulk request.
+        """
+        _request_id: str | int | None = request
+
+        if isinstance(request, dict):
+            _created: object = next(iter(request.values()), None)
+            _created = _created[0] if isinstance(_created, list) and _created else _created
+            _request_id = _created.get('Id') if isinstance(_created, dict) else None
+
+        if _request_id in (None, ''):
+            raise ValueError('Bulk request response did not contain the Id of the request.')
+
+        return BulkJob(self, _request_id, ResponseFormat, CSVDelimiter, CSVQualifier, CSVEndLineFormat)
+
+
+    def sync(self,
+             entity: str,
+             sink: Callable[[list], None],
+             store: StateStore | str,
+             columns: Iterable[str] | None = None,
+             watermark: str = 'Id',
+             where: str | None = None,
+             page_size: int = 1000,
+             partitions: int = 4,
+             max_workers: int = 4) -> SyncResult:
+        """
+        Incrementally sync an entity: emit the rows whose watermark column grew since the previous run to a sink, page by page,
+        and save the new high-water mark. A run that fails part way resumes after its last checkpointed page when run again.
+
+        :param entity: The entity to sync (ex. 'ACCOUNT').
+        :param sink: The function that receives each page of changed rows.
+        :param store: A StateStore, or the path of a JSON file to keep the sync state in.
+        :param columns: The columns to select (default is all columns). 'Id' is always selected.
+        :param watermark: The column whose growth marks a changed row (default is 'Id', for append-only entities).
+        :param where: Optional filter on the rows to sync (ex. "Status = 'ACTIVE'").
+        :param page_size: The number of rows per page (default is 1000).
+        :param partitions: The number of 'Id' ranges each delta is split into (default is 4).
+        :param max_workers: The maximum number of ranges fetched at the same time (default is 4).
+        :return: A SyncResult with the number of rows emitted and the new high-water mark.
+        :raises ValueError: If the saved state was built with a different watermark column.
+        :raises Exception: If a query request fails.
+        """
+        return IncrementalSync(self, store, page_size, partitions, max_workers).run(entity, sink, columns, watermark, where)
+
+
+    def mirror(self,
+               path: str = ':memory:',
+               entities: Iterable[str] = (),
+               max_age: float | None = 300.0,
+               auto_refresh: bool = False) -> Mirror:
+        """
+        Create a local SQLite mirror of entities. Its query() answers from the mirror when the SQL only reads mirrored entities
+        that are fresh enough, and from the API otherwise.
+
+        :param path: The path of the SQLite database file (default is ':memory:'). A file keeps the mirror between runs.
+        :param entities: Entities to add to the mirror and load right away (optional). More can be added with Mirror.add().
+        :param max_age: The maximum age, in seconds, of a mirrored entity for queries to read it (default is 300). None never expires.
+        :param auto_refresh: Whether queries refresh stale entities instead of falling back to the API (default is False).
+        :return: A Mirror.
+        :raises Exception: If loading an entity fails.
+        """
+        _mirror: Mirror = Mirror(self, path, max_age, auto_refresh)
+
+        for _entity in entities:
+            _mirror.add(_entity)
+
+        return _mirror
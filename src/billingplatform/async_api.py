@@ -0,0 +1,707 @@
+import asyncio
+import base64
+import logging
+import time
+
+from . import exceptions
+from .instrumentation import Instrumentation, RequestEvent
+from .models import Record, convert_response
+from .serialization import Serializer, get_id, get_serializer
+from .sql import has_pagination, keyset_page_sql, referenced_tables, use_keyset
+from typing import AsyncIterator, Literal
+from urllib.parse import quote # for URL encoding
+
+try:
+    import httpx
+except ImportError: # Optional dependency (pip install billingplatform[async])
+    httpx = None
+
+
+class AsyncBillingPlatform:
+    def __init__(self,
+                 base_url: str,
+                 username: str | None = None,
+                 password: str | None = None,
+                 client_id: str | None = None,
+                 client_secret: str | None = None,
+                 use_token: Literal['access_token', 'refresh_token'] = 'access_token',
+                 client_parameters: dict | None = None,
+                 auth_api_version: str = '1.0', # /auth endpoint version
+                 rest_api_version: str = '2.0', # /rest endpoint version
+                 max_connections: int = 100,
+                 max_keepalive_connections: int = 20,
+                 instrumentation: Instrumentation | None = None,
+                 serializer: Serializer | Literal['auto', 'orjson', 'msgspec', 'json'] = 'auto',
+                 refresh_margin: float = 60.0
+                ):
+        """
+        Initialize the asynchronous BillingPlatform API client. Authentication happens on first use
+        (or when entering the client as an async context manager), so constructing the client never blocks.
+
+        :param base_url: The base URL of the BillingPlatform API (ex. https://sandbox.billingplatform.com/myorg).
+        :param username: Username for authentication (optional if using OAuth).
+        :param password: Password for authentication (optional if using OAuth).
+        :param client_id: Client ID for OAuth authentication (optional if using username/password).
+        :param client_secret: Client secret for OAuth authentication (optional if using username/password).
+        :param use_token: Type of token to use for OAuth ('access_token' or 'refresh_token').
+        :param client_parameters: Additional parameters to pass to the underlying httpx.AsyncClient (optional, ex. timeout or verify).
+        :param auth_api_version: Version of the authentication API (default is '1.0').
+        :param rest_api_version: Version of the REST API (default is '2.0').
+        :param max_connections: Maximum number of concurrent connections in the connection pool (default is 100).
+        :param max_keepalive_connections: Maximum number of idle connections kept alive in the connection pool (default is 20).
+        :param instrumentation: Optional Instrumentation that receives request hooks and keeps per-endpoint latency histograms and counters.
+        :param serializer: The JSON backend for request and response bodies: a Serializer, or 'auto' to use orjson or msgspec when installed and the standard library otherwise (default is 'auto').
+        :param refresh_margin: The number of seconds before an OAuth token expires to refresh it on the next request (default is 60).
+        :raises ImportError: If the optional httpx dependency is not installed.
+        :raises ValueError: If neither username/password nor client_id/client_secret is provided.
+        """
+        if httpx is None:
+            raise ImportError("AsyncBillingPlatform requires the 'httpx' package. Install it with: pip install billingplatform[async]")
+
+        if not all([username, password]) and not all([client_id, client_secret, use_token]):
+            raise ValueError("Either username/password or client_id/client_secret must be provided.")
+
+        self.base_url: str = base_url.rstrip('/')
+        self.username: str | None = username
+        self.password: str | None = password
+        self.client_id: str | None = client_id
+        self.client_secret: str | None = client_secret
+        self.use_token: str | None = use_token
+        self.token: str | None = None
+        self.client_parameters: dict = client_parameters or {}
+        self.auth_api_version: str = auth_api_version
+        self.rest_api_version: str = rest_api_version
+        self.instrumentation: Instrumentation | None = instrumentation
+        self.serializer: Serializer = get_serializer(serializer) if isinstance(serializer, str) else serializer
+        self.client: httpx.AsyncClient = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections),
+            **self.client_parameters
+        )
+
+        # Construct base URLs
+        self.auth_base_url: str = f'{self.base_url}/auth/{self.auth_api_version}'
+        self.rest_base_url: str = f'{self.base_url}/rest/{self.rest_api_version}'
+
+        self._authenticated: bool = False
+        self._auth_lock: asyncio.Lock = asyncio.Lock()
+        self._auth_generation: int = 0 # Incremented by each login, so concurrent requests that saw a 401 share one re-login
+        self._refresh_at: float | None = None
+        self.refresh_margin: float = refresh_margin
+
+
+    async def __aenter__(self) -> 'AsyncBillingPlatform':
+        await self._authenticate()
+        return self
+
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.logout()
+
+
+    def _response_handler(self, response: 'httpx.Response', entity: str | None = None) -> dict:
+        """
+        Handle the response from the BillingPlatform API.
+
+        :param response: The response object returned from the request.
+        :param entity: The entity the response was read from, for decoding its records into a typed record (optional).
+        :return: The response data as a dictionary.
+        :raises BillingPlatformException: If the response status code is not 200.
+        """
+        if response.status_code == 200:
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                logging.debug('Success Response: %s', response.text)
+            return self.serializer.loads_response(response.content, entity)
+        elif response.status_code == 400:
+            raise exceptions.BillingPlatform400Exception(response)
+        elif response.status_code == 401:
+            raise exceptions.BillingPlatform401Exception(response)
+        elif response.status_code == 404:
+            raise exceptions.BillingPlatform404Exception(response)
+        elif response.status_code == 429:
+            raise exceptions.BillingPlatform429Exception(response)
+        elif response.status_code == 500:
+            raise exceptions.BillingPlatform500Exception(response)
+        else:
+            raise exceptions.BillingPlatformException(response)
+
+
+    async def _authenticate(self, stale_generation: int | None = None) -> int:
+        """
+        Authenticate with the BillingPlatform API once, and again when the credential is due for a refresh or was rejected.
+        Concurrent callers wait on the same login.
+
+        :param stale_generation: The generation of a credential that was rejected with a 401 (optional).
+        :return: The generation of the current credential.
+        """
+        _due: bool = self._refresh_at is not None and time.monotonic() >= self._refresh_at
+
+        if self._authenticated and stale_generation is None and not _due:
+            return self._auth_generation
+
+        _generation: int = self._auth_generation if stale_generation is None else stale_generation
+
+        async with self._auth_lock:
+            if self._authenticated and self._auth_generation != _generation:
+                return self._auth_generation # Another task already logged in again
+
+            if all([self.username, self.password]):
+                _lifetime: float | None = await self._login()
+            else:
+                _lifetime = await self._oauth_login()
+
+            # Short-lived tokens are refreshed half way through their lifetime rather than on every request
+            self._refresh_at = time.monotonic() + max(_lifetime - self.refresh_margin, _lifetime / 2) if _lifetime else None
+            self._auth_generation += 1
+            self._authenticated = True
+
+            return self._auth_generation
+
+
+    async def _login(self) -> float | None:
+        """
+        Authenticate with the BillingPlatform API using username and password. If successful, updates the client headers with the session ID.
+
+        :return: None, since the login response does not report the lifetime of the session.
+        :raises Exception: If the login response does not contain a session ID.
+        """
+        _login_url: str = f'{self.rest_base_url}/login'
+        logging.debug('Login URL: %s', _login_url)
+
+        _login_payload: dict = {
+            'username': self.username,
+            'password': self.password,
+        }
+
+        try:
+            _login_response: dict = self._response_handler(
+                await self.client.post(_login_url, json=_login_payload)
+            )
+
+            # Retrieve 'loginResponse' data
+            _login_response_data: list[dict] = _login_response.get('loginResponse')
+
+            # Update client headers with session ID
+            _session_id: str = _login_response_data[0].get('SessionID')
+
+            if _session_id:
+                self.client.headers.update({'sessionid': _session_id})
+            else:
+                raise Exception('Login response did not contain a session ID.')
+
+            return None
+        except httpx.HTTPError as e:
+            raise Exception(f'Failed to login: {e}')
+
+
+    async def _oauth_login(self) -> float | None:
+        """
+        Authenticate with the BillingPlatform API using OAuth. If successful, updates the client headers with the authorization token.
+
+        :return: The lifetime of the token in seconds ('expires_in'), or None if the response does not report it.
+        :raises Exception: If the OAuth response does not contain the expected token or the authentication request fails.
+        """
+        _authenticate_url: str = f'{self.auth_base_url}/authenticate?grant_type=client_credentials'
+        logging.debug('Authenticate URL: %s', _authenticate_url)
+
+        # Encode client credentials into base64
+        _base64_credentials: str = base64.b64encode(f'{self.client_id}:{self.client_secret}'.encode('utf-8')).decode('utf-8')
+
+        try:
+            _oauth_response: dict = self._response_handler(
+                await self.client.post(_authenticate_url, headers={'Authorization': f'Basic {_base64_credentials}'})
+            )
+
+            # Update client headers with the token
+            if self.use_token in _oauth_response:
+                self.token = _oauth_response[self.use_token]
+                self.client.headers.update({'Authorization': f'Bearer {self.token}'})
+
+                _expires_in: object = _oauth_response.get('expires_in')
+                return float(_expires_in) if _expires_in else None
+            else:
+                raise Exception(f'OAuth response did not contain {self.use_token}. Ensure BillingPlatform is configured correctly to accept OAuth.')
+        except httpx.HTTPError as e:
+            raise Exception(f'Failed to authenticate with OAuth: {e}')
+
+
+    async def _request(self, method: str, url: str, entity: str | None = None, **kwargs) -> dict:
+        """
+        Send an authenticated request to the BillingPlatform API and handle the response.
+
+        :param method: The HTTP method of the request.
+        :param url: The URL of the request.
+        :param entity: The entity the response is read from, for decoding its records into a typed record (optional).
+        :param kwargs: Additional keyword arguments passed to httpx.AsyncClient.request (ex. json).
+        :return: The response data as a dictionary.
+        :raises BillingPlatformException: If the response status code is not 200.
+        """
+        _generation: int = await self._authenticate()
+
+        if 'json' in kwargs:
+            # Encode JSON bodies with the client serializer rather than httpx's standard library path
+            kwargs['content'] = self.serializer.dumps(kwargs.pop('json'))
+            kwargs['headers'] = {'Content-Type': 'application/json', **(kwargs.get('headers') or {})}
+
+        _response: httpx.Response = await self._send(method, url, **kwargs)
+
+        if _response.status_code == 401:
+            # The credential expired or was revoked: log in again (once for all tasks that saw it) and resend once
+            logging.warning('%s request returned 401. Re-authenticating and retrying once.', method)
+            await self._authenticate(_generation)
+            _response = await self._send(method, url, **kwargs)
+
+        return self._response_handler(_response, entity)
+
+
+    async def _send(self, method: str, url: str, **kwargs) -> 'httpx.Response':
+        """
+        Send a request with the client, reporting it to the client instrumentation, if any.
+
+        :param method: The HTTP method of the request.
+        :param url: The URL of the request.
+        :param kwargs: Additional keyword arguments passed to httpx.AsyncClient.request (ex. content).
+        :return: The response object.
+        """
+        if self.instrumentation is None:
+            return await self.client.request(method, url, **kwargs)
+
+        _event: RequestEvent = self.instrumentation.start(method, url)
+
+        try:
+            _response: httpx.Response = await self.client.request(method, url, **kwargs)
+        except Exception as e:
+            _event.error = str(e)
+            self.instrumentation.finish(_event)
+            raise
+
+        _event.status_code = _response.status_code
+        _event.bytes_sent = len(_response.request.content)
+        _event.bytes_received = _response.num_bytes_downloaded
+        self.instrumentation.finish(_event)
+
+        return _response
+
+
+    async def logout(self) -> None:
+        """
+        Log out of the BillingPlatform session and close the connection pool.
+
+        :return: None
+        :raises Exception: If the logout request fails.
+        """
+        try:
+            if self.client.headers.get('sessionid', False):
+                _logout_url: str = f'{self.rest_base_url}/logout'
+                logging.debug('Logout URL: %s', _logout_url)
+
+                self._response_handler(
+                    await self.client.post(_logout_url)
+                )
+            else:
+                logging.warning('No session ID found. Skipping logout.')
+
+            self._authenticated = False
+            await self.client.aclose()
+        except httpx.HTTPError as e:
+            raise Exception(f"Failed to logout: {e}")
+
+
+    async def query(self,
+                    sql: str,
+                    offset: int = 0,
+                    limit: int = 0,
+                    record_type: type[Record] | Literal['auto'] | None = None) -> dict:
+        """
+        Execute a SQL query against the BillingPlatform API.
+
+        :param sql: The SQL query to execute. It should be a valid SQL statement that the BillingPlatform API can process.
+        :param offset: The number of rows to skip before starting to return rows (default is 0).
+        :param limit: The maximum number of rows to return (default is 0, which means no limit).
+        :param record_type: Optional slotted Record type to return rows as (see billingplatform.models), or 'auto' to generate one from the selected columns (default is None, which returns dicts).
+        :return: The query response data.
+        :raises Exception: If the query request fails.
+        """
+        # Encode the SQL query for URL
+        _url_encoded_sql: str = ''
+
+        if has_pagination(sql):
+            _url_encoded_sql = quote(sql)
+        else:
+            if offset:
+                sql = f'{sql} OFFSET {offset} ROWS'
+
+            if limit:
+                sql = f'{sql} FETCH NEXT {limit} ROWS ONLY'
+
+            _url_encoded_sql = quote(sql)
+
+        _query_url: str = f'{self.rest_base_url}/query?sql={_url_encoded_sql}'
+        logging.debug('Query URL: %s', _query_url)
+        _tables: set[str] = referenced_tables(sql)
+        _entity: str | None = next(iter(_tables)) if len(_tables) == 1 else None
+
+        try:
+            _query_response: dict = await self._request('GET', _query_url, _entity)
+
+            if record_type is not None:
+                convert_response(_query_response, record_type, _entity)
+
+            return _query_response
+        except httpx.HTTPError as e:
+            raise Exception(f'Failed to execute query: {e}')
+
+
+    async def page_query(self,
+                         sql: str,
+                         page_size: int = 1000,
+                         offset: int = 0,
+                         record_type: type[Record] | Literal['auto'] | None = None,
+                         keyset: bool | Literal['auto'] = 'auto') -> AsyncIterator[dict]:
+        """
+        Execute a paginated SQL query against the BillingPlatform API (as an async generator).
+        Yields each page of results as a dict. Queries that allow it are paged with 'Id > <last Id>' predicates ordered
+        by Id rather than with OFFSET, so every page costs the same regardless of depth.
+
+        :param sql: The SQL query to execute. It should be a valid SQL statement that the BillingPlatform API can process.
+        :param page_size: The number of rows to return per page (default is 1000).
+        :param offset: The number of rows to skip before starting to return rows (default is 0).
+        :param record_type: Optional slotted Record type to return rows as, or 'auto' to generate one from the selected columns (default is None, which returns dicts).
+        :param keyset: Whether to page with keyset predicates: 'auto' when the query allows it, True to require it, or False to always page with OFFSET (default is 'auto').
+        :return: An async generator that yields query response data for each page.
+        :raises ValueError: If keyset is True and the query cannot be paged with keyset predicates.
+        :raises Exception: If the query request fails.
+        """
+        _offset: int = offset
+
+        if page_size > 10000:
+            logging.warning('BillingPlatform API has a limit of 10,000 records per page. Setting page_size to 10,000.')
+        _limit: int = min(page_size, 10000)
+
+        _keyset: bool = use_keyset(sql, keyset)
+        _last_id: int | None = None
+
+        while True:
+            if not _keyset:
+                _page_sql, _page_offset = sql, _offset
+            else:
+                _page_sql, _page_offset = keyset_page_sql(sql, _last_id), _offset if _last_id is None else 0
+
+            try:
+                _query_response: dict = await self.query(_page_sql, offset=_page_offset, limit=_limit, record_type=record_type)
+            except exceptions.BillingPlatform404Exception:
+                break  # No more records to fetch
+
+            yield _query_response
+            _offset += _limit
+
+            if _keyset:
+                _rows: list = _query_response.get('queryResponse', [])
+
+                if len(_rows) < _limit:
+                    break  # A short page is the last page
+
+                if get_id(_rows[-1]) is None:
+                    raise ValueError('Keyset pagination requires the SQL query to select the Id column.')
+
+                _last_id = int(get_id(_rows[-1]))
+
+
+    async def retrieve_by_id(self,
+                             entity: str,
+                             record_id: int,
+                             record_type: type[Record] | Literal['auto'] | None = None) -> dict:
+        """
+        Retrieve an individual record from the BillingPlatform API.
+
+        :param entity: The entity to retrieve records from.
+        :param record_id: The 'Id' of the record to retrieve.
+        :param record_type: Optional slotted Record type to return the record as, or 'auto' to generate one from its fields (default is None, which returns a dict).
+        :return: The retrieve response data.
+        :raises Exception: If the retrieve request fails.
+        """
+        _retrieve_url: str = f'{self.rest_base_url}/{entity}/{record_id}'
+        logging.debug('Retrieve URL: %s', _retrieve_url)
+
+        try:
+            _retrieve_response: dict = await self._request('GET', _retrieve_url, entity)
+
+            if record_type is not None:
+                convert_response(_retrieve_response, record_type, entity)
+
+            return _retrieve_response
+        except httpx.HTTPError as e:
+            raise Exception(f'Failed to retrieve records: {e}')
+
+
+    async def retrieve_by_query(self,
+                                entity: str,
+                                queryAnsiSql: str,
+                                record_type: type[Record] | Literal['auto'] | None = None) -> dict:
+        """
+        Retrieve whole records from the BillingPlatform API with a query.
+
+        :param entity: The entity to retrieve records from.
+        :param queryAnsiSql: Optional ANSI SQL query to filter records.
+        :param record_type: Optional slotted Record type to return records as, or 'auto' to generate one from their fields (default is None, which returns dicts).
+        :return: The retrieve response data.
+        :raises Exception: If the retrieve request fails.
+        """
+        _url_encoded_sql: str = quote(queryAnsiSql)
+        _retrieve_url: str = f'{self.rest_base_url}/{entity}?queryAnsiSql={_url_encoded_sql}'
+        logging.debug('Retrieve URL: %s', _retrieve_url)
+
+        try:
+            _retrieve_response: dict = await self._request('GET', _retrieve_url, entity)
+
+            if record_type is not None:
+                convert_response(_retrieve_response, record_type, entity)
+
+            return _retrieve_response
+        except httpx.HTTPError as e:
+            raise Exception(f'Failed to retrieve records: {e}')
+
+
+    # Post
+    async def create(self,
+                     entity: str,
+                     data: list[dict] | dict) -> dict:
+        """
+        Create records in BillingPlatform. Please review the BillingPlatform API documentation for limits on the number of records that can be created in a single request.
+
+        :param entity: The entity to create a record for.
+        :param data: The data to create the record with.
+        :return: The create response data. This will contain the ID of the newly created record(s).
+        :raises Exception: If the create request fails.
+        """
+        _create_url: str = f'{self.rest_base_url}/{entity}'
+        logging.debug('Create URL: %s', _create_url)
+
+        _data: dict = data.copy()
+
+        if not isinstance(_data, dict) or 'brmObjects' not in _data:
+            _data = {
+                'brmObjects': data
+            }
+
+        logging.debug('Create data payload: %s', _data)
+
+        try:
+            return await self._request('POST', _create_url, json=_data)
+        except httpx.HTTPError as e:
+            raise Exception(f'Failed to create record: {e}')
+
+
+    # Put
+    async def update(self,
+                     entity: str,
+                     data: list[dict] | dict) -> dict:
+        """
+        Update records in BillingPlatform.
+
+        :param entity: The entity to update records for.
+        :param data: The data to update the records with.
+        :return: The update response data. This will contain the ID of the updated record(s) or error messages upon failure.
+        :raises Exception: If the update request fails.
+        """
+        _update_url: str = f'{self.rest_base_url}/{entity}'
+        logging.debug('Update URL: %s', _update_url)
+
+        _data: dict = data.copy()
+
+        if not isinstance(_data, dict) or 'brmObjects' not in _data:
+            _data = {
+                'brmObjects': data
+            }
+
+        logging.debug('Update data payload: %s', _data)
+
+        try:
+            return await self._request('PUT', _update_url, json=_data)
+        except httpx.HTTPError as e:
+            raise Exception(f'Failed to update record: {e}')
+
+
+    # Patch
+    async def upsert(self,
+                     entity: str,
+                     data: list[dict] | dict,
+                     externalIDFieldName: str) -> dict:
+        """
+        Upsert records in BillingPlatform. If the record exists, it will be updated; if not, it will be created.
+
+        :param entity: The entity to upsert records for.
+        :param data: The data to upsert the records with.
+        :param externalIDFieldName: The name of the external ID field to use for upsert.
+        :return: The upsert response data.
+        :raises Exception: If the upsert request fails.
+        """
+        _upsert_url: str = f'{self.rest_base_url}/{entity}'
+        logging.debug('Upsert URL: %s', _upsert_url)
+
+        _data: dict = data.copy()
+
+        if not isinstance(_data, dict) or 'brmObjects' not in _data:
+            _data = {
+                'brmObjects': data,
+                'externalIDFieldName': externalIDFieldName
+            }
+        else:
+            _data['externalIDFieldName'] = externalIDFieldName
+
+        logging.debug('Upsert data payload: %s', _data)
+
+        try:
+            return await self._request('PATCH', _upsert_url, json=_data)
+        except httpx.HTTPError as e:
+            raise Exception(f'Failed to upsert record: {e}')
+
+
+    # Delete
+    async def delete(self,
+                     entity: str,
+                     data: list[dict] | dict,
+                     EmptyRecycleBin: bool = False) -> dict:
+        """
+        Delete records from BillingPlatform.
+
+        :param entity: The entity to delete a record from.
+        :param data: The data to delete the record with. This should only contain the IDs of the records to be deleted.
+        :param EmptyRecycleBin: Whether to permanently delete the record (default is False).
+        :return: The delete response data.
+        :raises Exception: If the delete request fails.
+        """
+        _delete_url: str = f'{self.rest_base_url}/delete/{entity}'
+        logging.debug('Delete URL: %s', _delete_url)
+
+        _data: dict = data.copy()
+        _EmptyRecycleBin: str = '0' if not EmptyRecycleBin else '1'
+
+        if not isinstance(_data, dict) or 'brmObjects' not in _data:
+            _data = {
+                'brmObjects': data,
+                'EmptyRecycleBin': _EmptyRecycleBin
+            }
+        else:
+            if 'EmptyRecycleBin' not in _data:
+                _data['EmptyRecycleBin'] = _EmptyRecycleBin
+
+        logging.debug('Delete data payload: %s', _data)
+
+        try:
+            return await self._request('DELETE', _delete_url, json=_data)
+        except httpx.HTTPError as e:
+            raise Exception(f'Failed to delete records: {e}')
+
+
+    async def undelete(self,
+                       entity: str,
+                       data: list[dict] | dict) -> dict:
+        """
+        Undelete records from the recycle bin in BillingPlatform.
+
+        :param entity: The entity to undelete records for.
+        :param data: The data to undelete the records with. This should only contain the IDs of the records to be undeleted.
+        :return: The undelete response data.
+        :raises Exception: If the undelete request fails.
+        """
+        _undelete_url: str = f'{self.rest_base_url}/undelete/{entity}'
+        logging.debug('Undelete URL: %s', _undelete_url)
+
+        _data: dict = data.copy()
+
+        if not isinstance(_data, dict) or 'brmObjects' not in _data:
+            _data = {
+                'brmObjects': data
+            }
+
+        logging.debug('Undelete data payload: %s', _data)
+
+        try:
+            return await self._request('DELETE', _undelete_url, json=_data)
+        except httpx.HTTPError as e:
+            raise Exception(f'Failed to undelete records: {e}')
+
+
+    async def bulk_query_request(self,
+                                 RequestName: str,
+                                 RequestBody: str,
+                                 RequestsPerBatch: int = 10000,
+                                 ResponseFormat: Literal['CSV', 'JSON'] = "JSON") -> dict:
+        """
+        Make a bulk query request to the BillingPlatform API. The request will be processed asynchronously by BillingPlatform.
+
+        :param RequestName: Descriptive name of the new request.
+        :param RequestBody: The request payload created using the BillingPlatform Query Language. The payload length cannot exceed 4000 characters.
+        :param RequestsPerBatch: Number of records returned in one batch (default is 10000).
+        :param ResponseFormat: The format of the response (default is 'JSON').
+        :return: A response containing the ID of the request being processed.
+        :raises Exception: If the query request fails.
+        """
+        _bulk_query_url: str = f'{self.rest_base_url}/bulk_api_request'
+        logging.debug('Bulk query request URL: %s', _bulk_query_url)
+
+        _data: dict = {
+            'brmObjects': {
+                'RequestName': RequestName,
+                'RequestBody': RequestBody,
+                'RequestsPerBatch': RequestsPerBatch,
+                'ResponseFormat': ResponseFormat,
+                'RequestMethod': 'QUERY'  # Default to QUERY method
+            }
+        }
+
+        logging.debug('Bulk query request payload: %s', _data)
+
+        try:
+            return await self._request('POST', _bulk_query_url, json=_data)
+        except httpx.HTTPError as e:
+            raise Exception(f'Failed to post bulk query request: {e}')
+
+
+    async def bulk_retrieve_request(self,
+                                    RequestName: str,
+                                    RequestBody: str,
+                                    RetrieveEntityName: str,
+                                    Columns: list[str] | None = None,
+                                    RequestsPerBatch: int = 10000,
+                                    CSVDelimiter: str = ',',
+                                    CSVQualifier: str = '\"',
+                                    CSVEndLineFormat: Literal['CR', 'LF', 'CRLF'] = "CRLF") -> dict:
+        """
+        Perform a bulk retrieve request to the BillingPlatform API. The request will be processed asynchronously by BillingPlatform.
+
+        :param RequestName: Descriptive name of the new request.
+        :param RequestBody: The request payload created using a standard ANSI SQL query.
+        :param RetrieveEntityName: The name of the entity to retrieve records from.
+        :param Columns: Optional list of columns to retrieve. If None, all columns are retrieved.
+        :param RequestsPerBatch: Number of records returned in one batch (default is 10000).
+        :param CSVDelimiter: Delimiter for CSV format (default is ',').
+        :param CSVQualifier: Qualifier for CSV format (default is '\"').
+        :param CSVEndLineFormat: End line format for CSV (default is 'CRLF').
+        :return: A response containing the ID of the request being processed.
+        :raises Exception: If the retrieve request fails.
+        """
+        _bulk_query_url: str = f'{self.rest_base_url}/bulk_api_request'
+        logging.debug('Bulk retrieve request URL: %s', _bulk_query_url)
+
+        _data: dict = {
+            'brmObjects': {
+                'RequestName': RequestName,
+                'RequestBody': RequestBody,
+                'RequestsPerBatch': RequestsPerBatch,
+                'RetrieveEntityName': RetrieveEntityName,
+                'Columns': Columns if Columns is not None else [],
+                'CSVDelimiter': CSVDelimiter,
+                'CSVQualifier': CSVQualifier,
+                'CSVEndLineFormat': CSVEndLineFormat,
+                'RequestMethod': 'RETRIEVE',  # Default to RETRIEVE method
+                'ResponseFormat': 'CSV'  # Default response format
+            }
+        }
+
+        logging.debug('Bulk retrieve request payload: %s', _data)
+
+        try:
+            return await self._request('POST', _bulk_query_url, json=_data)
+        except httpx.HTTPError as e:
+            raise Exception(f'Failed to post bulk retrieve request: {e}')
@@ -0,0 +1,224 @@
+import logging
+import threading
+import time
+
+from dataclasses import dataclass
+from typing import Callable
+
+
+class AuthManager:
+    """
+    Keeps the client's credentials (a session ID or an OAuth token) valid.
+
+    Each login is numbered with a generation. A request records the generation it was sent with, so when several
+    threads see the same credential expire, only the first one logs in again; the others wait for that login and
+    reuse it. When the lifetime of a credential is known, it is refreshed in the background before it expires, so
+    requests do not stall on the login.
+    """
+    def __init__(self,
+                 login: Callable[[], float | None],
+                 refresh_margin: float = 60.0,
+                 session_lifetime: float | None = None,
+                 background: bool = True):
+        """
+        :param login: The function that logs in, updates the session headers and returns the lifetime of the new credential in seconds (or None if unknown).
+        :param refresh_margin: The number of seconds before expiry to refresh the credential at (default is 60).
+        :param session_lifetime: The lifetime in seconds to assume when the login does not return one (default is None, which only re-authenticates after a 401).
+        :param background: Whether to refresh the credential on a background timer before it expires (default is True).
+        """
+        self.login: Callable[[], float | None] = login
+        self.refresh_margin: float = refresh_margin
+        self.session_lifetime: float | None = session_lifetime
+        self.background: bool = background
+        self.generation: int = 0
+        self.expires_at: float | None = None # time.monotonic() deadline of the current credential
+        self.refresh_at: float | None = None
+        self.logins: int = 0
+        self._lock: threading.Lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+        self._closed: bool = False
+
+    def _authenticate(self) -> None:
+        """
+        Log in and schedule the next refresh. Must be called with the lock held.
+        """
+        _lifetime: float | None = self.login()
+        self.logins += 1
+        self._adopt(_lifetime)
+
+    def _adopt(self, lifetime: float | None) -> None:
+        """
+        Record a new credential and schedule its refresh. Must be called with the lock held.
+        """
+        _lifetime: float | None = lifetime if lifetime else self.session_lifetime
+        _now: float = time.monotonic()
+
+        self.generation += 1
+        self.expires_at = _now + _lifetime if _lifetime else None
+        # Short-lived credentials are refreshed half way through their lifetime rather than on every request
+        self.refresh_at = _now + max(_lifetime - self.refresh_margin, _lifetime / 2) if _lifetime else None
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if self.background and self.refresh_at is not None and not self._closed:
+            self._timer = threading.Timer(self.refresh_at - _now, self._background_refresh, (self.generation,))
+            self._timer.daemon = True
+            self._timer.start()
+
+        logging.debug('Authenticated (generation %s), credential lifetime %s seconds', self.generation, _lifetime)
+
+    def _background_refresh(self, generation: int) -> None:
+        try:
+            self.refresh(generation)
+        except Exception as e:
+            # Requests will re-authenticate when they see the credential expire
+            logging.warning('Background credential refresh failed: %s', e)
+
+    def authenticate(self) -> int:
+        """
+        Log in, replacing the current credential.
+
+        :return: The generation of the new credential.
+        """
+        with self._lock:
+            self._authenticate()
+            return self.generation
+
+    def adopt(self, lifetime: float | None = None) -> int:
+        """
+        Use a credential obtained without logging in (ex. a session ID passed to the client), replacing the current one.
+
+        :param lifetime: The remaining lifetime of the credential in seconds (default is None, which assumes the session_lifetime).
+        :return: The generation of the adopted credential.
+        """
+        with self._lock:
+            self._adopt(lifetime)
+            return self.generation
+
+    def refresh(self, generation: int) -> int:
+        """
+        Log in again, unless another thread already replaced the credential of the given generation.
+        Threads that call this at the same time wait for a single login.
+
+        :param generation: The generation of the credential that expired or was rejected.
+        :return: The generation of the current credential.
+        """
+        with self._lock:
+            if generation == self.generation and not self._closed:
+                self._authenticate()
+
+            return self.generation
+
+    def ensure_fresh(self) -> int:
+        """
+        Log in if there is no credential yet (lazy authentication), or refresh the credential if it is due for a refresh
+        that the background timer has not made yet.
+
+        :return: The generation of the credential to send the request with.
+        """
+        _generation: int = self.generation
+
+        if _generation == 0 or (self.refresh_at is not None and time.monotonic() >= self.refresh_at):
+            return self.refresh(_generation)
+
+        return _generation
+
+    def close(self) -> None:
+        """
+        Stop refreshing the credential (ex. at logout).
+
+        :return: None
+        """
+        with self._lock:
+            self._closed = True
+
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+
+@dataclass
+class Credential:
+    """A session ID or token header, with the time.monotonic() deadline it expires at (None if unknown)."""
+    headers: dict[str, str]
+    expires_at: float | None = None
+
+    @property
+    def lifetime(self) -> float | None:
+        """The remaining lifetime of the credential in seconds, or None if unknown."""
+        return None if self.expires_at is None else self.expires_at - time.monotonic()
+
+
+class CredentialCache:
+    """
+    A process-local store of credentials, keyed by tenant and login. Clients that share a cache reuse each other's
+    session IDs and tokens instead of logging in, so a warm start (ex. a reused serverless worker) makes no login call.
+    Credentials are kept in memory only and are never written to disk.
+    """
+    def __init__(self):
+        self._credentials: dict[tuple, Credential] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def get(self, key: tuple, margin: float = 0.0) -> Credential | None:
+        """
+        Get a cached credential.
+
+        :param key: The cache key of the login.
+        :param margin: The number of seconds the credential must still be valid for (default is 0).
+        :return: The credential, or None if there is none or it expires within the margin.
+        """
+        with self._lock:
+            _credential: Credential | None = self._credentials.get(key)
+
+            if _credential is not None and _credential.lifetime is not None and _credential.lifetime <= margin:
+                del self._credentials[key]
+                return None
+
+            return _credential
+
+    def put(self, key: tuple, headers: dict[str, str], lifetime: float | None = None) -> None:
+        """
+        Cache a credential.
+
+        :param key: The cache key of the login.
+        :param headers: The session headers that carry the credential (ex. {'sessionid': ...}).
+        :param lifetime: The lifetime of the credential in seconds (default is None, which keeps it until it is rejected or discarded).
+        :return: None
+        """
+        with self._lock:
+            self._credentials[key] = Credential(dict(headers), time.monotonic() + lifetime if lifetime else None)
+
+    def discard(self, key: tuple, headers: dict[str, str] | None = None) -> bool:
+        """
+        Remove a cached credential (ex. at logout).
+
+        :param key: The cache key of the login.
+        :param headers: Only remove the credential if it carries these headers (default is None, which always removes it).
+        :return: Whether a credential was removed.
+        """
+        with self._lock:
+            _credential: Credential | None = self._credentials.get(key)
+
+            if _credential is not None and (headers is None or _credential.headers == headers):
+                del self._credentials[key]
+                return True
+
+            return False
+
+    def clear(self) -> None:
+        """
+        Remove every cached credential.
+
+        :return: None
+        """
+        with self._lock:
+            self._credentials.clear()
+
+    def __len__(self) -> int:
+        return len(self._credentials)
+
+
+# Shared by the clients created with credential_cache=True
+default_credential_cache: CredentialCache = CredentialCache()
@@ -0,0 +1,85 @@
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Iterable, Iterator
+
+
+# Conservative default for the number of records sent in one write request.
+# Please review the BillingPlatform API documentation for the limits of your environment.
+DEFAULT_CHUNK_SIZE: int = 200
+
+
+@dataclass
+class BatchError:
+    """A record (or chunk of records) that failed during a batch write."""
+    index: int # Position of the record in the input
+    record: dict
+    message: str
+    exception: Exception | None = None
+
+
+@dataclass
+class BatchResult:
+    """Merged outcome of a batch write. `results` holds one entry per input record, in input order."""
+    results: list[dict | None] = field(default_factory=list)
+    errors: list[BatchError] = field(default_factory=list)
+    chunks: int = 0
+
+    @property
+    def succeeded(self) -> int:
+        """Number of records that were written without an error."""
+        return len(self.results) - len({error.index for error in self.errors})
+
+    @property
+    def failed(self) -> int:
+        """Number of records that failed."""
+        return len({error.index for error in self.errors})
+
+
+def chunk_records(records: Iterable[dict], chunk_size: int) -> Iterator[list[dict]]:
+    """
+    Split an iterable of records into lists of at most `chunk_size` records without materializing the whole input.
+
+    :param records: The records to split.
+    :param chunk_size: The maximum number of records per chunk.
+    :return: A generator that yields each chunk as a list.
+    """
+    _iterator: Iterator[dict] = iter(records)
+
+    while _chunk := list(islice(_iterator, chunk_size)):
+        yield _chunk
+
+
+def record_results(response: dict, size: int) -> list[dict]:
+    """
+    Extract the per-record results from a write response (ex. the list under 'createResponse').
+    If the response does not contain one result per record, every record is given the whole response value.
+
+    :param response: The write response data.
+    :param size: The number of records that were sent.
+    :return: A list of `size` result dictionaries.
+    """
+    _value: object = next(iter(response.values()), None) if len(response) == 1 else response
+
+    if isinstance(_value, list) and len(_value) == size:
+        return _value
+
+    return [_value] * size
+
+
+def record_error(result: dict | None) -> str | None:
+    """
+    Return the error text of a per-record write result, or None if the record succeeded.
+
+    :param result: A per-record result from a write response.
+    :return: The error message, or None if the record succeeded.
+    """
+    if not isinstance(result, dict):
+        return None
+
+    if str(result.get('ErrorCode', '0')).strip() not in ('0', ''):
+        return str(result.get('ErrorText', '')).strip() or f"ErrorCode {result.get('ErrorCode')}"
+
+    if result.get('success') is False or str(result.get('Success', 'true')).lower() == 'false':
+        return str(result.get('ErrorText', '')).strip() or 'Record was not written.'
+
+    return None
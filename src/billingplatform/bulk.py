@@ -0,0 +1,302 @@
+import csv
+import logging
+import os
+import requests
+import shutil
+import tempfile
+import time
+
+from . import exceptions
+from .columnar import iter_csv_batches
+from .streaming import iter_json_array
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Iterator, Literal
+
+if TYPE_CHECKING:
+    from .api import BillingPlatform
+
+
+# Entities and endpoint used to follow a bulk request. See mock_server/README.md for the assumed contract.
+BULK_REQUEST_ENTITY: str = 'BULK_API_REQUEST'
+BULK_BATCH_ENTITY: str = 'BULK_API_BATCH'
+BULK_FILE_ENDPOINT: str = 'bulk_api_file'
+
+COMPLETED_STATUSES: tuple[str, ...] = ('COMPLETED', 'COMPLETE', 'SUCCESS')
+FAILED_STATUSES: tuple[str, ...] = ('FAILED', 'ERROR', 'CANCELLED', 'CANCELED', 'ABORTED')
+
+
+def _first_record(response: dict) -> dict:
+    """
+    Return the first record of a retrieve response, whether the response holds a list of records or a single record.
+
+    :param response: The retrieve response data.
+    :return: The first record, or an empty dictionary.
+    """
+    _value: object = next(iter(response.values()), None) if response else None
+
+    if isinstance(_value, list):
+        return _value[0] if _value else {}
+
+    return _value if isinstance(_value, dict) else {}
+
+
+class BulkJob:
+    """
+    Handle for a bulk query or bulk retrieve request: poll its status, download its result batches and stream their rows.
+    """
+    def __init__(self,
+                 client: 'BillingPlatform',
+                 request_id: str,
+                 ResponseFormat: Literal['CSV', 'JSON'] = 'JSON',
+                 CSVDelimiter: str = ',',
+                 CSVQualifier: str = '\"',
+                 CSVEndLineFormat: Literal['CR', 'LF', 'CRLF'] = 'CRLF'):
+        """
+        Initialize the bulk job handle.
+
+        :param client: The BillingPlatform client used to follow the request.
+        :param request_id: The 'Id' of the bulk request.
+        :param ResponseFormat: The format of the result files ('CSV' or 'JSON').
+        :param CSVDelimiter: Delimiter of the CSV result files (default is ',').
+        :param CSVQualifier: Qualifier of the CSV result files (default is '\"').
+        :param CSVEndLineFormat: End line format of the CSV result files (default is 'CRLF').
+        """
+        self.client: 'BillingPlatform' = client
+        self.request_id: str = str(request_id)
+        self.ResponseFormat: str = ResponseFormat.upper()
+        self.CSVDelimiter: str = CSVDelimiter
+        self.CSVQualifier: str = CSVQualifier
+        self.CSVEndLineFormat: str = CSVEndLineFormat
+        self.last_status: str | None = None
+
+
+    def __repr__(self) -> str:
+        return f'BulkJob(request_id={self.request_id!r}, status={self.last_status!r})'
+
+
+    def status(self) -> str:
+        """
+        Retrieve the current status of the bulk request.
+
+        :return: The status of the request (ex. 'Pending', 'Processing' or 'Completed').
+        :raises Exception: If the retrieve request fails.
+        """
+        _record: dict = _first_record(self.client.retrieve_by_id(BULK_REQUEST_ENTITY, self.request_id))
+        self.last_status = str(_record.get('Status', ''))
+        logging.debug('Bulk request %s status: %s', self.request_id, self.last_status)
+
+        return self.last_status
+
+
+    def wait(self,
+             timeout: float | None = None,
+             poll_interval: float = 2.0,
+             max_poll_interval: float = 60.0,
+             backoff: float = 1.5) -> str:
+        """
+        Poll the bulk request until it completes, waiting longer between each poll.
+
+        :param timeout: The maximum number of seconds to wait (default is None, which waits indefinitely).
+        :param poll_interval: The number of seconds to wait before the second poll (default is 2).
+        :param max_poll_interval: The longest wait between two polls (default is 60).
+        :param backoff: The factor the wait grows by after each poll (default is 1.5).
+        :return: The final status of the request.
+        :raises TimeoutError: If the request has not completed within the timeout.
+        :raises Exception: If the request failed.
+        """
+        _deadline: float | None = time.monotonic() + timeout if timeout is not None else None
+        _interval: float = poll_interval
+
+        while True:
+            _status: str = self.status()
+
+            if _status.upper() in COMPLETED_STATUSES:
+                return _status
+            if _status.upper() in FAILED_STATUSES:
+                raise Exception(f'Bulk request {self.request_id} finished with status {_status}.')
+
+            if _deadline is not None and time.monotonic() + _interval > _deadline:
+                raise TimeoutError(f'Bulk request {self.request_id} did not complete within {timeout} seconds (last status: {_status}).')
+
+            time.sleep(_interval)
+            _interval = min(_interval * backoff, max_poll_interval)
+
+
+    def batches(self) -> list[dict]:
+        """
+        Retrieve the result batches of the bulk request, ordered by 'Id'.
+
+        :return: A list of batch records.
+        :raises Exception: If the retrieve request fails.
+        """
+        try:
+            _response: dict = self.client.retrieve_by_query(BULK_BATCH_ENTITY, f'BulkApiRequestId = {self.request_id}')
+        except exceptions.BillingPlatform404Exception:
+            return []  # No batches yet
+
+        _batches: object = next(iter(_response.values()), [])
+        _batches = _batches if isinstance(_batches, list) else [_batches]
+
+        return sorted(_batches, key=lambda _batch: int(_batch.get('Id', 0)))
+
+
+    def _batch_path(self, directory: str, batch: dict) -> str:
+        _extension: str = 'csv' if self.ResponseFormat == 'CSV' else 'json'
+        return os.path.join(directory, f'{self.request_id}_{batch["Id"]}.{_extension}')
+
+
+    def download_batch(self,
+                       batch: dict,
+                       directory: str,
+                       chunk_size: int = 1 << 20) -> str:
+        """
+        Download the result file of one batch. Interrupted downloads are resumed from the partial file with a Range request.
+
+        :param batch: The batch record (as returned by batches()).
+        :param directory: The directory to save the file in.
+        :param chunk_size: The number of bytes written at a time (default is 1 MiB).
+        :return: The path of the downloaded file.
+        :raises Exception: If the download fails.
+        """
+        _path: str = self._batch_path(directory, batch)
+        _partial_path: str = f'{_path}.part'
+
+        if os.path.exists(_path):
+            return _path  # Already downloaded
+
+        _offset: int = os.path.getsize(_partial_path) if os.path.exists(_partial_path) else 0
+        _headers: dict = {'Range': f'bytes={_offset}-'} if _offset else {}
+        _download_url: str = f'{self.client.rest_base_url}/{BULK_FILE_ENDPOINT}/{batch["Id"]}'
+        logging.debug('Bulk batch download URL: %s (resuming at byte %s)', _download_url, _offset)
+
+        try:
+            _response: requests.Response = self.client._send('GET', _download_url, stream=True, headers=_headers)
+        except requests.RequestException as e:
+            raise Exception(f'Failed to download bulk batch {batch["Id"]}: {e}')
+
+        with _response:
+            if _response.status_code == 416 and _offset:
+                os.replace(_partial_path, _path)  # The partial file already holds the whole batch
+                return _path
+            elif _response.status_code not in (200, 206):
+                self.client._response_handler(_response)  # Raises the matching exception
+
+            # A 200 means the server ignored the Range header and sent the whole file
+            _mode: str = 'ab' if _response.status_code == 206 else 'wb'
+
+            try:
+                with open(_partial_path, _mode) as _file:
+                    for _chunk in _response.iter_content(chunk_size):
+                        _file.write(_chunk)
+            except requests.RequestException as e:
+                raise Exception(f'Failed to download bulk batch {batch["Id"]} (call download again to resume): {e}')
+
+        os.replace(_partial_path, _path)
+
+        return _path
+
+
+    def download(self,
+                 directory: str,
+                 max_workers: int = 4) -> list[str]:
+        """
+        Download the result files of all batches in parallel. Files that were already downloaded are skipped.
+
+        :param directory: The directory to save the files in. It is created if it does not exist.
+        :param max_workers: The maximum number of files downloaded at the same time (default is 4).
+        :return: The paths of the downloaded files, in batch order.
+        :raises Exception: If a download fails.
+        """
+        os.makedirs(directory, exist_ok=True)
+
+        with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as _executor:
+            return list(_executor.map(lambda _batch: self.download_batch(_batch, directory), self.batches()))
+
+
+    def iter_file_rows(self, path: str) -> Iterator[dict]:
+        """
+        Stream the rows of one downloaded result file (as a generator).
+
+        :param path: The path of the result file.
+        :return: A generator that yields each row as a dictionary.
+        """
+        if self.ResponseFormat == 'CSV':
+            with open(path, newline='', encoding='utf-8') as _file:
+                # The csv reader recognises CR, LF and CRLF line endings on its own
+                yield from csv.DictReader(_file, delimiter=self.CSVDelimiter, quotechar=self.CSVQualifier)
+        else:
+            with open(path, 'rb') as _file:
+                yield from iter_json_array(iter(lambda: _file.read(1 << 16), b''), None)
+
+
+    def _iter_downloads(self,
+                        directory: str | None,
+                        max_workers: int) -> Iterator[str]:
+        """
+        Download the result batches in parallel and yield the path of each file in batch order, as soon as it is ready (as a generator).
+
+        :param directory: The directory to save the files in (default is a new temporary directory, removed when the generator finishes or is closed).
+        :param max_workers: The maximum number of files downloaded at the same time.
+        :return: A generator that yields the path of each downloaded file.
+        """
+        _temporary: bool = not directory
+        _directory: str = directory or tempfile.mkdtemp(prefix=f'bulk_{self.request_id}_')
+        os.makedirs(_directory, exist_ok=True)
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as _executor:
+                _downloads: list[Future] = [_executor.submit(self.download_batch, _batch, _directory) for _batch in self.batches()]
+
+                try:
+                    for _download in _downloads:
+                        yield _download.result()
+                finally:
+                    for _download in _downloads:
+                        _download.cancel()
+        finally:
+            if _temporary:
+                # Runs after the executor has waited for the downloads in progress, so none writes into the removed directory
+                shutil.rmtree(_directory, ignore_errors=True)
+
+
+    def iter_rows(self,
+                  directory: str | None = None,
+                  max_workers: int = 4) -> Iterator[dict]:
+        """
+        Download the result batches in parallel and stream their rows in batch order (as a generator).
+        Rows of the first batch are yielded as soon as it is downloaded, while later batches continue downloading.
+
+        :param directory: The directory to save the files in (default is a new temporary directory, removed once the rows are read). Reusing a directory resumes earlier downloads.
+        :param max_workers: The maximum number of files downloaded at the same time (default is 4).
+        :return: A generator that yields each row as a dictionary.
+        :raises Exception: If a download fails.
+        """
+        for _path in self._iter_downloads(directory, max_workers):
+            yield from self.iter_file_rows(_path)
+
+
+    def iter_batches(self,
+                     directory: str | None = None,
+                     batch_size: int = 65536,
+                     columns: list[str] | None = None,
+                     output: Literal['arrow', 'numpy', 'pandas'] = 'arrow',
+                     max_workers: int = 4) -> Iterator[object]:
+        """
+        Download the CSV result batches in parallel and stream them as fixed-size columnar batches, parsed with the
+        job's CSV settings (as a generator). Requires the optional pyarrow dependency.
+
+        :param directory: The directory to save the files in (default is a new temporary directory, removed once the batches are read). Reusing a directory resumes earlier downloads.
+        :param batch_size: The number of rows in each batch. Batches do not span result files, so the last batch of each file may be smaller (default is 65536).
+        :param columns: Optional list of columns to read. If None, all columns are read.
+        :param output: 'arrow' for pyarrow.RecordBatch, 'numpy' for a dict of NumPy arrays, or 'pandas' for a pandas DataFrame (default is 'arrow').
+        :param max_workers: The maximum number of files downloaded at the same time (default is 4).
+        :return: A generator that yields each batch in the requested output format.
+        :raises ValueError: If the job does not produce CSV files.
+        :raises ImportError: If the optional pyarrow dependency is not installed.
+        """
+        if self.ResponseFormat != 'CSV':
+            raise ValueError('Columnar batches are only available for CSV bulk results.')
+
+        for _path in self._iter_downloads(directory, max_workers):
+            yield from iter_csv_batches(_path, self.CSVDelimiter, self.CSVQualifier, self.CSVEndLineFormat, 
+                                        batch_size=batch_size, columns=columns, output=output)
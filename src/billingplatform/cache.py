@@ -0,0 +1,298 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from .bulk import BULK_BATCH_ENTITY, BULK_REQUEST_ENTITY
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable
+
+
+# Entities whose responses change while they are being followed (bulk request status and batches) are never cached
+_UNCACHED_ENTITIES: dict[str, float] = {BULK_REQUEST_ENTITY: 0, BULK_BATCH_ENTITY: 0}
+
+
+class CacheBackend(ABC):
+    """
+    Storage for cached responses. Values are stored as serialized bytes, so every hit returns a fresh copy
+    and the size limit is measured in bytes. Subclass this to plug in another store.
+    """
+    @abstractmethod
+    def get(self, key: str) -> bytes | None:
+        """
+        Return the value stored under a key, or None if it is missing or expired.
+        """
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, entities: set[str], ttl: float) -> None:
+        """
+        Store a value under a key for `ttl` seconds, tagged with the entities it was read from.
+        """
+
+    @abstractmethod
+    def invalidate(self, entity: str) -> int:
+        """
+        Remove every value tagged with an entity and return the number of values removed.
+        """
+
+    @abstractmethod
+    def clear(self) -> None:
+        """
+        Remove every value.
+        """
+
+
+class MemoryCache(CacheBackend):
+    """In-process LRU cache bounded by the total size of the stored values."""
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        """
+        :param max_bytes: The maximum total size of the stored values, in bytes (default is 64 MiB).
+        """
+        self.max_bytes: int = max_bytes
+        self.size: int = 0
+        self._entries: OrderedDict[str, tuple[bytes, set[str], float]] = OrderedDict()
+        self._entity_keys: dict[str, set[str]] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def _remove(self, key: str) -> None:
+        _value, _entities, _ = self._entries.pop(key)
+        self.size -= len(_value)
+
+        for _entity in _entities:
+            _keys: set[str] = self._entity_keys.get(_entity, set())
+            _keys.discard(key)
+            if not _keys:
+                self._entity_keys.pop(_entity, None)
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            _entry: tuple[bytes, set[str], float] | None = self._entries.get(key)
+
+            if _entry is None:
+                return None
+
+            if _entry[2] <= time.monotonic():
+                self._remove(key)
+                return None
+
+            self._entries.move_to_end(key)
+            return _entry[0]
+
+    def set(self, key: str, value: bytes, entities: set[str], ttl: float) -> None:
+        if len(value) > self.max_bytes:
+            return  # Larger than the whole cache
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (value, entities, time.monotonic() + ttl)
+            self.size += len(value)
+
+            for _entity in entities:
+                self._entity_keys.setdefault(_entity, set()).add(key)
+
+            # Evict the least recently used values
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, entity: str) -> int:
+        with self._lock:
+            _keys: set[str] = set(self._entity_keys.get(entity, set()))
+
+            for _key in _keys:
+                self._remove(_key)
+
+            return len(_keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._entity_keys.clear()
+            self.size = 0
+
+
+class DiskCache(CacheBackend):
+    """On-disk LRU cache stored in a SQLite database, shared by every client (and process) that uses the same file."""
+    def __init__(self, path: str, max_bytes: int = 512 * 1024 * 1024):
+        """
+        :param path: The path of the SQLite database file. It is created if it does not exist.
+        :param max_bytes: The maximum total size of the stored values, in bytes (default is 512 MiB).
+        """
+        self.path: str = path
+        self.max_bytes: int = max_bytes
+        self._lock: threading.Lock = threading.Lock()
+
+        _directory: str = os.path.dirname(os.path.abspath(path))
+        os.makedirs(_directory, exist_ok=True)
+
+        self._connection: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS cache_entries ('
+            'key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, expires REAL NOT NULL, accessed REAL NOT NULL)'
+        )
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS cache_entities (entity TEXT NOT NULL, key TEXT NOT NULL, PRIMARY KEY (entity, key))'
+        )
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            _row: tuple | None = self._connection.execute('SELECT value, expires FROM cache_entries WHERE key = ?', (key,)).fetchone()
+
+            if _row is None:
+                return None
+
+            if _row[1] <= time.time():
+                self._delete_keys([key])
+                return None
+
+            self._connection.execute('UPDATE cache_entries SET accessed = ? WHERE key = ?', (time.time(), key))
+            return _row[0]
+
+    def set(self, key: str, value: bytes, entities: set[str], ttl: float) -> None:
+        if len(value) > self.max_bytes:
+            return  # Larger than the whole cache
+
+        with self._lock:
+            _now: float = time.time()
+            self._connection.execute('BEGIN IMMEDIATE')
+
+            try:
+                self._connection.execute('DELETE FROM cache_entities WHERE key = ?', (key,))
+                self._connection.execute('INSERT OR REPLACE INTO cache_entries VALUES (?, ?, ?, ?, ?)', (key, value, len(value), _now + ttl, _now))
+                self._connection.executemany('INSERT OR IGNORE INTO cache_entities VALUES (?, ?)', [(_entity, key) for _entity in entities])
+
+                # Evict expired values, then the least recently used ones
+                self._connection.execute('DELETE FROM cache_entries WHERE expires <= ?', (_now,))
+                _total: int = self._connection.execute('SELECT COALESCE(SUM(size), 0) FROM cache_entries').fetchone()[0]
+
+                if _total > self.max_bytes:
+                    _evicted: list[str] = []
+
+                    for _key, _size in self._connection.execute('SELECT key, size FROM cache_entries ORDER BY accessed').fetchall():
+                        if _total <= self.max_bytes:
+                            break
+                        _evicted.append(_key)
+                        _total -= _size
+
+                    self._connection.executemany('DELETE FROM cache_entries WHERE key = ?', [(_key,) for _key in _evicted])
+
+                self._connection.execute('DELETE FROM cache_entities WHERE key NOT IN (SELECT key FROM cache_entries)')
+                self._connection.execute('COMMIT')
+            except Exception:
+                self._connection.execute('ROLLBACK')
+                raise
+
+    def _delete_keys(self, keys: list[str]) -> None:
+        self._connection.executemany('DELETE FROM cache_entries WHERE key = ?', [(_key,) for _key in keys])
+        self._connection.executemany('DELETE FROM cache_entities WHERE key = ?', [(_key,) for _key in keys])
+
+    def invalidate(self, entity: str) -> int:
+        with self._lock:
+            _keys: list[str] = [_row[0] for _row in self._connection.execute('SELECT key FROM cache_entities WHERE entity = ?', (entity,))]
+            self._delete_keys(_keys)
+
+            return len(_keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute('DELETE FROM cache_entries')
+            self._connection.execute('DELETE FROM cache_entities')
+
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+        self._connection.close()
+
+
+class ResponseCache:
+    """
+    Opt-in response cache for query and retrieve calls, with per-entity time-to-live values.
+    Writes through the client (create, update, upsert, delete, undelete) invalidate the cached responses of the written entity.
+    """
+    def __init__(self,
+                 backend: CacheBackend | None = None,
+                 default_ttl: float = 300.0,
+                 entity_ttls: dict[str, float] | None = None):
+        """
+        :param backend: Where responses are stored (default is a 64 MiB MemoryCache).
+        :param default_ttl: Seconds a response stays cached, for entities without their own TTL (default is 300).
+        :param entity_ttls: Optional per-entity TTLs in seconds (ex. {'PRODUCT': 3600, 'INVOICE': 0}). A TTL of 0 disables caching for the entity.
+        """
+        self.backend: CacheBackend = backend if backend is not None else MemoryCache()
+        self.default_ttl: float = default_ttl
+        self.entity_ttls: dict[str, float] = {**_UNCACHED_ENTITIES, **{_entity.upper(): _ttl for _entity, _ttl in (entity_ttls or {}).items()}}
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def ttl(self, entities: set[str]) -> float:
+        """
+        Return the TTL for a response read from the given entities: the shortest TTL among them.
+
+        :param entities: The uppercased entities the response was read from.
+        :return: The TTL in seconds.
+        """
+        return min((self.entity_ttls.get(_entity, self.default_ttl) for _entity in entities), default=self.default_ttl)
+
+    def get(self, key: str, loads: Callable[[bytes], dict] = json.loads) -> dict | None:
+        """
+        Return a copy of the cached response stored under a key, or None on a miss.
+
+        :param key: The cache key.
+        :param loads: The function that decodes the cached JSON bytes (default is json.loads).
+        :return: The cached response data, or None.
+        """
+        _value: bytes | None = self.backend.get(key)
+
+        if _value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return loads(_value)
+
+    def set(self, key: str, response: dict, entities: set[str], dumps: Callable[[object], bytes] | None = None) -> None:
+        """
+        Cache a response under a key, unless one of its entities has caching disabled.
+
+        :param key: The cache key.
+        :param response: The response data.
+        :param entities: The uppercased entities the response was read from.
+        :param dumps: The function that encodes the response as JSON bytes (default is compact json.dumps).
+        :return: None
+        """
+        _ttl: float = self.ttl(entities)
+
+        if _ttl > 0:
+            _value: bytes = dumps(response) if dumps is not None else json.dumps(response, separators=(',', ':')).encode('utf-8')
+            self.backend.set(key, _value, entities, _ttl)
+
+    def invalidate(self, entity: str) -> int:
+        """
+        Remove every cached response read from an entity.
+
+        :param entity: The entity that changed.
+        :return: The number of cached responses removed.
+        """
+        return self.backend.invalidate(entity.upper())
+
+    def clear(self) -> None:
+        """
+        Remove every cached response.
+
+        :return: None
+        """
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        """
+        Return the hit and miss counters of the cache.
+
+        :return: A dictionary with hits, misses and the hit ratio.
+        """
+        _lookups: int = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'hit_ratio': self.hits / _lookups if _lookups else 0.0}
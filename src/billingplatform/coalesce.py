@@ -0,0 +1,161 @@
+import json
+import requests
+import threading
+
+from . import exceptions
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator
+from urllib.parse import quote
+
+
+# Most servers and proxies accept URLs of at least 8 KiB; stay well below that by default
+DEFAULT_MAX_URL_LENGTH: int = 4000
+
+
+@dataclass
+class RetrieveResult:
+    """Outcome of a retrieve_by_ids call. `records` is keyed by the Ids as they were passed in."""
+    records: dict[object, dict] = field(default_factory=dict)
+    missing: list = field(default_factory=list)
+    requests: int = 0
+
+
+def format_id(record_id: object) -> str:
+    """
+    Format an Id as a SQL literal: numeric Ids are left bare and anything else is quoted.
+
+    :param record_id: The Id to format.
+    :return: The SQL literal.
+    """
+    _text: str = str(record_id).strip()
+
+    if _text.isdigit():
+        return _text
+
+    return "'" + _text.replace("'", "''") + "'"
+
+
+def group_ids(ids: Iterable[object],
+              base_length: int,
+              max_url_length: int = DEFAULT_MAX_URL_LENGTH) -> Iterator[list]:
+    """
+    Split Ids into groups whose URL encoded `IN (...)` list keeps the request URL under a length limit.
+
+    :param ids: The Ids to group.
+    :param base_length: The length of the request URL without any Ids.
+    :param max_url_length: The maximum length of a request URL (default is 4000).
+    :return: A generator that yields each group as a list of Ids.
+    :raises ValueError: If a single Id does not fit in a request URL.
+    """
+    _separator_length: int = len(quote(','))
+    _group: list = []
+    _length: int = base_length
+
+    for _id in ids:
+        _id_length: int = len(quote(format_id(_id))) + (_separator_length if _group else 0)
+
+        if _group and _length + _id_length > max_url_length:
+            yield _group
+            _group, _length = [], base_length
+            _id_length -= _separator_length
+
+        if base_length + _id_length > max_url_length:
+            raise ValueError(f'Id {_id!r} does not fit in a request URL of {max_url_length} characters.')
+
+        _group.append(_id)
+        _length += _id_length
+
+    if _group:
+        yield _group
+
+
+def not_found_exception(entity: str, record_id: object) -> exceptions.BillingPlatform404Exception:
+    """
+    Build the 404 exception raised for a record that a coalesced retrieve did not return.
+
+    :param entity: The entity the record was retrieved from.
+    :param record_id: The Id of the missing record.
+    :return: The exception to raise.
+    """
+    _response: requests.Response = requests.Response()
+    _response.status_code = 404
+    _response._content = json.dumps({'error': f'{entity} record {record_id} not found'}).encode('utf-8')
+
+    return exceptions.BillingPlatform404Exception(_response)
+
+
+class RetrieveCoalescer:
+    """
+    Collects retrieve_by_id calls made from different threads within a short window and sends them as one retrieve_by_ids call per entity.
+    """
+    def __init__(self,
+                 retrieve_many: Callable[[str, list], RetrieveResult],
+                 window: float = 0.005,
+                 max_batch: int = 500):
+        """
+        :param retrieve_many: The function that retrieves many Ids of one entity (ex. BillingPlatform.retrieve_by_ids).
+        :param window: The number of seconds to wait for more calls after the first call of a batch (default is 0.005).
+        :param max_batch: The number of Ids that triggers an immediate send (default is 500).
+        """
+        self.retrieve_many: Callable[[str, list], RetrieveResult] = retrieve_many
+        self.window: float = window
+        self.max_batch: int = max_batch
+        self._pending: dict[str, dict[str, tuple[object, list[Future]]]] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def retrieve(self, entity: str, record_id: object) -> dict:
+        """
+        Retrieve one record, sharing the request with other calls made within the window.
+
+        :param entity: The entity to retrieve the record from.
+        :param record_id: The 'Id' of the record to retrieve.
+        :return: The retrieve response data, holding the record in a one-element list.
+        :raises BillingPlatform404Exception: If the record does not exist.
+        """
+        _future: Future = Future()
+        _full_batch: dict | None = None
+
+        with self._lock:
+            _batch: dict | None = self._pending.get(entity)
+
+            if _batch is None:
+                _batch = self._pending[entity] = {}
+                _timer: threading.Timer = threading.Timer(self.window, self._flush, (entity, _batch))
+                _timer.daemon = True
+                _timer.start()
+
+            _batch.setdefault(str(record_id).strip(), (record_id, []))[1].append(_future)
+
+            if len(_batch) >= self.max_batch:
+                _full_batch = self._pending.pop(entity)
+
+        if _full_batch is not None:
+            self._send(entity, _full_batch)
+
+        return _future.result()
+
+    def _flush(self, entity: str, batch: dict) -> None:
+        with self._lock:
+            if self._pending.get(entity) is not batch:
+                return  # Already sent because it was full
+
+            del self._pending[entity]
+
+        self._send(entity, batch)
+
+    def _send(self, entity: str, batch: dict) -> None:
+        try:
+            _result: RetrieveResult = self.retrieve_many(entity, [_record_id for _record_id, _ in batch.values()])
+        except Exception as e:
+            for _, _futures in batch.values():
+                for _future in _futures:
+                    _future.set_exception(e)
+            return
+
+        for _record_id, _futures in batch.values():
+            for _future in _futures:
+                if _record_id in _result.records:
+                    _future.set_result({'retrieveResponse': [_result.records[_record_id]]})
+                else:
+                    _future.set_exception(not_found_exception(entity, _record_id))
@@ -0,0 +1,30 @@
+import gzip
+
+from urllib3.util.request import ACCEPT_ENCODING
+
+
+# Content encodings in order of preference; the better ratios on JSON come first
+_PREFERENCE: tuple[str, ...] = ('zstd', 'br', 'gzip', 'deflate')
+
+
+def accept_encoding() -> str:
+    """
+    Build the Accept-Encoding header from the content encodings the HTTP stack can decode: always gzip and deflate,
+    and brotli and zstd when their optional packages are installed (pip install billingplatform[compression]).
+
+    :return: The header value (ex. 'br, gzip, deflate').
+    """
+    _encodings: list[str] = [_encoding.strip() for _encoding in ACCEPT_ENCODING.split(',')]
+
+    return ', '.join(sorted(_encodings, key=lambda _encoding: _PREFERENCE.index(_encoding) if _encoding in _PREFERENCE else len(_PREFERENCE)))
+
+
+def compress_body(body: bytes, level: int = 6) -> bytes:
+    """
+    Compress a request body with gzip.
+
+    :param body: The request body.
+    :param level: The gzip compression level, from 1 (fastest) to 9 (smallest) (default is 6).
+    :return: The compressed body.
+    """
+    return gzip.compress(body, compresslevel=level, mtime=0)
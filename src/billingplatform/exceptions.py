@@ -10,6 +10,10 @@ class BillingPlatformException(Exception):
         self.message: str = response.text or default_message or "An error occurred with the BillingPlatform API."
         super().__init__(f"{self.status_code}: {self.message}")
 
+    def __reduce__(self):
+        # Subclasses only take the response, so rebuild from it; the default would pass the formatted message instead
+        return (self.__class__, (self.response,))
+
 class BillingPlatform400Exception(BillingPlatformException):
     """Exception for 400 Bad Request errors."""
     def __init__(self, response: Response):
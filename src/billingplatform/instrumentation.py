@@ -0,0 +1,305 @@
+import bisect
+import logging
+import re
+import threading
+import time
+
+from .sql import referenced_tables
+from abc import ABC, abstractmethod
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable
+from urllib.parse import parse_qs, urlsplit
+
+
+# Upper bounds (in seconds) of the latency histogram buckets; the last bucket is unbounded
+DEFAULT_BUCKETS: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_REST_PATH_PATTERN: re.Pattern = re.compile(r'/rest/[^/]+/(.*)$')
+_AUTH_PATH_PATTERN: re.Pattern = re.compile(r'/auth/[^/]+/(.*)$')
+_FIXED_ENDPOINTS: tuple[str, ...] = ('query', 'login', 'logout', 'bulk_api_request')
+
+
+@dataclass
+class RequestEvent:
+    """One request sent by the client, including its retries. Fields after `entity` are filled in when the request finishes."""
+    method: str
+    url: str
+    endpoint: str # URL template with the entity and Id left out (ex. 'GET /{entity}/{id}')
+    entity: str | None
+    started: float = field(default_factory=time.time)
+    bytes_sent: int = 0 # Bytes on the wire, after compression
+    bytes_received: int | None = None # None for streamed responses without a Content-Length
+    payload_bytes_sent: int | None = None # Size of the request body before compression; None if it was not compressed
+    payload_bytes_received: int | None = None # Size of the decoded response body; None for streamed responses
+    content_encoding: str | None = None # Content-Encoding of the response (ex. 'gzip')
+    status_code: int | None = None
+    retries: int = 0
+    elapsed: float = 0.0 # Wall time in seconds, including retries and rate limiter waits
+    error: str | None = None
+    _start: float = field(default_factory=time.perf_counter, repr=False)
+
+
+def describe_request(method: str, url: str) -> tuple[str, str | None]:
+    """
+    Derive the endpoint template and the entity of a request from its URL.
+
+    :param method: The HTTP method of the request.
+    :param url: The URL of the request.
+    :return: A tuple of the endpoint (ex. 'DELETE /delete/{entity}') and the uppercased entity, or None if the URL names no entity.
+    """
+    _parts = urlsplit(url)
+    _rest_match: re.Match | None = _REST_PATH_PATTERN.search(_parts.path)
+
+    if _rest_match is None:
+        _auth_match: re.Match | None = _AUTH_PATH_PATTERN.search(_parts.path)
+        return f'{method} /{_auth_match.group(1) if _auth_match else _parts.path.strip("/")}', None
+
+    _segments: list[str] = _rest_match.group(1).strip('/').split('/')
+    _first: str = _segments[0]
+
+    if _first == 'query':
+        _tables: set[str] = referenced_tables(parse_qs(_parts.query).get('sql', [''])[0])
+        return f'{method} /query', ','.join(sorted(_tables)) or None
+    elif _first in _FIXED_ENDPOINTS:
+        return f'{method} /{_first}', 'BULK_API_REQUEST' if _first == 'bulk_api_request' else None
+    elif _first == 'bulk_api_file':
+        return f'{method} /bulk_api_file/{{id}}', None
+    elif _first in ('delete', 'undelete') and len(_segments) > 1:
+        return f'{method} /{_first}/{{entity}}', _segments[1].upper()
+    elif len(_segments) > 1:
+        return f'{method} /{{entity}}/{{id}}', _first.upper()
+
+    return f'{method} /{{entity}}', _first.upper()
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram. Memory use does not grow with the number of observations."""
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        :param buckets: Sorted upper bounds of the buckets, in seconds (default is 5 ms to 60 s).
+        """
+        self.buckets: tuple[float, ...] = tuple(buckets)
+        self.counts: list[int] = [0] * (len(self.buckets) + 1)
+        self.count: int = 0
+        self.sum: float = 0.0
+        self.max: float = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """
+        Record one latency.
+
+        :param seconds: The latency in seconds.
+        :return: None
+        """
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile by interpolating within the bucket that holds it.
+
+        :param q: The quantile, between 0 and 1 (ex. 0.99).
+        :return: The estimated latency in seconds, or 0 if nothing was recorded.
+        """
+        if not self.count:
+            return 0.0
+
+        _rank: float = q * self.count
+        _seen: int = 0
+
+        for _index, _bucket_count in enumerate(self.counts):
+            if _bucket_count and _seen + _bucket_count >= _rank:
+                _lower: float = self.buckets[_index - 1] if _index > 0 else 0.0
+                _upper: float = self.buckets[_index] if _index < len(self.buckets) else self.max
+                return min(_lower + (_upper - _lower) * (_rank - _seen) / _bucket_count, self.max)
+            _seen += _bucket_count
+
+        return self.max
+
+    def snapshot(self) -> dict:
+        """
+        Return the state of the histogram.
+
+        :return: A dictionary with the count, sum, p50, p90, p99, max and cumulative bucket counts.
+        """
+        _cumulative: list[int] = []
+        _total: int = 0
+
+        for _bucket_count in self.counts:
+            _total += _bucket_count
+            _cumulative.append(_total)
+
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'p50': self.quantile(0.5),
+            'p90': self.quantile(0.9),
+            'p99': self.quantile(0.99),
+            'max': self.max,
+            'buckets': dict(zip([*self.buckets, float('inf')], _cumulative)),
+        }
+
+
+@dataclass
+class EndpointStats:
+    """Counters and latency histogram of one endpoint."""
+    latency: LatencyHistogram
+    requests: int = 0
+    errors: int = 0
+    retries: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    payload_bytes_sent: int = 0
+    payload_bytes_received: int = 0
+    status_codes: Counter = field(default_factory=Counter)
+
+
+class MetricsExporter(ABC):
+    """
+    Receives every finished request event. Subclass this to forward events to a metrics system
+    (ex. record an OpenTelemetry histogram or observe a Prometheus client metric in export()).
+    """
+    @abstractmethod
+    def export(self, event: RequestEvent) -> None:
+        """
+        Handle one finished request. This runs on the thread that sent the request, so it should return quickly.
+
+        :param event: The finished request.
+        :return: None
+        """
+
+
+class Instrumentation:
+    """
+    Request instrumentation for a client: before and after request hooks, per-endpoint counters and latency histograms, and metric exporters.
+    A failing hook or exporter is logged and never fails the request.
+    """
+    def __init__(self,
+                 before_request: list[Callable[[RequestEvent], None]] | None = None,
+                 after_request: list[Callable[[RequestEvent], None]] | None = None,
+                 exporters: list[MetricsExporter] | None = None,
+                 buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        :param before_request: Functions called with the event before a request is sent.
+        :param after_request: Functions called with the completed event after a request finishes (or fails).
+        :param exporters: MetricsExporter instances that receive every completed event.
+        :param buckets: Upper bounds of the latency histogram buckets, in seconds.
+        """
+        self.before_request: list[Callable[[RequestEvent], None]] = list(before_request or [])
+        self.after_request: list[Callable[[RequestEvent], None]] = list(after_request or [])
+        self.exporters: list[MetricsExporter] = list(exporters or [])
+        self.buckets: tuple[float, ...] = buckets
+        self.endpoints: dict[str, EndpointStats] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def _call(self, callbacks: list[Callable[[RequestEvent], None]], event: RequestEvent) -> None:
+        for _callback in callbacks:
+            try:
+                _callback(event)
+            except Exception as e:
+                logging.warning('Instrumentation callback %r failed: %s', _callback, e)
+
+    def start(self, method: str, url: str) -> RequestEvent:
+        """
+        Create the event of a request that is about to be sent and run the before request hooks.
+
+        :param method: The HTTP method of the request.
+        :param url: The URL of the request.
+        :return: The request event, to be passed to finish().
+        """
+        _endpoint, _entity = describe_request(method, url)
+        _event: RequestEvent = RequestEvent(method=method, url=url, endpoint=_endpoint, entity=_entity)
+
+        self._call(self.before_request, _event)
+
+        return _event
+
+    def finish(self, event: RequestEvent) -> None:
+        """
+        Complete a request event: record its metrics, then run the after request hooks and exporters.
+
+        :param event: The event returned by start(), with its status, bytes and retries filled in.
+        :return: None
+        """
+        event.elapsed = time.perf_counter() - event._start
+
+        with self._lock:
+            _stats: EndpointStats | None = self.endpoints.get(event.endpoint)
+
+            if _stats is None:
+                _stats = self.endpoints[event.endpoint] = EndpointStats(latency=LatencyHistogram(self.buckets))
+
+            _stats.latency.observe(event.elapsed)
+            _stats.requests += 1
+            _stats.retries += event.retries
+            _stats.bytes_sent += event.bytes_sent
+            _stats.bytes_received += event.bytes_received or 0
+            _stats.payload_bytes_sent += event.bytes_sent if event.payload_bytes_sent is None else event.payload_bytes_sent
+            _stats.payload_bytes_received += (event.bytes_received or 0) if event.payload_bytes_received is None else event.payload_bytes_received
+            _stats.status_codes[event.status_code] += 1
+
+            if event.error is not None or (event.status_code or 0) >= 400:
+                _stats.errors += 1
+
+        self._call(self.after_request, event)
+        self._call([_exporter.export for _exporter in self.exporters], event)
+
+    def snapshot(self) -> dict:
+        """
+        Return the counters and latency percentiles of every endpoint.
+
+        :return: A dictionary keyed by endpoint (ex. 'GET /query').
+        """
+        with self._lock:
+            return {
+                _endpoint: {
+                    'requests': _stats.requests,
+                    'errors': _stats.errors,
+                    'retries': _stats.retries,
+                    'bytes_sent': _stats.bytes_sent,
+                    'bytes_received': _stats.bytes_received,
+                    'payload_bytes_sent': _stats.payload_bytes_sent,
+                    'payload_bytes_received': _stats.payload_bytes_received,
+                    'compression': {
+                        # Payload bytes per wire byte, so 1.0 means nothing was compressed
+                        'sent_ratio': _stats.payload_bytes_sent / _stats.bytes_sent if _stats.bytes_sent else 1.0,
+                        'received_ratio': _stats.payload_bytes_received / _stats.bytes_received if _stats.bytes_received else 1.0,
+                        'bytes_saved': (_stats.payload_bytes_sent - _stats.bytes_sent) + (_stats.payload_bytes_received - _stats.bytes_received),
+                    },
+                    'status_codes': dict(_stats.status_codes),
+                    'latency': _stats.latency.snapshot(),
+                }
+                for _endpoint, _stats in self.endpoints.items()
+            }
+
+    def prometheus_text(self, prefix: str = 'billingplatform') -> str:
+        """
+        Render the metrics in the Prometheus text exposition format, for serving from a /metrics endpoint.
+
+        :param prefix: The prefix of the metric names (default is 'billingplatform').
+        :return: The metrics text.
+        """
+        _snapshot: dict = self.snapshot()
+        _lines: list[str] = [f'# TYPE {prefix}_request_duration_seconds histogram']
+
+        # Every line of a metric family must be grouped under its TYPE line
+        for _endpoint, _stats in _snapshot.items():
+            _labels: str = f'endpoint="{_endpoint}"'
+
+            for _bound, _count in _stats['latency']['buckets'].items():
+                _le: str = '+Inf' if _bound == float('inf') else repr(_bound)
+                _lines.append(f'{prefix}_request_duration_seconds_bucket{{{_labels},le="{_le}"}} {_count}')
+
+            _lines.append(f'{prefix}_request_duration_seconds_sum{{{_labels}}} {_stats["latency"]["sum"]}')
+            _lines.append(f'{prefix}_request_duration_seconds_count{{{_labels}}} {_stats["latency"]["count"]}')
+
+        for _name, _key in (('requests_total', 'requests'), ('request_errors_total', 'errors'), ('request_retries_total', 'retries'),
+                            ('request_bytes_sent_total', 'bytes_sent'), ('request_bytes_received_total', 'bytes_received'),
+                            ('request_payload_bytes_sent_total', 'payload_bytes_sent'), ('request_payload_bytes_received_total', 'payload_bytes_received')):
+            _lines.append(f'# TYPE {prefix}_{_name} counter')
+            _lines.extend(f'{prefix}_{_name}{{endpoint="{_endpoint}"}} {_stats[_key]}' for _endpoint, _stats in _snapshot.items())
+
+        return '\n'.join(_lines) + '\n'
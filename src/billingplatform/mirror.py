@@ -0,0 +1,376 @@
+import json
+import logging
+import re
+import sqlite3
+import threading
+
+from .models import Record
+from .sql import clause_positions, referenced_tables
+from .sync import IncrementalSync, StateStore, SyncResult
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+    from .api import BillingPlatform
+
+
+_STATE_TABLE: str = '_mirror_state'
+_ROW_COUNT_PATTERN: re.Pattern = re.compile(r'\d+')
+_NUMBER_PATTERN: re.Pattern = re.compile(r'-?(?:0|[1-9]\d*)(\.\d+)?')
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _column_value(value: object) -> object:
+    """
+    Convert an API value to a value SQLite stores natively. Nested objects are stored as JSON text.
+    """
+    if value is None or isinstance(value, (int, float, str, bytes)):
+        return value
+
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+
+    return str(value)
+
+
+def _numeric(value: object) -> object:
+    # Bulk CSV extracts return numbers as text, so numeric strings are stored as numbers to compare and sort as numbers.
+    # Strings with leading zeros (ex. postal codes) are not numbers and keep their text.
+    _match: re.Match | None = _NUMBER_PATTERN.fullmatch(value) if isinstance(value, str) else None
+
+    if _match is None:
+        return value
+
+    return float(value) if _match.group(1) else int(value)
+
+
+def _sort_key(value: object) -> tuple[int, object]:
+    # Orders values the way SQLite does, numbers before text, so a column of mixed numbers and text never compares int to str
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return 0, value
+
+    return 1, value if isinstance(value, str) else str(value)
+
+
+def _to_sqlite(sql: str, offset: int = 0, limit: int = 0) -> str:
+    """
+    Rewrite the BillingPlatform pagination syntax (OFFSET n ROWS / FETCH NEXT n ROWS ONLY) into SQLite's LIMIT/OFFSET.
+
+    :param sql: The SQL query.
+    :param offset: The number of rows to skip (default is 0).
+    :param limit: The maximum number of rows to return (default is 0, which means no limit).
+    :return: The SQL query in SQLite syntax.
+    """
+    _paging: list[tuple[str, int, int]] = [_clause for _clause in clause_positions(sql) if _clause[0] in ('OFFSET', 'FETCH')]
+
+    if _paging:
+        for _keyword, _start, _ in _paging:
+            _count: re.Match | None = _ROW_COUNT_PATTERN.search(sql, _start)
+
+            if _count is not None and _keyword == 'OFFSET':
+                offset = int(_count.group())
+            elif _count is not None:
+                limit = int(_count.group())
+
+        sql = sql[:_paging[0][1]].rstrip()
+
+    if limit or offset:
+        sql = f'{sql} LIMIT {limit or -1}'
+    if offset:
+        sql = f'{sql} OFFSET {offset}'
+
+    return sql
+
+
+class SQLiteStateStore(StateStore):
+    """
+    Keeps sync states in a table of the mirror database. Saving a checkpoint commits the rows written since the
+    previous checkpoint in the same transaction, so the mirrored rows and the high-water mark never disagree.
+    """
+    def __init__(self, connection: sqlite3.Connection, lock: threading.RLock):
+        self.connection: sqlite3.Connection = connection
+        self._lock: threading.RLock = lock
+
+        with self._lock:
+            self.connection.execute(f'CREATE TABLE IF NOT EXISTS {_STATE_TABLE} (name TEXT PRIMARY KEY, state TEXT NOT NULL)')
+            self.connection.commit()
+
+    def load(self, name: str) -> dict | None:
+        with self._lock:
+            _row: tuple | None = self.connection.execute(f'SELECT state FROM {_STATE_TABLE} WHERE name = ?', (name,)).fetchone()
+
+        return json.loads(_row[0]) if _row else None
+
+    def save(self, name: str, state: dict) -> None:
+        with self._lock:
+            self.connection.execute(f'INSERT OR REPLACE INTO {_STATE_TABLE} (name, state) VALUES (?, ?)', (name, json.dumps(state, default=str)))
+            self.connection.commit()
+
+
+class Mirror:
+    """
+    A local copy of selected entities in an embedded SQLite database. Mirrored entities are kept fresh incrementally
+    with IncrementalSync, and queries that only read mirrored, fresh entities are answered locally instead of by the API.
+
+    Refreshes only pull rows whose watermark grew, so deleted records are never removed from the mirror, and with the
+    default 'Id' watermark updates to existing rows are not seen either. Mirror entities that change with a watermark
+    such as an updated timestamp, and rebuild the mirror to drop deleted records.
+    """
+    def __init__(self,
+                 client: 'BillingPlatform',
+                 path: str = ':memory:',
+                 max_age: float | None = 300.0,
+                 auto_refresh: bool = False,
+                 page_size: int = 1000,
+                 partitions: int = 4,
+                 max_workers: int = 4):
+        """
+        :param client: The BillingPlatform client used to refresh the mirror and to answer queries it cannot.
+        :param path: The path of the SQLite database file (default is ':memory:', a mirror that lasts as long as the object).
+        :param max_age: The maximum age, in seconds, of a mirrored entity for queries to read it (default is 300). None never expires.
+        :param auto_refresh: Whether queries refresh stale mirrored entities before reading them instead of falling back to the API (default is False).
+        :param page_size: The number of rows per page when refreshing (default is 1000).
+        :param partitions: The number of 'Id' ranges each refresh is split into (default is 4).
+        :param max_workers: The maximum number of ranges fetched at the same time (default is 4).
+        """
+        self.client: 'BillingPlatform' = client
+        self.path: str = path
+        self.max_age: float | None = max_age
+        self.auto_refresh: bool = auto_refresh
+        self._lock: threading.RLock = threading.RLock()
+        self.connection: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False)
+        self.store: SQLiteStateStore = SQLiteStateStore(self.connection, self._lock)
+        self._sync: IncrementalSync = IncrementalSync(client, self.store, page_size, partitions, max_workers)
+        self._columns: dict[str, set[str]] = {}
+
+
+    def _entity_state(self, entity: str) -> dict | None:
+        return self.store.load(entity.upper())
+
+
+    def entities(self) -> list[str]:
+        """
+        List the mirrored entities.
+
+        :return: The uppercased names of the entities added to the mirror.
+        """
+        with self._lock:
+            return [_row[0] for _row in self.connection.execute(f'SELECT name FROM {_STATE_TABLE} ORDER BY name')]
+
+
+    def add(self,
+            entity: str,
+            columns: Iterable[str] | None = None,
+            watermark: str = 'Id',
+            where: str | None = None,
+            refresh: bool = True) -> SyncResult | None:
+        """
+        Add an entity to the mirror.
+
+        :param entity: The entity to mirror (ex. 'ACCOUNT').
+        :param columns: The columns to mirror (default is all columns). 'Id' is always mirrored.
+        :param watermark: The column whose growth marks a changed row (default is 'Id', for append-only entities). Updates are only mirrored with a watermark that grows on every change (ex. 'UpdatedDate').
+        :param where: Optional filter on the rows to mirror (ex. "Status = 'ACTIVE'"). Queries are answered from the filtered rows.
+        :param refresh: Whether to load the entity right away (default is True).
+        :return: The SyncResult of the initial load, or None if refresh is False.
+        """
+        _entity: str = entity.upper()
+        _state: dict = self._entity_state(_entity) or {'entity': _entity, 'watermark': watermark, 'high_water_mark': None, 'run': None}
+        _state['mirror'] = {'columns': list(columns) if columns else None, 'where': where}
+        self.store.save(_entity, _state)
+
+        return self.refresh(_entity)[_entity] if refresh else None
+
+
+    def _ensure_table(self, entity: str, columns: Iterable[str]) -> None:
+        _known: set[str] | None = self._columns.get(entity)
+
+        if _known is None:
+            # NUMERIC affinity stores the text Ids of bulk CSV extracts as numbers, so they match the Ids of query responses
+            self.connection.execute(f'CREATE TABLE IF NOT EXISTS {_quote(entity)} ("Id" NUMERIC PRIMARY KEY)')
+            _known = self._columns[entity] = {_row[1] for _row in self.connection.execute(f'PRAGMA table_info({_quote(entity)})')}
+
+        for _column in columns:
+            if _column not in _known:
+                self.connection.execute(f'ALTER TABLE {_quote(entity)} ADD COLUMN {_quote(_column)}')
+                _known.add(_column)
+
+
+    def _write(self, entity: str, rows: list) -> None:
+        """
+        Upsert rows into the table of an entity. The rows are committed with the next checkpoint.
+        """
+        _rows: list[dict] = [_row.to_dict(raw=True) if isinstance(_row, Record) else _row for _row in rows]
+
+        if not _rows:
+            return
+
+        with self._lock:
+            _columns: list[str] = list(_rows[0])
+            self._ensure_table(entity, _columns)
+            _insert: str = (f'INSERT OR REPLACE INTO {_quote(entity)} ({", ".join(_quote(_column) for _column in _columns)}) '
+                            f'VALUES ({", ".join("?" * len(_columns))})')
+            self.connection.executemany(_insert, ([_column_value(_row.get(_column)) for _column in _columns] for _row in _rows))
+
+
+    def refresh(self, entity: str | None = None) -> dict[str, SyncResult]:
+        """
+        Pull the rows that changed since the previous refresh into the mirror.
+
+        :param entity: The entity to refresh (default is None, which refreshes every mirrored entity).
+        :return: The SyncResult of each refreshed entity.
+        :raises KeyError: If the entity was not added to the mirror.
+        :raises Exception: If a query request fails. The next refresh resumes after the last committed page.
+        """
+        _results: dict[str, SyncResult] = {}
+
+        for _entity in ([entity.upper()] if entity else self.entities()):
+            _state: dict | None = self._entity_state(_entity)
+
+            if _state is None or 'mirror' not in _state:
+                raise KeyError(f'{_entity} is not mirrored. Add it with Mirror.add() first.')
+
+            _results[_entity] = self._sync.run(_entity,
+                                               lambda _rows, _entity=_entity: self._write(_entity, _rows),
+                                               _state['mirror']['columns'],
+                                               _state['watermark'],
+                                               _state['mirror']['where'])
+
+        return _results
+
+
+    def load(self, entity: str, rows: Iterable[dict], batch_size: int = 10000) -> int:
+        """
+        Load rows from another source, such as a bulk extract (BulkJob.iter_rows()), into the mirror of an entity.
+        The largest watermark value among the rows becomes the high-water mark, so the next refresh only pulls later changes.
+        Numeric strings, as found in CSV extracts, are stored as numbers so they compare and sort as numbers.
+
+        :param entity: The mirrored entity.
+        :param rows: The rows to load. They must contain the 'Id' and watermark columns.
+        :param batch_size: The number of rows written per transaction (default is 10000).
+        :return: The number of rows loaded.
+        :raises KeyError: If the entity was not added to the mirror.
+        """
+        _entity: str = entity.upper()
+        _state: dict | None = self._entity_state(_entity)
+
+        if _state is None or 'mirror' not in _state:
+            raise KeyError(f'{_entity} is not mirrored. Add it with Mirror.add(refresh=False) first.')
+
+        _watermark: str = _state['watermark']
+        _high_water_mark: object = _numeric(_state.get('high_water_mark')) # Saved by an earlier run, possibly as text
+        _count: int = 0
+        _batch: list[dict] = []
+
+        for _row in rows:
+            _row = {_column: _numeric(_value) for _column, _value in _row.items()}
+            _batch.append(_row)
+            _value: object = _row.get(_watermark)
+
+            if _value is not None and (_high_water_mark is None or _sort_key(_value) > _sort_key(_high_water_mark)):
+                _high_water_mark = _value
+
+            if len(_batch) >= batch_size:
+                self._write(_entity, _batch)
+                _count += len(_batch)
+                _batch = []
+                self.store.save(_entity, _state) # Commits the batch
+
+        self._write(_entity, _batch)
+        _count += len(_batch)
+        _state.update({'high_water_mark': _high_water_mark, 'last_sync': datetime.now(timezone.utc).isoformat(timespec='seconds')})
+        self.store.save(_entity, _state)
+        logging.debug('Loaded %s rows into the mirror of %s, high-water mark %s', _count, _entity, _high_water_mark)
+
+        return _count
+
+
+    def is_fresh(self, entity: str, max_age: float | None = None) -> bool:
+        """
+        Check whether an entity is mirrored and was refreshed recently enough to be read. A fresh mirror still keeps
+        deleted records, and misses updates when its watermark is 'Id'.
+
+        :param entity: The entity.
+        :param max_age: The maximum age in seconds (default is the max_age of the mirror).
+        :return: True if queries may read the mirror of the entity.
+        """
+        _state: dict | None = self._entity_state(entity)
+        _max_age: float | None = self.max_age if max_age is None else max_age
+
+        if _state is None or not _state.get('last_sync') or _state.get('run') is not None:
+            return False # Never loaded, or a refresh did not complete
+
+        if _max_age is None:
+            return True
+
+        return datetime.now(timezone.utc) - datetime.fromisoformat(_state['last_sync']) <= timedelta(seconds=_max_age)
+
+
+    def query_local(self, sql: str, offset: int = 0, limit: int = 0) -> dict:
+        """
+        Execute a SQL query against the mirror only.
+
+        :param sql: The SQL query. BillingPlatform OFFSET/FETCH pagination is translated to SQLite syntax.
+        :param offset: The number of rows to skip before starting to return rows (default is 0).
+        :param limit: The maximum number of rows to return (default is 0, which means no limit).
+        :return: The query response data, ex. {'queryResponse': [...]}. No matching rows return an empty list.
+        :raises sqlite3.Error: If SQLite cannot execute the query (ex. it reads a column that is not mirrored).
+        """
+        with self._lock:
+            _cursor: sqlite3.Cursor = self.connection.execute(_to_sqlite(sql, offset, limit))
+            _columns: list[str] = [_column[0] for _column in _cursor.description]
+
+            return {'queryResponse': [dict(zip(_columns, _row)) for _row in _cursor.fetchall()]}
+
+
+    def query(self,
+              sql: str,
+              offset: int = 0,
+              limit: int = 0,
+              max_age: float | None = None) -> dict:
+        """
+        Execute a SQL query against the mirror when it only reads mirrored entities that are fresh enough, otherwise
+        against the BillingPlatform API. Queries SQLite cannot execute also fall back to the API.
+
+        :param sql: The SQL query to execute.
+        :param offset: The number of rows to skip before starting to return rows (default is 0).
+        :param limit: The maximum number of rows to return (default is 0, which means no limit).
+        :param max_age: The maximum age in seconds of the mirrored entities (default is the max_age of the mirror).
+        :return: The query response data.
+        :raises Exception: If the query falls back to the API and the request fails.
+        """
+        _tables: set[str] = referenced_tables(sql)
+        _mirrored: set[str] = set(self.entities())
+
+        if _tables and _tables <= _mirrored:
+            _stale: list[str] = [_table for _table in _tables if not self.is_fresh(_table, max_age)]
+
+            if _stale and self.auto_refresh:
+                for _table in _stale:
+                    self.refresh(_table)
+                _stale = []
+
+            if not _stale:
+                try:
+                    _response: dict = self.query_local(sql, offset, limit)
+                    logging.debug('Query answered from the mirror: %s', sql)
+                    return _response
+                except sqlite3.Error as e:
+                    logging.debug('Mirror cannot answer the query (%s), falling back to the API', e)
+            else:
+                logging.debug('Mirror of %s is stale, falling back to the API', ', '.join(sorted(_stale)))
+
+        return self.client.query(sql, offset, limit)
+
+
+    def close(self) -> None:
+        """
+        Close the mirror database.
+
+        :return: None
+        """
+        with self._lock:
+            self.connection.close()
@@ -0,0 +1,204 @@
+import keyword
+import sys
+import threading
+
+from datetime import date, datetime
+from decimal import Decimal
+from operator import attrgetter
+from typing import Callable, Iterable, Literal
+
+
+def to_date(value: object) -> date | None:
+    """
+    Convert an API date value (ex. '2024-01-31' or '2024-01-31T00:00:00') to a date.
+    """
+    if value is None or value == '':
+        return None
+
+    return datetime.fromisoformat(str(value)).date()
+
+
+def to_datetime(value: object) -> datetime | None:
+    """
+    Convert an API date-time value (ex. '2024-01-31 13:45:00' or '2024-01-31T13:45:00Z') to a datetime.
+    """
+    if value is None or value == '':
+        return None
+
+    return datetime.fromisoformat(str(value))
+
+
+def to_decimal(value: object) -> Decimal | None:
+    """
+    Convert an API amount (a number or numeric string) to a Decimal without binary rounding errors.
+    """
+    if value is None or value == '':
+        return None
+
+    return Decimal(str(value))
+
+
+class Record:
+    """
+    Base class of the slotted record types made by record_type(). Each record keeps the raw values of its fields
+    in slots, so it carries no per-row dictionary or key strings. Fields with a converter are converted lazily,
+    on every access, so rows that are never read stay in their compact raw form.
+    """
+    __slots__ = ()
+    _fields: tuple[str, ...] = ()
+    _converters: dict[str, Callable[[object], object]] = {}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Record':
+        """
+        Build a record from a decoded API row. Keys that are not fields of the type are ignored, and missing fields are None.
+        record_type() generates a faster version of this for each type.
+
+        :param data: The row.
+        :return: A record of this type.
+        """
+        _record: Record = object.__new__(cls)
+
+        for _field in cls._fields:
+            setattr(_record, f'_raw_{_field}' if _field in cls._converters else _field, data.get(_field))
+
+        return _record
+
+    def get(self, field: str, default: object = None) -> object:
+        """
+        Return the (converted) value of a field, or a default if the type has no such field.
+        """
+        return getattr(self, field) if field in self._fields else default
+
+    def __getitem__(self, field: str) -> object:
+        if field not in self._fields:
+            raise KeyError(field)
+
+        return getattr(self, field)
+
+    def __contains__(self, field: str) -> bool:
+        return field in self._fields
+
+    def keys(self) -> tuple[str, ...]:
+        return self._fields
+
+    def to_dict(self, raw: bool = False) -> dict:
+        """
+        Return the record as a dictionary.
+
+        :param raw: Whether to return the raw API values instead of the converted ones (default is False).
+        :return: The fields and values of the record.
+        """
+        if raw:
+            return {_field: getattr(self, _slot_name(self, _field)) for _field in self._fields}
+
+        return {_field: getattr(self, _field) for _field in self._fields}
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+
+        return self.to_dict(raw=True) == other.to_dict(raw=True)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(f'{_field}={getattr(self, _field)!r}' for _field in self._fields)})"
+
+
+def _slot_name(record: Record, field: str) -> str:
+    return f'_raw_{field}' if field in record._converters else field
+
+
+def _converted_property(slot: str, converter: Callable[[object], object]) -> property:
+    _raw: Callable[[Record], object] = attrgetter(slot)
+
+    return property(lambda self: converter(_raw(self)))
+
+
+# Generated record types, keyed by name, fields and converters, so equal declarations share one class
+_RECORD_TYPES: dict[tuple, type[Record]] = {}
+_RECORD_TYPES_LOCK: threading.Lock = threading.Lock()
+
+
+def record_type(name: str,
+                fields: Iterable[str],
+                converters: dict[str, Callable[[object], object]] | None = None) -> type[Record]:
+    """
+    Generate a slotted record type from an entity's field list.
+
+    :param name: The name of the type (ex. 'Account').
+    :param fields: The field names, in order (ex. ('Id', 'Name', 'CreatedDate')).
+    :param converters: Optional functions that convert the raw values of fields on access (ex. {'CreatedDate': to_datetime}).
+    :return: A Record subclass with one slot per field.
+    :raises ValueError: If a field name is not a valid identifier, is repeated, or a converter names an unknown field.
+    """
+    _fields: tuple[str, ...] = tuple(sys.intern(str(_field)) for _field in fields)
+    _converters: dict[str, Callable] = dict(converters or {})
+
+    for _field in _fields:
+        if not _field.isidentifier() or keyword.iskeyword(_field) or _field.startswith('_'):
+            raise ValueError(f"Field name '{_field}' is not a valid record field; alias it in the SELECT clause.")
+
+    if len(set(_fields)) != len(_fields):
+        raise ValueError(f'Duplicate field names in {_fields}.')
+
+    if set(_converters) - set(_fields):
+        raise ValueError(f"Converters for unknown fields: {', '.join(sorted(set(_converters) - set(_fields)))}")
+
+    _key: tuple = (name, _fields, tuple((_field, id(_converter)) for _field, _converter in sorted(_converters.items())))
+
+    with _RECORD_TYPES_LOCK:
+        if _key in _RECORD_TYPES:
+            return _RECORD_TYPES[_key]
+
+        _slots: tuple[str, ...] = tuple(f'_raw_{_field}' if _field in _converters else _field for _field in _fields)
+        _namespace: dict = {
+            '__slots__': _slots,
+            '_fields': _fields,
+            '_converters': _converters,
+            **{_field: _converted_property(f'_raw_{_field}', _converter) for _field, _converter in _converters.items()},
+        }
+
+        # Generate __init__ and from_dict the way namedtuple and dataclasses do, so building a record is a single call
+        _parameters: str = ', '.join(f'{_field}=None' for _field in _fields)
+        _assignments: str = '\n'.join(f'    self.{_slot} = {_field}' for _slot, _field in zip(_slots, _fields)) or '    pass'
+        _lookups: str = '\n'.join(f'    self.{_slot} = _get({_field!r})' for _slot, _field in zip(_slots, _fields))
+        _source: str = (f'def __init__(self, {_parameters}):\n{_assignments}\n'
+                        f'def from_dict(cls, data):\n    self = _new(cls)\n    _get = data.get\n{_lookups}\n    return self\n')
+        _generated: dict = {'_new': object.__new__}
+        exec(_source, _generated)
+
+        _namespace['__init__'] = _generated['__init__']
+        _namespace['from_dict'] = classmethod(_generated['from_dict'])
+
+        _type: type[Record] = type(name, (Record,), _namespace)
+        _RECORD_TYPES[_key] = _type
+
+        return _type
+
+
+def convert_response(response: dict,
+                     record: type[Record] | Literal['auto'],
+                     entity: str | None = None) -> dict:
+    """
+    Convert the rows of a query or retrieve response into records, in place.
+
+    :param response: The response data (ex. {'queryResponse': [...]}).
+    :param record: A Record type, or 'auto' to generate one from the fields of the first row.
+    :param entity: The entity the response was read from, used to name generated types (optional).
+    :return: The response data, with records in place of row dictionaries.
+    """
+    for _key, _rows in response.items():
+        _first: object = _rows[0] if isinstance(_rows, list) and _rows else _rows
+
+        if not isinstance(_first, dict):
+            continue # Not rows, or already converted
+
+        _type: type[Record] = record_type((entity or 'Record').title().replace('_', ''), _first.keys()) if record == 'auto' else record
+
+        if isinstance(_rows, dict):
+            response[_key] = _type.from_dict(_rows)
+        else:
+            _from_dict: Callable[[dict], Record] = _type.from_dict
+            response[_key] = [_from_dict(_row) for _row in _rows]
+
+    return response
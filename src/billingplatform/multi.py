@@ -0,0 +1,133 @@
+import logging
+import time
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+if TYPE_CHECKING:
+    from .api import BillingPlatform
+
+
+# Client methods that can be dispatched by execute_many
+OPERATION_METHODS: tuple[str, ...] = (
+    'query', 'retrieve_by_id', 'retrieve_by_query', 'retrieve_by_ids',
+    'create', 'update', 'upsert', 'delete', 'undelete',
+)
+
+
+@dataclass
+class Operation:
+    """A client call to dispatch with execute_many, ex. Operation('query', ('SELECT Id FROM ACCOUNT WHERE 1=1',))."""
+    method: str
+    args: tuple = ()
+    kwargs: dict = field(default_factory=dict)
+
+
+@dataclass
+class OperationResult:
+    """The outcome of one operation. Failed, timed out and cancelled operations carry their exception instead of a result."""
+    index: int # Position of the operation in the input
+    operation: Operation
+    result: dict | None = None
+    exception: Exception | None = None
+    cancelled: bool = False # True if the operation never started
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Whether the operation completed without an error."""
+        return self.exception is None
+
+
+def to_operation(operation: Operation | tuple) -> Operation:
+    """
+    Normalize an operation given as a tuple of the method name and its positional arguments (ex. ('retrieve_by_id', 'ACCOUNT', 10)).
+
+    :param operation: An Operation or a tuple.
+    :return: An Operation.
+    :raises ValueError: If the method cannot be dispatched.
+    """
+    _operation: Operation = operation if isinstance(operation, Operation) else Operation(operation[0], tuple(operation[1:]))
+
+    if _operation.method not in OPERATION_METHODS:
+        raise ValueError(f"Unsupported operation '{_operation.method}'. Use one of: {', '.join(OPERATION_METHODS)}.")
+
+    return _operation
+
+
+def _run(client: 'BillingPlatform', index: int, operation: Operation) -> OperationResult:
+    _start: float = time.perf_counter()
+
+    try:
+        _result: dict = getattr(client, operation.method)(*operation.args, **operation.kwargs)
+        return OperationResult(index, operation, _result, elapsed=time.perf_counter() - _start)
+    except Exception as e:
+        logging.debug('Operation %s (%s) failed: %s', index, operation.method, e)
+        return OperationResult(index, operation, exception=e, elapsed=time.perf_counter() - _start)
+
+
+def execute_many(client: 'BillingPlatform',
+                 operations: Iterable[Operation | tuple],
+                 max_workers: int | None = None,
+                 timeout: float | None = None,
+                 ordered: bool = True) -> Iterator[OperationResult]:
+    """
+    Dispatch client calls concurrently over the client's shared session. The operations start right away; results are
+    yielded by the returned generator.
+
+    Once the deadline passes, operations that have not started are cancelled and running ones are abandoned: they are
+    reported with a TimeoutError, and their requests complete in the background without being reported. The same
+    happens when the caller stops iterating early.
+
+    :param client: The BillingPlatform client to call.
+    :param operations: The operations to run.
+    :param max_workers: The maximum number of operations running at the same time (default is the client's pool_maxsize).
+    :param timeout: Optional overall deadline in seconds, counted from the call.
+    :param ordered: Whether to yield results in input order (default is True) or as they complete.
+    :return: A generator that yields one OperationResult per operation.
+    :raises ValueError: If an operation cannot be dispatched.
+    """
+    _operations: list[Operation] = [to_operation(_operation) for _operation in operations]
+    _deadline: float | None = time.monotonic() + timeout if timeout is not None else None
+    _executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=max(1, min(max_workers or client.pool_maxsize, len(_operations) or 1)))
+    _futures: dict[Future, int] = {_executor.submit(_run, client, i, _operation): i for i, _operation in enumerate(_operations)}
+
+    def _remaining() -> float | None:
+        return None if _deadline is None else max(0.0, _deadline - time.monotonic())
+
+    def _expired(_future: Future) -> OperationResult:
+        _index: int = _futures[_future]
+        _cancelled: bool = _future.cancel()
+        _state: str = 'was cancelled' if _cancelled else 'was abandoned'
+        logging.warning('Operation %s (%s) %s at the %ss deadline', _index, _operations[_index].method, _state, timeout)
+
+        return OperationResult(_index, _operations[_index], exception=TimeoutError(f'Operation {_state} at the {timeout}s deadline.'),
+                               cancelled=_cancelled)
+
+    def _results() -> Iterator[OperationResult]:
+        try:
+            if ordered:
+                for _future in _futures:
+                    _done, _ = wait([_future], timeout=_remaining())
+                    yield _future.result() if _done else _expired(_future)
+            else:
+                _pending: set[Future] = set(_futures)
+
+                while _pending:
+                    _done, _pending = wait(_pending, timeout=_remaining(), return_when=FIRST_COMPLETED)
+
+                    if not _done:
+                        break # Deadline
+
+                    for _future in sorted(_done, key=_futures.get):
+                        yield _future.result()
+
+                for _future in sorted(_pending, key=_futures.get):
+                    yield _expired(_future)
+        finally:
+            for _future in _futures:
+                _future.cancel()
+            _executor.shutdown(wait=False, cancel_futures=True)
+
+    return _results()
@@ -0,0 +1,241 @@
+import logging
+import os
+import time
+
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Literal
+
+from .serialization import Serializer
+from .sql import has_pagination
+
+if TYPE_CHECKING:
+    from .api import BillingPlatform
+
+
+class PageError(Exception):
+    """A page that failed to fetch, decode or transform, with the offset it was requested at."""
+    def __init__(self, offset: int, stage: Literal['fetch', 'decode'], cause: BaseException):
+        self.offset: int = offset
+        self.stage: Literal['fetch', 'decode'] = stage
+        self.cause: BaseException = cause
+        super().__init__(f'Page at offset {offset} failed to {stage}: {cause}')
+
+    def __reduce__(self):
+        return (self.__class__, (self.offset, self.stage, self.cause))
+
+
+@dataclass
+class PageResult:
+    """The outcome of one page. A failed page carries a PageError instead of a result."""
+    offset: int
+    result: Any = None # The transformed rows (the rows themselves without a transform)
+    rows: int = 0 # Number of rows on the page
+    exception: PageError | None = None
+    elapsed: float = 0.0 # Seconds from the start of the fetch to the end of the decode
+
+    @property
+    def ok(self) -> bool:
+        """Whether the page was fetched, decoded and transformed without an error."""
+        return self.exception is None
+
+
+def decode_page(content: bytes, serializer: type[Serializer], transform: Callable[[list[dict]], Any] | None) -> tuple[int, Any]:
+    """
+    Decode the body of a query response and apply the transform to its rows. Runs in a worker process.
+
+    :param content: The raw response body.
+    :param serializer: The Serializer class to decode the body with.
+    :param transform: Optional function applied to the list of rows.
+    :return: The number of rows and the transformed rows.
+    """
+    _rows: list[dict] = serializer().loads(content).get('queryResponse', [])
+
+    return len(_rows), transform(_rows) if transform is not None else _rows
+
+
+def _fetch_page(client: 'BillingPlatform', url: str) -> bytes | None:
+    """
+    Fetch the raw body of a query page. Runs in an I/O thread.
+
+    :return: The response body, or None if the page has no rows.
+    """
+    _response = client._send('GET', url)
+
+    if _response.status_code == 404:
+        return None  # No more records to fetch
+    elif _response.status_code != 200:
+        client._response_handler(_response)  # Raises the matching exception
+
+    return _response.content
+
+
+def process_pages(client: 'BillingPlatform',
+                  sql: str,
+                  transform: Callable[[list[dict]], Any] | None = None,
+                  page_size: int = 1000,
+                  offset: int = 0,
+                  io_workers: int = 4,
+                  processes: int | None = None,
+                  ordered: bool = True,
+                  max_pending: int | None = None,
+                  executor: Executor | None = None,
+                  raise_errors: bool = True) -> Iterator[PageResult]:
+    """
+    Page through a SQL query with I/O threads fetching the raw pages and a process pool decoding and transforming them,
+    so CPU-bound work on the rows runs in parallel outside the GIL (as a generator).
+
+    A fetched page is handed to the process pool as soon as it arrives. At most max_pending pages are fetched ahead of
+    the consumer, so a slow consumer stops new fetches rather than letting pages pile up in memory. Paging ends at the
+    first page without rows, after a short page, or after a page that could not be fetched.
+
+    :param client: The BillingPlatform client to fetch the pages with.
+    :param sql: The SQL query to execute. It must not contain OFFSET, FETCH or LIMIT clauses.
+    :param transform: Optional function applied to the rows of each page in a worker process (ex. mapping them to a warehouse schema). It must be picklable (a module-level function).
+    :param page_size: The number of rows to request per page (default is 1000).
+    :param offset: The number of rows to skip before starting to return rows (default is 0).
+    :param io_workers: The number of pages fetched at the same time (default is 4).
+    :param processes: The number of worker processes (default is None, which uses the number of CPUs). Ignored when an executor is given.
+    :param ordered: Whether to yield pages in offset order (default is True) or as they are decoded.
+    :param max_pending: The maximum number of pages fetched, decoded or waiting to be yielded at a time (default is twice io_workers plus the number of processes).
+    :param executor: Optional executor to decode pages with (ex. a ProcessPoolExecutor shared between calls). It is not shut down.
+    :param raise_errors: Whether to raise the PageError of a failed page (default is True) or yield it as a PageResult.
+    :return: A generator that yields one PageResult per page.
+    :raises ValueError: If the SQL query contains pagination clauses.
+    :raises PageError: If a page fails and raise_errors is True.
+    """
+    if has_pagination(sql):
+        raise ValueError('Pipelined page queries cannot contain OFFSET, FETCH or LIMIT clauses.')
+
+    if page_size > 10000:
+        logging.warning('BillingPlatform API has a limit of 10,000 records per page. Setting page_size to 10,000.')
+    _limit: int = min(page_size, 10000)
+
+    _io_workers: int = max(io_workers, 1)
+    _max_pending: int = max(max_pending or 2 * _io_workers + (processes or os.cpu_count() or 1), 1)
+    _serializer: type[Serializer] = type(client.serializer)
+    _decoder: Executor = executor if executor is not None else ProcessPoolExecutor(max_workers=processes)
+    _fetcher: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=_io_workers)
+
+    def _decoded(_decoding: Future, _offset: int, _page: Future) -> None:
+        if _decoding.cancelled():
+            _page.cancel()
+            _page.set_running_or_notify_cancel()  # Wakes up wait(), which cancel() alone does not
+        elif _decoding.exception() is not None:
+            _page.set_exception(PageError(_offset, 'decode', _decoding.exception()))
+        else:
+            _page.set_result(_decoding.result())
+
+    def _fetched(_fetch: Future, _offset: int, _page: Future) -> None:
+        # Runs in the I/O thread, so the page goes to the process pool without waiting for the consumer
+        if _fetch.cancelled():
+            _page.cancel()
+            _page.set_running_or_notify_cancel()  # Wakes up wait(), which cancel() alone does not
+        elif _fetch.exception() is not None:
+            _page.set_exception(PageError(_offset, 'fetch', _fetch.exception()))
+        elif _fetch.result() is None:
+            _page.set_result(None)
+        else:
+            try:
+                _decoding: Future = _decoder.submit(decode_page, _fetch.result(), _serializer, transform)
+            except RuntimeError as e:
+                _page.set_exception(PageError(_offset, 'decode', e))  # The pool was shut down
+                return
+
+            _decoding.add_done_callback(lambda _future: _decoded(_future, _offset, _page))
+
+    _pages: dict[Future, int] = {}
+    _fetches: dict[int, Future] = {}
+    _started: dict[int, float] = {}
+    _ready: dict[int, PageResult] = {}
+    _next_offset: int = offset
+    _next_yield: int = offset
+    _end: int | None = None # Offset past the last page, once known
+
+    def _schedule() -> None:
+        nonlocal _next_offset
+
+        # The fetcher runs io_workers fetches at a time; the rest of the window waits in its queue
+        while (_end is None or _next_offset < _end) and len(_pages) + len(_ready) < _max_pending:
+            _url: str = client._query_url(sql, _next_offset, _limit)
+            logging.debug('Query URL: %s', _url)
+            _page: Future = Future() # Resolved with the decoded page, None past the last page, or a PageError
+            _fetch: Future = _fetcher.submit(_fetch_page, client, _url)
+            _fetch.add_done_callback(lambda _future, _offset=_next_offset, _page=_page: _fetched(_future, _offset, _page))
+            _pages[_page] = _next_offset
+            _fetches[_next_offset] = _fetch
+            _started[_next_offset] = time.perf_counter()
+            _next_offset += _limit
+
+    def _results() -> Iterator[PageResult]:
+        nonlocal _end, _next_yield
+
+        try:
+            if isinstance(_decoder, ProcessPoolExecutor):
+                # Start the worker processes from this thread before any I/O thread runs. A pool started from a fetch
+                # callback would fork while the other threads hold locks (ex. of the logging module or the connection pool).
+                _decoder.submit(os.getpid).result()
+
+            while True:
+                _schedule()
+
+                if not _pages:
+                    break
+
+                _done, _ = wait(_pages, return_when=FIRST_COMPLETED)
+
+                for _page in _done:
+                    _offset: int = _pages.pop(_page)
+                    _elapsed: float = time.perf_counter() - _started.pop(_offset)
+                    _fetches.pop(_offset, None)
+
+                    if _page.cancelled():
+                        continue  # Queued past the last page
+                    elif _page.exception() is not None:
+                        logging.warning('%s', _page.exception())
+                        _ready[_offset] = PageResult(_offset, exception=_page.exception(), elapsed=_elapsed)
+
+                        if _page.exception().stage == 'fetch':
+                            # Whether more rows follow is unknown, so paging stops after a page that could not be fetched
+                            _end = _offset + _limit if _end is None else min(_end, _offset + _limit)
+                    elif _page.result() is None:
+                        _end = _offset if _end is None else min(_end, _offset)  # No more records to fetch
+                    else:
+                        _rows, _result = _page.result()
+                        _ready[_offset] = PageResult(_offset, _result, _rows, elapsed=_elapsed)
+
+                        if _rows < _limit:
+                            # A short page is the last page
+                            _end = _offset + _limit if _end is None else min(_end, _offset + _limit)
+
+                if _end is not None:
+                    # Fetches queued past the last page are cancelled, and pages fetched past it are dropped
+                    for _offset in [_offset for _offset in _fetches if _offset >= _end]:
+                        _fetches[_offset].cancel()
+
+                    for _offset in [_offset for _offset in _ready if _offset >= _end]:
+                        del _ready[_offset]
+
+                if ordered:
+                    _offsets: list[int] = []
+
+                    while _next_yield in _ready:
+                        _offsets.append(_next_yield)
+                        _next_yield += _limit
+                else:
+                    _offsets = sorted(_ready)
+
+                for _offset in _offsets:
+                    _page_result: PageResult = _ready.pop(_offset)
+
+                    if _page_result.exception is not None and raise_errors:
+                        raise _page_result.exception
+
+                    yield _page_result
+        finally:
+            _fetcher.shutdown(wait=False, cancel_futures=True)
+
+            if executor is None:
+                _decoder.shutdown(wait=True, cancel_futures=True)
+
+    return _results()
@@ -0,0 +1,228 @@
+import random
+import threading
+import time
+
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parse a Retry-After header value into a number of seconds.
+
+    :param value: The header value, either a number of seconds or an HTTP date.
+    :return: The number of seconds to wait, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class RetryPolicy:
+    """
+    When and how long to wait before retrying a request.
+
+    Idempotent GET requests are retried on connection errors and on the statuses in `retry_statuses`.
+    Writes (POST, PUT, PATCH and DELETE) are only retried when `retry_writes` is enabled.
+    """
+    max_retries: int = 3
+    backoff_factor: float = 0.5 # Seconds; the backoff ceiling doubles with each attempt
+    max_backoff: float = 30.0
+    retry_statuses: tuple[int, ...] = (429, 500, 502, 503, 504)
+    retry_writes: bool = False
+
+    def is_retryable(self, method: str) -> bool:
+        """
+        Whether requests with the given HTTP method may be retried.
+
+        :param method: The HTTP method of the request.
+        :return: True if the request may be retried.
+        """
+        return method.upper() in ('GET', 'HEAD', 'OPTIONS') or self.retry_writes
+
+    def backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        """
+        Calculate the delay before the next attempt using exponential backoff with full jitter.
+        A Retry-After value from the server takes precedence; a little jitter is added so clients do not retry in lockstep.
+
+        :param attempt: The number of attempts already retried (starting at 0).
+        :param retry_after: The Retry-After delay requested by the server, in seconds (optional).
+        :return: The number of seconds to wait.
+        """
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff) + random.uniform(0, self.backoff_factor)
+
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * (2 ** attempt)))
+
+
+class RateLimiter:
+    """
+    Client-wide token bucket rate limiter with AIMD (additive increase, multiplicative decrease) adaptive concurrency.
+
+    Each request takes a token from the bucket and a concurrency slot. When the server throttles a request
+    (a status in `backoff_statuses`), the request rate and the concurrency limit are cut by `decrease_factor`
+    and every caller waits out the Retry-After delay. Each healthy response grows them back additively, up to
+    the configured maximums. The limiter is thread safe and is meant to be shared by all threads of a client.
+    """
+    def __init__(self,
+                 rate: float = 10.0,
+                 burst: int | None = None,
+                 max_concurrency: int = 16,
+                 min_rate: float = 0.5,
+                 min_concurrency: int = 1,
+                 max_rate: float | None = None,
+                 decrease_factor: float = 0.5,
+                 rate_increase: float = 1.0,
+                 concurrency_increase: float = 1.0,
+                 backoff_statuses: tuple[int, ...] = (429, 503),
+                 cooldown: float = 1.0):
+        """
+        Initialize the rate limiter.
+
+        :param rate: The starting number of requests per second.
+        :param burst: The token bucket size, i.e. how many requests may be sent back to back (default is the rate, rounded up).
+        :param max_concurrency: The starting and maximum number of requests in flight at the same time.
+        :param min_rate: The lowest request rate the limiter will back off to.
+        :param min_concurrency: The lowest concurrency limit the limiter will back off to.
+        :param max_rate: The highest request rate the limiter will recover to (default is the starting rate).
+        :param decrease_factor: The factor the rate and concurrency are multiplied by when the server throttles a request.
+        :param rate_increase: How many requests per second the rate grows by per second of healthy traffic.
+        :param concurrency_increase: How much the concurrency limit grows by per concurrency limit's worth of healthy responses.
+        :param backoff_statuses: Response statuses that are treated as throttling.
+        :param cooldown: Minimum seconds between two decreases, so a burst of throttled responses only counts once.
+        """
+        self.max_rate: float = max_rate if max_rate is not None else rate
+        self.min_rate: float = min_rate
+        self.max_concurrency: int = max_concurrency
+        self.min_concurrency: int = min_concurrency
+        self.burst: float = float(burst if burst is not None else max(int(rate + 0.999), 1))
+        self.decrease_factor: float = decrease_factor
+        self.rate_increase: float = rate_increase
+        self.concurrency_increase: float = concurrency_increase
+        self.backoff_statuses: tuple[int, ...] = backoff_statuses
+        self.cooldown: float = cooldown
+
+        self._rate: float = rate
+        self._concurrency: float = float(max_concurrency)
+        self._tokens: float = self.burst
+        self._last_refill: float = time.monotonic()
+        self._last_decrease: float = 0.0
+        self._blocked_until: float = 0.0
+        self._in_flight: int = 0
+        self._waiting: int = 0
+        self._throttled: int = 0
+        self._condition: threading.Condition = threading.Condition()
+
+
+    @property
+    def rate(self) -> float:
+        """The current number of requests per second allowed."""
+        return self._rate
+
+    @property
+    def concurrency_limit(self) -> int:
+        """The current number of requests allowed in flight at the same time."""
+        return int(self._concurrency)
+
+    @property
+    def in_flight(self) -> int:
+        """The number of requests currently in flight."""
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        """The number of callers waiting for permission to send a request."""
+        return self._waiting
+
+
+    def stats(self) -> dict:
+        """
+        Return a snapshot of the limiter's state for monitoring.
+
+        :return: A dictionary with the current rate, concurrency limit, in flight requests, queue depth, throttled count and remaining backoff.
+        """
+        with self._condition:
+            return {
+                'rate': self._rate,
+                'concurrency_limit': int(self._concurrency),
+                'in_flight': self._in_flight,
+                'queue_depth': self._waiting,
+                'throttled': self._throttled,
+                'backoff_remaining': max(self._blocked_until - time.monotonic(), 0.0),
+            }
+
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self._rate)
+        self._last_refill = now
+
+
+    def acquire(self) -> None:
+        """
+        Block until a request may be sent, then take a token and a concurrency slot. Every acquire must be paired with a release.
+
+        :return: None
+        """
+        with self._condition:
+            self._waiting += 1
+
+            try:
+                while True:
+                    _now: float = time.monotonic()
+                    self._refill(_now)
+
+                    if _now < self._blocked_until:
+                        _wait: float | None = self._blocked_until - _now
+                    elif self._in_flight >= int(self._concurrency):
+                        _wait = None  # Woken by release()
+                    elif self._tokens < 1:
+                        _wait = (1 - self._tokens) / self._rate
+                    else:
+                        self._tokens -= 1
+                        self._in_flight += 1
+                        return
+
+                    self._condition.wait(_wait)
+            finally:
+                self._waiting -= 1
+
+
+    def release(self, status_code: int | None = None, retry_after: float | None = None) -> None:
+        """
+        Return a concurrency slot and adapt the rate to the outcome of the request.
+
+        :param status_code: The response status, or None if the request did not get a response.
+        :param retry_after: The Retry-After delay requested by the server, in seconds (optional).
+        :return: None
+        """
+        with self._condition:
+            self._in_flight = max(self._in_flight - 1, 0)
+            _now: float = time.monotonic()
+
+            if status_code in self.backoff_statuses:
+                self._throttled += 1
+
+                if _now - self._last_decrease >= self.cooldown:
+                    self._rate = max(self.min_rate, self._rate * self.decrease_factor)
+                    self._concurrency = max(float(self.min_concurrency), self._concurrency * self.decrease_factor)
+                    self._tokens = min(self._tokens, 0.0)
+                    self._last_decrease = _now
+
+                if retry_after:
+                    self._blocked_until = max(self._blocked_until, _now + retry_after)
+            elif status_code is not None and status_code < 500:
+                # Additive increase: roughly +rate_increase per second and +concurrency_increase per window of healthy responses
+                self._rate = min(self.max_rate, self._rate + self.rate_increase / max(self._rate, 1.0))
+                self._concurrency = min(float(self.max_concurrency), self._concurrency + self.concurrency_increase / self._concurrency)
+
+            self._condition.notify_all()
@@ -0,0 +1,220 @@
+import dataclasses
+import json
+
+from .models import Record, convert_response
+from typing import Literal
+
+try:
+    import orjson
+except ImportError: # Optional dependency (pip install billingplatform[fast_json])
+    orjson = None
+
+try:
+    import msgspec
+except ImportError: # Optional dependency (pip install billingplatform[fast_json])
+    msgspec = None
+
+
+def _default(obj: object) -> object:
+    """
+    Encode the typed records the standard library and orjson do not handle natively.
+    """
+    if isinstance(obj, Record):
+        return obj.to_dict(raw=True)
+
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+
+    if msgspec is not None and isinstance(obj, msgspec.Struct):
+        return msgspec.structs.asdict(obj)
+
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+def _is_record(record_type: type) -> bool:
+    return isinstance(record_type, type) and issubclass(record_type, Record)
+
+
+def _is_struct(record_type: type) -> bool:
+    return msgspec is not None and isinstance(record_type, type) and issubclass(record_type, msgspec.Struct)
+
+
+def get_id(record: object) -> object | None:
+    """
+    Return the 'Id' of a record, whether it was decoded as a dictionary or as a typed record.
+
+    :param record: The record.
+    :return: The 'Id' value, or None if the record has none.
+    """
+    if isinstance(record, dict):
+        return record.get('Id')
+
+    return getattr(record, 'Id', None)
+
+
+class Serializer:
+    """
+    Encodes request bodies and decodes response bodies with the standard library json module.
+    Subclasses use faster JSON libraries; see get_serializer().
+
+    Records of the entities in `entity_types` are decoded into their type (a Record type from billingplatform.models,
+    a dataclass or a msgspec Struct) instead of dictionaries. Fields missing from the type are ignored; fields missing from the response must have defaults
+    in the type.
+    """
+    name: str = 'json'
+
+    def __init__(self, entity_types: dict[str, type] | None = None):
+        """
+        :param entity_types: Optional record types keyed by entity, for query and retrieve responses (ex. {'ACCOUNT': Account}).
+        :raises TypeError: If a record type is not a Record type, a dataclass or a msgspec Struct.
+        """
+        self.entity_types: dict[str, type] = {_entity.upper(): _type for _entity, _type in (entity_types or {}).items()}
+
+        for _type in self.entity_types.values():
+            if not _is_record(_type) and not dataclasses.is_dataclass(_type) and not _is_struct(_type):
+                raise TypeError(f'Record types must be Record types, dataclasses or msgspec Structs, not {_type!r}.')
+
+    def dumps(self, obj: object) -> bytes:
+        """
+        Encode an object as compact UTF-8 JSON.
+
+        :param obj: The object to encode.
+        :return: The JSON bytes.
+        """
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False, allow_nan=False, default=_default).encode('utf-8')
+
+    def loads(self, data: bytes | str) -> object:
+        """
+        Decode JSON, directly from the raw bytes of a response body.
+
+        :param data: The JSON bytes or text.
+        :return: The decoded object.
+        """
+        return json.loads(data)
+
+    def record_type(self, entity: str | None) -> type | None:
+        """
+        Return the record type registered for an entity, if any.
+
+        :param entity: The entity name (case-insensitive), or None.
+        :return: The record type, or None to decode records as dictionaries.
+        """
+        return self.entity_types.get(entity.upper()) if entity and self.entity_types else None
+
+    def loads_response(self, data: bytes | str, entity: str | None = None) -> dict:
+        """
+        Decode a response body, decoding the records into the record type of the entity if one is registered.
+
+        :param data: The response body.
+        :param entity: The entity the response was read from (optional).
+        :return: The response data, ex. {'queryResponse': [...]}.
+        """
+        _record_type: type | None = self.record_type(entity)
+
+        if _record_type is None:
+            return self.loads(data)
+
+        return self._loads_records(data, _record_type)
+
+    def _loads_records(self, data: bytes | str, record_type: type) -> dict:
+        if _is_record(record_type):
+            return convert_response(self.loads(data), record_type)
+
+        if _is_struct(record_type):
+            return msgspec.convert(self.loads(data), dict[str, list[record_type] | record_type])
+
+        _fields: set[str] = {_field.name for _field in dataclasses.fields(record_type)}
+
+        def _convert(_record: dict) -> object:
+            return record_type(**{_key: _value for _key, _value in _record.items() if _key in _fields})
+
+        _response: dict = self.loads(data)
+
+        for _key, _records in _response.items():
+            if isinstance(_records, list):
+                _response[_key] = [_convert(_record) for _record in _records]
+            elif isinstance(_records, dict):
+                _response[_key] = _convert(_records)
+
+        return _response
+
+
+class OrjsonSerializer(Serializer):
+    """
+    Encodes and decodes JSON with orjson.
+    """
+    name: str = 'orjson'
+
+    def __init__(self, entity_types: dict[str, type] | None = None):
+        if orjson is None:
+            raise ImportError("The orjson serializer requires the 'orjson' package. Install it with: pip install billingplatform[fast_json]")
+
+        super().__init__(entity_types)
+
+    def dumps(self, obj: object) -> bytes:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+    def loads(self, data: bytes | str) -> object:
+        return orjson.loads(data)
+
+
+class MsgspecSerializer(Serializer):
+    """
+    Encodes and decodes JSON with msgspec, decoding typed records straight from the response bytes.
+    """
+    name: str = 'msgspec'
+
+    def __init__(self, entity_types: dict[str, type] | None = None):
+        if msgspec is None:
+            raise ImportError("The msgspec serializer requires the 'msgspec' package. Install it with: pip install billingplatform[fast_json]")
+
+        super().__init__(entity_types)
+        self._encoder: 'msgspec.json.Encoder' = msgspec.json.Encoder(enc_hook=_default)
+        self._decoder: 'msgspec.json.Decoder' = msgspec.json.Decoder()
+        self._record_decoders: dict[type, 'msgspec.json.Decoder'] = {
+            _type: msgspec.json.Decoder(dict[str, list[_type] | _type]) for _type in set(self.entity_types.values()) if not _is_record(_type)
+        }
+
+    def dumps(self, obj: object) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads(self, data: bytes | str) -> object:
+        return self._decoder.decode(data)
+
+    def _loads_records(self, data: bytes | str, record_type: type) -> dict:
+        if record_type not in self._record_decoders:
+            return super()._loads_records(data, record_type) # Record types are built from the decoded rows
+
+        return self._record_decoders[record_type].decode(data)
+
+
+_BACKENDS: dict[str, type[Serializer]] = {
+    'json': Serializer,
+    'orjson': OrjsonSerializer,
+    'msgspec': MsgspecSerializer,
+}
+
+
+def get_serializer(backend: Literal['auto', 'orjson', 'msgspec', 'json'] = 'auto',
+                   entity_types: dict[str, type] | None = None) -> Serializer:
+    """
+    Create a serializer for request and response bodies.
+
+    'auto' picks the fastest installed backend: msgspec when typed records are requested (it decodes them without
+    building intermediate dictionaries), otherwise orjson, then msgspec, then the standard library.
+
+    :param backend: 'auto', 'orjson', 'msgspec' or 'json' (default is 'auto').
+    :param entity_types: Optional record types keyed by entity, for query and retrieve responses.
+    :return: A Serializer instance.
+    :raises ValueError: If the backend is not supported.
+    :raises ImportError: If the requested backend is not installed.
+    """
+    if backend == 'auto':
+        _preferred: tuple[str, ...] = ('msgspec', 'orjson') if entity_types else ('orjson', 'msgspec')
+        _installed: dict[str, object] = {'orjson': orjson, 'msgspec': msgspec}
+        backend = next((_name for _name in _preferred if _installed[_name] is not None), 'json')
+
+    if backend not in _BACKENDS:
+        raise ValueError(f"Unsupported serializer backend '{backend}'. Use 'auto', 'orjson', 'msgspec' or 'json'.")
+
+    return _BACKENDS[backend](entity_types)
@@ -0,0 +1,347 @@
+import re
+
+from typing import Literal
+
+
+# Top-level clause keywords recognised by the scanner, in the order they may appear in a statement.
+_CLAUSE_KEYWORDS: tuple[str, ...] = (
+    'SELECT',
+    'FROM',
+    'WHERE',
+    'GROUP BY',
+    'HAVING',
+    'ORDER BY',
+    'OFFSET',
+    'FETCH',
+    'LIMIT',
+)
+
+_WORD_PATTERN: re.Pattern = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+_BY_PATTERN: re.Pattern = re.compile(r'\s+BY\b', re.IGNORECASE)
+_KEYWORD_PATTERN: re.Pattern = re.compile(
+    r'\b(SELECT|FROM|WHERE|AND|OR|NOT|IN|IS|NULL|LIKE|BETWEEN|JOIN|INNER|LEFT|RIGHT|OUTER|ON|AS|GROUP BY|HAVING|ORDER BY|ASC|DESC|OFFSET|FETCH|NEXT|ROWS|ROW|ONLY|LIMIT|DISTINCT)\b',
+    re.IGNORECASE
+)
+_TABLE_PATTERN: re.Pattern = re.compile(r'\b(?:FROM|JOIN)\s+([A-Za-z_][A-Za-z0-9_.]*)', re.IGNORECASE)
+_ID_COLUMN_PATTERN: re.Pattern = re.compile(r'(?:[A-Za-z_][A-Za-z0-9_]*\.)?(?:Id|\*)', re.IGNORECASE)
+_ID_ORDER_PATTERN: re.Pattern = re.compile(r'(?:[A-Za-z_][A-Za-z0-9_]*\.)?Id(?:\s+ASC)?', re.IGNORECASE)
+
+
+def _skip_quoted(sql: str, start: int, quote_char: str) -> int:
+    """
+    Return the index just past the quoted literal or identifier starting at `start`.
+    Doubled quote characters inside the literal (ex. 'O''Brien') are treated as escapes.
+
+    :param sql: The SQL statement being scanned.
+    :param start: Index of the opening quote character.
+    :param quote_char: The quote character that opened the literal.
+    :return: The index of the first character after the closing quote.
+    """
+    _index: int = start + 1
+
+    while _index < len(sql):
+        if sql[_index] == quote_char:
+            if _index + 1 < len(sql) and sql[_index + 1] == quote_char:
+                _index += 2
+                continue
+            return _index + 1
+        _index += 1
+
+    return len(sql)
+
+
+def clause_positions(sql: str) -> list[tuple[str, int, int]]:
+    """
+    Locate the top-level clause keywords of a SQL statement.
+    String literals, quoted identifiers, comments and parenthesised sub-expressions (ex. subqueries) are skipped,
+    so keywords that only appear inside them are never reported.
+
+    :param sql: The SQL statement to scan.
+    :return: A list of (keyword, start, end) tuples in statement order. Two word keywords are normalised to a single space (ex. 'ORDER BY').
+    """
+    _positions: list[tuple[str, int, int]] = []
+    _depth: int = 0
+    _index: int = 0
+
+    while _index < len(sql):
+        _char: str = sql[_index]
+
+        if _char in ('\'', '"'):
+            _index = _skip_quoted(sql, _index, _char)
+            continue
+        if sql.startswith('--', _index):
+            _newline: int = sql.find('\n', _index)
+            _index = len(sql) if _newline == -1 else _newline + 1
+            continue
+        if sql.startswith('/*', _index):
+            _comment_end: int = sql.find('*/', _index + 2)
+            _index = len(sql) if _comment_end == -1 else _comment_end + 2
+            continue
+        if _char == '(':
+            _depth += 1
+        elif _char == ')':
+            _depth = max(_depth - 1, 0)
+        elif _char.isalpha() or _char == '_':
+            _match: re.Match = _WORD_PATTERN.match(sql, _index)
+            _word: str = _match.group(0).upper()
+            _end: int = _match.end()
+
+            if _depth == 0 and (_index == 0 or not (sql[_index - 1].isalnum() or sql[_index - 1] in ('_', '.'))):
+                if _word in ('GROUP', 'ORDER'):
+                    _by_match: re.Match | None = _BY_PATTERN.match(sql, _end)
+                    if _by_match:
+                        _positions.append((f'{_word} BY', _index, _by_match.end()))
+                        _end = _by_match.end()
+                elif _word in _CLAUSE_KEYWORDS:
+                    _positions.append((_word, _index, _end))
+
+            _index = _end
+            continue
+
+        _index += 1
+
+    return _positions
+
+
+def has_pagination(sql: str) -> bool:
+    """
+    Check whether a SQL statement has top-level pagination clauses (OFFSET, FETCH or LIMIT).
+    Keywords inside literals, identifiers (ex. OffsetDays) and subqueries do not count.
+
+    :param sql: The SQL statement to scan.
+    :return: True if the statement already paginates its rows.
+    """
+    return any(_keyword in ('OFFSET', 'FETCH', 'LIMIT') for _keyword, _, _ in clause_positions(sql))
+
+
+def _split_top_level(text: str) -> list[str]:
+    """
+    Split a comma separated list (ex. a select list), ignoring commas inside literals and parentheses.
+
+    :param text: The text to split.
+    :return: The stripped items.
+    """
+    _items: list[str] = []
+    _depth: int = 0
+    _start: int = 0
+    _index: int = 0
+
+    while _index < len(text):
+        _char: str = text[_index]
+
+        if _char in ('\'', '"'):
+            _index = _skip_quoted(text, _index, _char)
+            continue
+        if _char == '(':
+            _depth += 1
+        elif _char == ')':
+            _depth = max(_depth - 1, 0)
+        elif _char == ',' and _depth == 0:
+            _items.append(text[_start:_index].strip())
+            _start = _index + 1
+
+        _index += 1
+
+    _items.append(text[_start:].strip())
+
+    return [_item for _item in _items if _item]
+
+
+def keyset_eligible(sql: str) -> bool:
+    """
+    Check whether the pages of a SQL statement can be requested with keyset predicates ('Id > <last Id>' ordered by Id)
+    instead of OFFSET. The statement must read a single table without joins or subqueries, select the Id column (or *),
+    have no DISTINCT, GROUP BY, HAVING or pagination clauses, and be unordered or ordered by Id ascending.
+
+    :param sql: The SQL statement to check.
+    :return: True if keyset pagination returns the same rows as OFFSET pagination ordered by Id.
+    """
+    _positions: list[tuple[str, int, int]] = clause_positions(sql)
+    _keywords: list[str] = [_keyword for _keyword, _, _ in _positions]
+
+    if _keywords.count('SELECT') != 1 or _keywords.count('FROM') != 1 or \
+            any(_keyword in ('GROUP BY', 'HAVING', 'OFFSET', 'FETCH', 'LIMIT') for _keyword in _keywords):
+        return False
+
+    _code: str = ' '.join(_text for _text, _is_literal in _split_literals(sql) if not _is_literal)
+
+    if len(_TABLE_PATTERN.findall(_code)) != 1:
+        return False  # Joins and subqueries
+
+    _select: tuple[str, int, int] = next(p for p in _positions if p[0] == 'SELECT')
+    _from: tuple[str, int, int] = next(p for p in _positions if p[0] == 'FROM')
+    _columns: list[str] = _split_top_level(sql[_select[2]:_from[1]])
+
+    if not _columns or _columns[0].upper().startswith('DISTINCT') or not any(_ID_COLUMN_PATTERN.fullmatch(_column) for _column in _columns):
+        return False
+
+    _order_by: tuple[str, int, int] | None = next((p for p in _positions if p[0] == 'ORDER BY'), None)
+
+    return _order_by is None or _ID_ORDER_PATTERN.fullmatch(sql[_order_by[2]:].strip()) is not None
+
+
+def remove_order_by(sql: str) -> str:
+    """
+    Remove the top-level ORDER BY clause of a SQL statement, if any, along with everything after it.
+
+    :param sql: The SQL statement.
+    :return: The SQL statement without its ORDER BY clause.
+    """
+    _order_by: tuple[int, int] | None = find_clause(sql, 'ORDER BY')
+
+    return sql if _order_by is None else sql[:_order_by[0]].rstrip()
+
+
+def find_clause(sql: str, keyword: str) -> tuple[int, int] | None:
+    """
+    Find the first top-level occurrence of a clause keyword.
+
+    :param sql: The SQL statement to scan.
+    :param keyword: The clause keyword to find (ex. 'WHERE' or 'ORDER BY').
+    :return: The (start, end) index of the keyword, or None if the clause is not present.
+    """
+    for _keyword, _start, _end in clause_positions(sql):
+        if _keyword == keyword.upper():
+            return _start, _end
+
+    return None
+
+
+def add_predicate(sql: str, predicate: str) -> str:
+    """
+    AND a predicate into the top-level WHERE clause of a SQL statement, creating the clause if needed.
+    The original conditions are parenthesised so that OR expressions keep their meaning.
+
+    :param sql: The SQL statement to filter.
+    :param predicate: The predicate to add (ex. 'Id > 100').
+    :return: The SQL statement with the predicate applied.
+    """
+    _positions: list[tuple[str, int, int]] = clause_positions(sql)
+    _tail_keywords: tuple[str, ...] = ('GROUP BY', 'HAVING', 'ORDER BY', 'OFFSET', 'FETCH', 'LIMIT')
+    _where: tuple[str, int, int] | None = next((p for p in _positions if p[0] == 'WHERE'), None)
+    _tail: tuple[str, int, int] | None = next((p for p in _positions if p[0] in _tail_keywords), None)
+    _tail_start: int = _tail[1] if _tail else len(sql)
+    _head: str = sql[:_tail_start].rstrip()
+    _rest: str = sql[_tail_start:]
+
+    if _where:
+        _conditions: str = sql[_where[2]:_tail_start].strip()
+        _head = f'{sql[:_where[2]]} ({_conditions}) AND {predicate}'
+    else:
+        _head = f'{_head} WHERE {predicate}'
+
+    return f'{_head} {_rest}'.rstrip()
+
+
+def set_order_by(sql: str, order_by: str) -> str:
+    """
+    Add an ORDER BY clause to a SQL statement that does not already have one.
+
+    :param sql: The SQL statement to order.
+    :param order_by: The ordering expression (ex. 'Id ASC').
+    :return: The SQL statement with the ORDER BY clause applied.
+    :raises ValueError: If the statement already has a top-level ORDER BY clause.
+    """
+    _positions: list[tuple[str, int, int]] = clause_positions(sql)
+
+    if any(p[0] == 'ORDER BY' for p in _positions):
+        raise ValueError('SQL statement already contains an ORDER BY clause.')
+
+    _tail: tuple[str, int, int] | None = next((p for p in _positions if p[0] in ('OFFSET', 'FETCH', 'LIMIT')), None)
+    _tail_start: int = _tail[1] if _tail else len(sql)
+
+    return f'{sql[:_tail_start].rstrip()} ORDER BY {order_by} {sql[_tail_start:]}'.rstrip()
+
+
+def use_keyset(sql: str, keyset: bool | Literal['auto'] = 'auto') -> bool:
+    """
+    Decide whether to page a SQL statement with keyset predicates rather than OFFSET.
+
+    :param sql: The SQL statement to page.
+    :param keyset: 'auto' to use keyset pagination when the statement allows it, True to require it, or False to never use it (default is 'auto').
+    :return: True if the statement should be paged with keyset predicates.
+    :raises ValueError: If keyset is True and the statement cannot be paged with keyset predicates.
+    """
+    if keyset is False:
+        return False
+
+    _eligible: bool = keyset_eligible(sql)
+
+    if keyset is True and not _eligible:
+        raise ValueError('Keyset pagination requires a single-table query that selects the Id column, '
+                         'without DISTINCT, GROUP BY, HAVING, pagination clauses or an ORDER BY other than Id.')
+
+    return _eligible
+
+
+def keyset_page_sql(sql: str, last_id: object | None = None, upper_id: object | None = None) -> str:
+    """
+    Build the SQL statement of a keyset page: the rows after the last Id seen, up to an optional upper Id, ordered by Id.
+
+    :param sql: The SQL statement being paged. Its ORDER BY clause, if any, is replaced.
+    :param last_id: The Id of the last row of the previous page, or None for the first page.
+    :param upper_id: The highest Id to return, or None for no upper bound.
+    :return: The SQL statement of the page, without pagination clauses.
+    """
+    _predicates: list[str] = ([f'Id > {last_id}'] if last_id is not None else []) + ([f'Id <= {upper_id}'] if upper_id is not None else [])
+    _sql: str = remove_order_by(sql)
+
+    return set_order_by(add_predicate(_sql, ' AND '.join(_predicates)) if _predicates else _sql, 'Id ASC')
+
+
+def _split_literals(sql: str) -> list[tuple[str, bool]]:
+    """
+    Split a SQL statement into alternating code and quoted literal segments.
+
+    :param sql: The SQL statement to split.
+    :return: A list of (text, is_literal) tuples that join back into the original statement.
+    """
+    _segments: list[tuple[str, bool]] = []
+    _start: int = 0
+    _index: int = 0
+
+    while _index < len(sql):
+        if sql[_index] in ('\'', '"'):
+            _segments.append((sql[_start:_index], False))
+            _end: int = _skip_quoted(sql, _index, sql[_index])
+            _segments.append((sql[_index:_end], True))
+            _start = _index = _end
+            continue
+        _index += 1
+
+    _segments.append((sql[_start:], False))
+
+    return [_segment for _segment in _segments if _segment[0]]
+
+
+def normalize(sql: str) -> str:
+    """
+    Normalize a SQL statement for use as a lookup key: whitespace outside literals is collapsed and keywords are uppercased.
+    Literals are left untouched, so statements that differ only in layout or keyword case normalize to the same string.
+
+    :param sql: The SQL statement to normalize.
+    :return: The normalized SQL statement.
+    """
+    _parts: list[str] = []
+
+    for _text, _is_literal in _split_literals(sql.strip()):
+        if _is_literal:
+            _parts.append(_text)
+        else:
+            _text = re.sub(r'\s+', ' ', _text)
+            _parts.append(_KEYWORD_PATTERN.sub(lambda _match: _match.group(0).upper(), _text))
+
+    return ''.join(_parts)
+
+
+def referenced_tables(sql: str) -> set[str]:
+    """
+    Find the tables (entities) a SQL statement reads from, including tables in joins and subqueries.
+
+    :param sql: The SQL statement to scan.
+    :return: A set of uppercased table names.
+    """
+    _code: str = ' '.join(_text for _text, _is_literal in _split_literals(sql) if not _is_literal)
+
+    return {_match.group(1).upper() for _match in _TABLE_PATTERN.finditer(_code)}
+
@@ -0,0 +1,119 @@
+import codecs
+import json
+import re
+
+from collections import namedtuple
+from typing import Callable, Iterable, Iterator, Literal
+
+
+_DECODER: json.JSONDecoder = json.JSONDecoder()
+_WHITESPACE: str = ' \t\n\r'
+
+# Consumed text is trimmed from the buffer once it grows past this many characters
+_TRIM_THRESHOLD: int = 1 << 16
+
+
+def iter_json_array(chunks: Iterable[bytes], key: str | None) -> Iterator[object]:
+    """
+    Incrementally decode the elements of the JSON array stored under `key` in a streamed JSON object, or of a top-level JSON array if `key` is None (as a generator).
+    Only the current element and the unread part of the current chunk are held in memory, so memory use does not grow with the size of the array.
+
+    :param chunks: The raw response body as an iterable of byte chunks (ex. requests.Response.iter_content()).
+    :param key: The key of the array to decode (ex. 'queryResponse'), or None for a top-level array.
+    :return: A generator that yields each element of the array.
+    :raises ValueError: If the body ends before the array is complete.
+    """
+    _decoder: codecs.IncrementalDecoder = codecs.getincrementaldecoder('utf-8')()
+    _chunks: Iterator[bytes] = iter(chunks)
+    _buffer: str = ''
+    _position: int = 0
+    _in_array: bool = False
+    _exhausted: bool = False
+
+    def _read() -> bool:
+        nonlocal _buffer, _position, _exhausted
+
+        for _chunk in _chunks:
+            if _chunk:
+                if _position > _TRIM_THRESHOLD:
+                    _buffer = _buffer[_position:]
+                    _position = 0
+                _buffer += _decoder.decode(_chunk)
+                return True
+
+        if not _exhausted:
+            _buffer += _decoder.decode(b'', final=True)
+            _exhausted = True
+
+        return False
+
+    # Find the opening bracket of the array
+    _key_pattern: re.Pattern = re.compile(rf'"{re.escape(key)}"\s*:\s*(\S)' if key is not None else r'^\s*(\S)')
+
+    while not _in_array:
+        _match: re.Match | None = _key_pattern.search(_buffer, _position)
+
+        if _match:
+            if _match.group(1) != '[':
+                return  # The key holds something other than an array
+
+            _position = _match.end()
+            _in_array = True
+        elif not _read():
+            return  # The key is not in the response
+
+    while True:
+        # Skip separators between elements
+        while _position < len(_buffer) and (_buffer[_position] in _WHITESPACE or _buffer[_position] == ','):
+            _position += 1
+
+        if _position >= len(_buffer):
+            if not _read():
+                raise ValueError(f'Response ended before the "{key}" array was complete.')
+            continue
+
+        if _buffer[_position] == ']':
+            return
+
+        try:
+            _element, _end = _DECODER.raw_decode(_buffer, _position)
+        except json.JSONDecodeError:
+            if not _read():
+                raise
+            continue
+
+        # A complete element is always followed by ',' or ']'; otherwise a scalar (ex. a number) was cut off mid-chunk
+        _next: int = _end
+
+        while _next < len(_buffer) and _buffer[_next] in _WHITESPACE:
+            _next += 1
+
+        if (_next >= len(_buffer) or _buffer[_next] not in ',]') and not _exhausted:
+            _read()
+            continue
+
+        _position = _end
+        yield _element
+
+
+def row_converter(row_type: Literal['dict', 'tuple', 'namedtuple'],
+                  columns: Iterable[str]) -> Callable[[dict], object]:
+    """
+    Build a function that converts decoded row dictionaries into the requested row type.
+
+    :param row_type: 'dict' to keep rows as dictionaries, 'tuple' for plain tuples in column order, or 'namedtuple' for a compact named row type.
+    :param columns: The column names of the rows, in order.
+    :return: A function that converts one row.
+    :raises ValueError: If the row type is not supported.
+    """
+    _columns: tuple[str, ...] = tuple(columns)
+
+    if row_type == 'dict':
+        return lambda _row: _row
+    elif row_type == 'tuple':
+        return lambda _row: tuple(_row.get(_column) for _column in _columns)
+    elif row_type == 'namedtuple':
+        _row_class: type = namedtuple('Row', _columns, rename=True)
+        return lambda _row: _row_class._make(_row.get(_column) for _column in _columns)
+    else:
+        raise ValueError(f"Unsupported row type '{row_type}'. Use 'dict', 'tuple' or 'namedtuple'.")
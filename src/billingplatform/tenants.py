@@ -0,0 +1,212 @@
+import atexit
+import logging
+import threading
+import time
+
+from .api import BillingPlatform
+from .multi import Operation, OperationResult, to_operation
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable
+
+
+class BillingPlatformPool:
+    """
+    A set of BillingPlatform clients, one per tenant, addressed by a tenant key.
+
+    Clients are created, and so logged in, on first use, or all at once and concurrently with authenticate(). Every
+    client is built with the same shared settings (ex. pool_maxsize, timeout, retry_policy) and a single semaphore
+    that caps the requests in flight across all tenants. At exit, the clients that were created are logged out in
+    parallel.
+    """
+    def __init__(self,
+                 tenants: dict[str, dict],
+                 max_concurrency: int = 32,
+                 max_workers: int = 8,
+                 logout_at_exit: bool = True,
+                 **defaults):
+        """
+        :param tenants: The client arguments of each tenant by tenant key (ex. {'acme': {'base_url': ..., 'username': ..., 'password': ...}}).
+        :param max_concurrency: The maximum number of requests in flight across all tenants (default is 32).
+        :param max_workers: The maximum number of tenants logged in, logged out or called at the same time (default is 8).
+        :param logout_at_exit: Whether to log out of every created client at exit (default is True).
+        :param defaults: Client arguments shared by every tenant (ex. pool_maxsize, timeout). Tenant arguments take precedence.
+        """
+        self.tenants: dict[str, dict] = dict(tenants)
+        self.max_concurrency: int = max_concurrency
+        self.max_workers: int = max_workers
+        self.defaults: dict = defaults
+        self.concurrency_limit: threading.BoundedSemaphore = threading.BoundedSemaphore(max_concurrency)
+        self._clients: dict[str, Future] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+        if logout_at_exit:
+            atexit.register(self.close)
+
+
+    def __getitem__(self, key: str) -> BillingPlatform:
+        return self.client(key)
+
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.tenants
+
+
+    def __len__(self) -> int:
+        return len(self.tenants)
+
+
+    def __enter__(self) -> 'BillingPlatformPool':
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+    def keys(self) -> list[str]:
+        """
+        :return: The tenant keys of the pool.
+        """
+        return list(self.tenants)
+
+
+    def client(self, key: str) -> BillingPlatform:
+        """
+        Get the client of a tenant, logging in on first use. Threads asking for the same tenant at the same time wait
+        for a single login. A failed login is not kept, so the next call tries again.
+
+        :param key: The tenant key.
+        :return: The BillingPlatform client of the tenant.
+        :raises KeyError: If the tenant key is unknown.
+        :raises Exception: If the client cannot be created or the login fails.
+        """
+        if key not in self.tenants:
+            raise KeyError(f"Unknown tenant '{key}'.")
+
+        with self._lock:
+            _future: Future | None = self._clients.get(key)
+            _create: bool = _future is None
+
+            if _create:
+                _future = Future()
+                self._clients[key] = _future
+
+        if _create:
+            try:
+                _client: BillingPlatform = BillingPlatform(**{**self.defaults,
+                                                              **self.tenants[key],
+                                                              'logout_at_exit': False, # The pool logs out all its clients at once
+                                                              '_pooled': True,
+                                                              'concurrency_limit': self.concurrency_limit})
+                logging.debug("Created the client of tenant '%s'", key)
+                _future.set_result(_client)
+            except Exception as e:
+                with self._lock:
+                    self._clients.pop(key, None)
+
+                _future.set_exception(e)
+
+        return _future.result()
+
+
+    def created(self) -> list[str]:
+        """
+        :return: The keys of the tenants whose client has been created.
+        """
+        with self._lock:
+            return [_key for _key, _future in self._clients.items() if _future.done() and _future.exception() is None]
+
+
+    def authenticate(self, keys: Iterable[str] | None = None) -> dict[str, Exception]:
+        """
+        Create the clients of several tenants concurrently, so their logins overlap instead of running one after another.
+
+        :param keys: The tenant keys (default is every tenant).
+        :return: The exception of each tenant whose login failed, by tenant key (empty if all succeeded).
+        """
+        _keys: list[str] = list(self.tenants if keys is None else keys)
+        _failed: dict[str, Exception] = {}
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(_keys) or 1))) as _executor:
+            _futures: dict[str, Future] = {_key: _executor.submit(self.client, _key) for _key in _keys}
+
+        for _key, _future in _futures.items():
+            if _future.exception() is not None:
+                logging.warning("Failed to authenticate tenant '%s': %s", _key, _future.exception())
+                _failed[_key] = _future.exception()
+
+        return _failed
+
+
+    def execute(self, key: str, method: str, *args, **kwargs) -> dict:
+        """
+        Call a client method on the client of a tenant (ex. pool.execute('acme', 'query', 'SELECT Id FROM ACCOUNT WHERE 1=1')).
+
+        :param key: The tenant key.
+        :param method: The client method to call (one of multi.OPERATION_METHODS).
+        :param args: Positional arguments of the method.
+        :param kwargs: Keyword arguments of the method.
+        :return: The response data.
+        :raises ValueError: If the method cannot be dispatched.
+        """
+        _operation: Operation = to_operation(Operation(method, args, kwargs))
+
+        return getattr(self.client(key), _operation.method)(*_operation.args, **_operation.kwargs)
+
+
+    def map(self, method: str, *args, keys: Iterable[str] | None = None, **kwargs) -> dict[str, OperationResult]:
+        """
+        Make the same call on several tenants concurrently (ex. pool.map('query', 'SELECT COUNT(Id) AS Total FROM ACCOUNT WHERE 1=1')).
+        Tenants are logged in as needed. A tenant whose login or call fails reports its exception instead of a result.
+
+        :param method: The client method to call (one of multi.OPERATION_METHODS).
+        :param args: Positional arguments of the method.
+        :param keys: The tenant keys (default is every tenant).
+        :param kwargs: Keyword arguments of the method.
+        :return: One OperationResult per tenant, by tenant key, in the order of the keys.
+        :raises ValueError: If the method cannot be dispatched.
+        """
+        _operation: Operation = to_operation(Operation(method, args, kwargs))
+        _keys: list[str] = list(self.tenants if keys is None else keys)
+
+        def _run(_index: int, _key: str) -> OperationResult:
+            _start: float = time.perf_counter()
+
+            try:
+                _result: dict = self.execute(_key, _operation.method, *_operation.args, **_operation.kwargs)
+                return OperationResult(_index, _operation, _result, elapsed=time.perf_counter() - _start)
+            except Exception as e:
+                logging.debug("Operation %s failed on tenant '%s': %s", _operation.method, _key, e)
+                return OperationResult(_index, _operation, exception=e, elapsed=time.perf_counter() - _start)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(_keys) or 1))) as _executor:
+            _futures: list[Future] = [_executor.submit(_run, _index, _key) for _index, _key in enumerate(_keys)]
+
+        return {_key: _future.result() for _key, _future in zip(_keys, _futures)}
+
+
+    def close(self) -> None:
+        """
+        Log out of every created client in parallel. Logout failures are logged and do not stop the other logouts.
+
+        :return: None
+        """
+        with self._lock:
+            _clients: dict[str, BillingPlatform] = {
+                _key: _future.result() for _key, _future in self._clients.items() if _future.done() and _future.exception() is None
+            }
+            self._clients.clear()
+
+        if not _clients:
+            return
+
+        def _logout(_key: str) -> None:
+            try:
+                _clients[_key].logout()
+            except Exception as e:
+                logging.warning("Failed to log out of tenant '%s': %s", _key, e)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(_clients)))) as _executor:
+            list(_executor.map(_logout, _clients))
+
+        logging.debug('Logged out of %s tenants', len(_clients))
@@ -0,0 +1,98 @@
+import asyncio
+import logging
+import unittest
+
+from billingplatform import AsyncBillingPlatform
+from billingplatform.exceptions import BillingPlatformException
+from utils_for_testing import get_credentials
+
+
+"""
+Tests assume an existing credentials file in the root directory. For more information of the expected format, 
+see the utils_for_testing.py file.
+"""
+
+class TestAsyncBillingPlatform(unittest.IsolatedAsyncioTestCase):
+    async def test_session_login(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+
+        async with AsyncBillingPlatform(**session_credentials) as bp:
+            self.assertIsInstance(bp, AsyncBillingPlatform)
+            self.assertIn('sessionid', bp.client.headers)
+
+    async def test_oauth_login(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        oauth_credentials = get_credentials('credentials.json', 'oauth')
+
+        async with AsyncBillingPlatform(**oauth_credentials) as bp:
+            response: dict = await bp.query("SELECT Id, Name, Status FROM ACCOUNT WHERE 1=1")
+            self.assertIsInstance(response, dict)
+            self.assertIsNotNone(bp.token)
+
+    async def test_query(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+
+        async with AsyncBillingPlatform(**session_credentials) as bp:
+            # Concurrent queries share the connection pool and the single login
+            responses: list[dict] = await asyncio.gather(*[
+                bp.query("SELECT Id, Name, Status FROM ACCOUNT WHERE 1=1", limit=10) for _ in range(5)
+            ])
+
+            for response in responses:
+                self.assertIsInstance(response, dict)
+
+            with self.assertRaises(BillingPlatformException):
+                await bp.query("SELECT Id WHERE 1=1")
+
+    async def test_page_query(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+
+        async with AsyncBillingPlatform(**session_credentials) as bp:
+            _page_size: int = 10000
+            async for page in bp.page_query("SELECT Id, Name, Status FROM ACCOUNT WHERE 1=1", page_size=_page_size):
+                self.assertIsInstance(page, dict)
+                self.assertTrue(len(page.get('queryResponse', [])) <= _page_size)
+                break  # Remove this break to test all pages. Used with mock server.
+
+    async def test_retrieve(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+
+        async with AsyncBillingPlatform(**session_credentials) as bp:
+            self.assertIsInstance(await bp.retrieve_by_id('ACCOUNT', 1), dict)
+            self.assertIsInstance(await bp.retrieve_by_query('ACCOUNT', 'Id > 0'), dict)
+
+    async def test_write_methods(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+
+        async with AsyncBillingPlatform(**session_credentials) as bp:
+            payload: list[dict] = [{'Name': 'Test Account 1', 'Status': 'ACTIVE'}]
+
+            self.assertIsInstance(await bp.create('ACCOUNT', payload), dict)
+            self.assertIsInstance(await bp.update('ACCOUNT', [{'Id': 1, 'Name': 'Updated'}]), dict)
+            self.assertIsInstance(await bp.upsert('ACCOUNT', payload, externalIDFieldName='Name'), dict)
+            self.assertIsInstance(await bp.delete('ACCOUNT', [{'Id': 1}]), dict)
+            self.assertIsInstance(await bp.undelete('ACCOUNT', [{'Id': 1}]), dict)
+
+    async def test_bulk_requests(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+
+        async with AsyncBillingPlatform(**session_credentials) as bp:
+            self.assertIsInstance(await bp.bulk_query_request('TestQuery', 'SELECT Id FROM ACCOUNT'), dict)
+            self.assertIsInstance(await bp.bulk_retrieve_request('TestRetrieve', 'Id > 0', 'ACCOUNT'), dict)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import asyncio
+import logging
+import requests
+import time
+import unittest
+
+from billingplatform import AsyncBillingPlatform, BillingPlatform
+from concurrent.futures import ThreadPoolExecutor
+from utils_for_testing import get_credentials
+
+
+"""
+Tests assume an existing credentials file in the root directory. For more information of the expected format,
+see the utils_for_testing.py file.
+
+These tests also assume the mock server, whose /admin/sessions endpoint expires and revokes sessions.
+"""
+
+class TestBillingPlatformAuthManager(unittest.TestCase):
+    def setUp(self):
+        self.admin_url: str = f"{get_credentials('credentials.json', 'login')['base_url']}/admin/sessions"
+        requests.put(self.admin_url, json={'validate': True, 'ttl': 3600})
+
+    def tearDown(self):
+        requests.put(self.admin_url, json={'validate': False, 'ttl': 3600})
+
+    def test_reauthenticate_after_401(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials, logout_at_exit=False)
+        bp.retrieve_by_id(entity='ACCOUNT', record_id=10)
+        self.assertEqual(bp.auth.generation, 1)
+
+        requests.delete(self.admin_url) # Revoke the session
+        self.assertEqual(bp.retrieve_by_id(entity='ACCOUNT', record_id=10)['retrieveResponse'][0]['Id'], 10)
+        self.assertEqual(bp.auth.generation, 2)
+
+    def test_single_flight_refresh(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'oauth')
+        bp: BillingPlatform = BillingPlatform(**session_credentials)
+        requests.delete(self.admin_url)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            responses: list = list(executor.map(lambda record_id: bp.retrieve_by_id(entity='ACCOUNT', record_id=record_id), range(1, 17)))
+
+        self.assertEqual(len(responses), 16)
+        self.assertEqual(bp.auth.logins, 2) # One login for all the threads that saw the 401
+
+    def test_proactive_refresh(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        requests.put(self.admin_url, json={'ttl': 1.0})
+        session_credentials = get_credentials('credentials.json', 'oauth')
+        bp: BillingPlatform = BillingPlatform(**session_credentials, refresh_margin=0.5)
+        self.assertAlmostEqual(bp.auth.expires_at - time.monotonic(), 1.0, delta=0.2)
+
+        for _ in range(6):
+            time.sleep(0.25)
+            bp.retrieve_by_id(entity='ACCOUNT', record_id=10)
+
+        self.assertGreaterEqual(bp.auth.logins, 3) # Refreshed in the background before each token expired
+
+        bp.auth.close()
+        self.assertEqual(bp.auth.refresh(bp.auth.generation), bp.auth.generation) # No refreshes once closed
+
+    def test_async_reauthenticate_after_401(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'oauth')
+
+        async def run() -> list[dict]:
+            async with AsyncBillingPlatform(**session_credentials) as bp:
+                await bp.retrieve_by_id(entity='ACCOUNT', record_id=10)
+                requests.delete(self.admin_url)
+
+                responses: list[dict] = await asyncio.gather(*[bp.retrieve_by_id(entity='ACCOUNT', record_id=record_id) for record_id in range(1, 9)])
+                self.assertEqual(bp._auth_generation, 2) # One login for all the tasks that saw the 401
+                return responses
+
+        self.assertEqual(len(asyncio.run(run())), 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
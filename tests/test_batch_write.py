@@ -0,0 +1,80 @@
+import logging
+import requests
+import unittest
+
+from billingplatform import BillingPlatform
+from billingplatform.batch import BatchResult
+from utils_for_testing import get_credentials
+
+
+"""
+Tests assume an existing credentials file in the root directory. For more information of the expected format, 
+see the utils_for_testing.py file.
+"""
+
+class TestBillingPlatformBatchWrite(unittest.TestCase):
+    def test_batch_create(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials)
+
+        self.assertIsInstance(bp, BillingPlatform)
+        self.assertIsInstance(bp.session, requests.Session)
+
+        # A generator keeps the input lazy
+        payload = ({'Name': f'Test Account {i}', 'Status': 'ACTIVE'} for i in range(25))
+        result: BatchResult = bp.batch_write('create', 'ACCOUNT', payload, chunk_size=10, max_in_flight=2)
+
+        self.assertIsInstance(result, BatchResult)
+        self.assertEqual(result.chunks, 3)
+        self.assertEqual(len(result.results), 25)
+        self.assertEqual(result.failed, 0)
+
+    def test_batch_upsert(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials)
+
+        payload: list[dict] = [{'Name': f'Test Account {i}', 'Status': 'ACTIVE'} for i in range(5)]
+        result: BatchResult = bp.batch_write('upsert', 'ACCOUNT', payload, chunk_size=1, externalIDFieldName='Name')
+
+        self.assertEqual(len(result.results), 5)
+        self.assertEqual(result.succeeded, 5)
+
+    def test_batch_partial_failure(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials)
+
+        _update = bp.update
+
+        def _failing_update(entity: str, data: list[dict]) -> dict:
+            if any(record['Id'] == 7 for record in data):
+                raise Exception('Simulated failure')
+            return _update(entity, data)
+
+        bp.update = _failing_update  # Fail the chunk that contains Id 7
+
+        payload: list[dict] = [{'Id': i, 'Status': 'ACTIVE'} for i in range(1, 13)]
+        result: BatchResult = bp.batch_write('update', 'ACCOUNT', payload, chunk_size=4)
+
+        self.assertEqual(result.failed, 4)
+        self.assertEqual(result.succeeded, 8)
+        self.assertEqual([error.index for error in result.errors], [4, 5, 6, 7])
+        self.assertIsNone(result.results[4])
+        self.assertIsNotNone(result.results[0])
+
+    def test_batch_invalid_method(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials)
+
+        self.assertRaises(ValueError, bp.batch_write, 'query', 'ACCOUNT', [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import logging
+import os
+import tempfile
+import unittest
+
+from billingplatform import BillingPlatform
+from billingplatform.bulk import BulkJob
+from utils_for_testing import get_credentials
+
+
+"""
+Tests assume an existing credentials file in the root directory. For more information of the expected format, 
+see the utils_for_testing.py file.
+"""
+
+class TestBillingPlatformBulkJob(unittest.TestCase):
+    def test_bulk_query_job(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials)
+
+        bulk_query_response: dict = bp.bulk_query_request(RequestName='TestQuery', 
+                                                          RequestBody='SELECT Id, Name, Status FROM ACCOUNT WHERE 1 = 1', 
+                                                          RequestsPerBatch=30)
+        job: BulkJob = bp.bulk_job(bulk_query_response)
+
+        self.assertIsInstance(job, BulkJob)
+        self.assertIn(job.wait(timeout=60, poll_interval=0.1), ('Completed', 'Complete'))
+
+        _rows: list[dict] = list(job.iter_rows(max_workers=2))
+
+        self.assertTrue(len(_rows) > 0)
+        for row in _rows:
+            self.assertIsInstance(row, dict)
+
+    def test_bulk_retrieve_job_resume(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials)
+
+        bulk_retrieve_response: dict = bp.bulk_retrieve_request(RequestName='TestRetrieve', 
+                                                                RequestBody='Id > 0', 
+                                                                RetrieveEntityName='ACCOUNT', 
+                                                                Columns=['Id', 'Name'], 
+                                                                CSVDelimiter='|', 
+                                                                CSVEndLineFormat='LF')
+        job: BulkJob = bp.bulk_job(bulk_retrieve_response, ResponseFormat='CSV', CSVDelimiter='|', CSVEndLineFormat='LF')
+        job.wait(timeout=60, poll_interval=0.1)
+
+        with tempfile.TemporaryDirectory() as directory:
+            _batch: dict = job.batches()[0]
+            _path: str = job.download_batch(_batch, directory)
+
+            with open(_path, 'rb') as f:
+                _content: bytes = f.read()
+
+            # Simulate an interrupted download and resume it
+            os.remove(_path)
+            with open(f'{_path}.part', 'wb') as f:
+                f.write(_content[:10])
+
+            self.assertEqual(job.download_batch(_batch, directory), _path)
+            with open(_path, 'rb') as f:
+                self.assertEqual(f.read(), _content)
+
+            _rows: list[dict] = list(job.iter_rows(directory))
+            self.assertEqual(list(_rows[0].keys()), ['Id', 'Name'])
+
+    def test_bulk_job_temporary_directory(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials)
+
+        bulk_query_response: dict = bp.bulk_query_request(RequestName='TestTemporary', 
+                                                          RequestBody='SELECT Id FROM ACCOUNT WHERE 1 = 1', 
+                                                          RequestsPerBatch=30)
+        job: BulkJob = bp.bulk_job(bulk_query_response)
+        job.wait(timeout=60, poll_interval=0.1)
+
+        # Removed after a complete iteration
+        downloads = job._iter_downloads(None, 2)
+        paths: list[str] = list(downloads)
+        self.assertTrue(len(paths) > 1)
+        self.assertFalse(os.path.exists(os.path.dirname(paths[0])))
+
+        # Removed when the generator is closed early
+        downloads = job._iter_downloads(None, 2)
+        path: str = next(downloads)
+        self.assertTrue(os.path.exists(path))
+        downloads.close()
+        self.assertFalse(os.path.exists(os.path.dirname(path)))
+
+        # A directory passed by the caller is kept
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertTrue(len(list(job.iter_rows(directory))) > 0)
+            self.assertTrue(os.listdir(directory))
+
+    def test_bulk_job_from_id(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials)
+
+        self.assertEqual(bp.bulk_job('8675309').request_id, '8675309')
+        self.assertRaises(ValueError, bp.bulk_job, {'createResponse': []})
+
+
+if __name__ == '__main__':
+    unittest.main()
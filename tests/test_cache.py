@@ -0,0 +1,136 @@
+import logging
+import os
+import tempfile
+import time
+import unittest
+
+from billingplatform import BillingPlatform
+from billingplatform.cache import CacheBackend, DiskCache, MemoryCache, ResponseCache
+from utils_for_testing import get_credentials
+
+
+"""
+Tests assume an existing credentials file in the root directory. For more information of the expected format,
+see the utils_for_testing.py file.
+"""
+
+class TestBillingPlatformCache(unittest.TestCase):
+    def test_cached_query_and_invalidation(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        cache: ResponseCache = ResponseCache(entity_ttls={'INVOICE': 0})
+        bp: BillingPlatform = BillingPlatform(**session_credentials, cache=cache)
+
+        response: dict = bp.query("SELECT Id, Name FROM ACCOUNT WHERE 1=1")
+        cached_response: dict = bp.query("select Id, Name\n  from ACCOUNT where 1=1")
+
+        self.assertEqual(response, cached_response)
+        self.assertEqual(cache.stats()['hits'], 1)
+
+        # Cached responses are copies
+        cached_response['queryResponse'].clear()
+        self.assertEqual(bp.query("SELECT Id, Name FROM ACCOUNT WHERE 1=1"), response)
+
+        # Writes invalidate the entity
+        bp.update(entity='ACCOUNT', data={'Id': '12345', 'Name': 'Test Account 1'})
+        bp.query("SELECT Id, Name FROM ACCOUNT WHERE 1=1")
+        self.assertEqual(cache.stats()['misses'], 2)
+
+        # A TTL of 0 disables caching
+        bp.query("SELECT Id FROM INVOICE WHERE 1=1")
+        bp.query("SELECT Id FROM INVOICE WHERE 1=1")
+        self.assertEqual(cache.stats()['misses'], 4)
+
+    def test_cached_retrieve(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        cache: ResponseCache = ResponseCache()
+        bp: BillingPlatform = BillingPlatform(**session_credentials, cache=cache)
+
+        bp.retrieve_by_id(entity='ACCOUNT', record_id=10)
+        bp.retrieve_by_id(entity='account', record_id=10)
+        bp.retrieve_by_query(entity='ACCOUNT', queryAnsiSql="Id > 0")
+        bp.retrieve_by_query(entity='ACCOUNT', queryAnsiSql="Id  >  0")
+        self.assertEqual(cache.stats()['hits'], 2)
+
+        bp.delete(entity='ACCOUNT', data={'Id': '10'})
+        bp.retrieve_by_id(entity='ACCOUNT', record_id=10)
+        self.assertEqual(cache.stats()['misses'], 3)
+
+    def test_paged_queries_not_cached(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        backend: MemoryCache = MemoryCache()
+        cache: ResponseCache = ResponseCache(backend)
+        bp: BillingPlatform = BillingPlatform(**session_credentials, cache=cache)
+
+        bp.query("SELECT Id, Name FROM ACCOUNT WHERE Id = 1")
+        size: int = backend.size
+
+        # Keyset and OFFSET scans, and the Id bound lookups of parallel page queries, bypass the cache
+        self.assertEqual(sum(len(page['queryResponse']) for page in bp.page_query("SELECT Id, Name FROM ACCOUNT WHERE 1=1", page_size=10)), 100)
+        self.assertEqual(sum(len(page['queryResponse']) for page in bp.page_query("SELECT Name FROM ACCOUNT WHERE 1=1", page_size=10, keyset=False)), 100)
+        self.assertEqual(sum(len(page['queryResponse']) for page in bp.parallel_page_query("SELECT Id FROM ACCOUNT WHERE 1=1", page_size=10)), 100)
+        self.assertEqual(backend.size, size)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+        # The entry cached before the scans is still served from the cache
+        bp.query("SELECT Id, Name FROM ACCOUNT WHERE Id = 1")
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_memory_cache_eviction(self):
+        cache: MemoryCache = MemoryCache(max_bytes=20)
+
+        cache.set('a', b'0123456789', {'ACCOUNT'}, 60)
+        cache.set('b', b'0123456789', {'PRODUCT'}, 60)
+        cache.get('a') # 'b' is now the least recently used
+        cache.set('c', b'0123456789', {'PRODUCT'}, 60)
+
+        self.assertEqual(cache.get('a'), b'0123456789')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.size, 20)
+
+        self.assertEqual(cache.invalidate('PRODUCT'), 1)
+        self.assertIsNone(cache.get('c'))
+
+        cache.set('d', b'x', {'ACCOUNT'}, 0.01)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get('d'))
+
+    def test_disk_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path: str = os.path.join(directory, 'cache', 'responses.db')
+            cache: DiskCache = DiskCache(path, max_bytes=20)
+
+            cache.set('a', b'0123456789', {'ACCOUNT'}, 60)
+            cache.set('b', b'0123456789', {'ACCOUNT', 'PRODUCT'}, 60)
+            cache.get('a')
+            cache.set('c', b'0123456789', {'PRODUCT'}, 60)
+
+            self.assertEqual(cache.get('a'), b'0123456789')
+            self.assertIsNone(cache.get('b'))
+
+            # The file is shared between cache instances
+            other_cache: DiskCache = DiskCache(path)
+            self.assertEqual(other_cache.get('c'), b'0123456789')
+            self.assertEqual(other_cache.invalidate('PRODUCT'), 1)
+            self.assertIsNone(cache.get('c'))
+
+            cache.close()
+            other_cache.close()
+
+    def test_incomplete_backend(self):
+        class GetOnlyCache(CacheBackend):
+            def get(self, key: str) -> bytes | None:
+                return None
+
+        # A backend that misses methods fails when it is created, not on its first lookup
+        with self.assertRaises(TypeError):
+            GetOnlyCache()
+
+
+if __name__ == '__main__':
+    unittest.main()
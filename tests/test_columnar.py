@@ -0,0 +1,63 @@
+import io
+import logging
+import os
+import tempfile
+import unittest
+
+from billingplatform import BillingPlatform
+from billingplatform.bulk import BulkJob
+from billingplatform.columnar import iter_csv_batches
+from utils_for_testing import get_credentials
+
+
+"""
+Tests assume an existing credentials file in the root directory. For more information of the expected format, 
+see the utils_for_testing.py file.
+"""
+
+class TestBillingPlatformColumnar(unittest.TestCase):
+    def test_csv_batches(self):
+        _csv: bytes = '\r'.join(['Id|Name'] + [f'{i}|"Account | {i}"' for i in range(1, 11)]).encode()
+
+        with tempfile.TemporaryDirectory() as directory:
+            _path: str = os.path.join(directory, 'batch.csv')
+            with open(_path, 'wb') as f:
+                f.write(_csv)
+
+            _batches: list = list(iter_csv_batches(_path, CSVDelimiter='|', CSVEndLineFormat='CR', batch_size=4))
+
+        self.assertEqual([batch.num_rows for batch in _batches], [4, 4, 2])
+        self.assertEqual(_batches[0].column('Name')[0].as_py(), 'Account | 1')
+
+    def test_csv_batches_output(self):
+        _csv: bytes = b'Id,Name\r\n1,A\r\n2,B\r\n'
+
+        _columns: dict = next(iter_csv_batches(io.BytesIO(_csv), output='numpy'))
+        self.assertEqual(list(_columns['Id']), [1, 2])
+
+        _frame = next(iter_csv_batches(io.BytesIO(_csv), columns=['Name'], output='pandas'))
+        self.assertEqual(list(_frame.columns), ['Name'])
+
+        self.assertRaises(ValueError, next, iter_csv_batches(io.BytesIO(_csv), output='list'))
+
+    def test_bulk_job_batches(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials)
+
+        bulk_retrieve_response: dict = bp.bulk_retrieve_request(RequestName='TestRetrieve', 
+                                                                RequestBody='Id > 0', 
+                                                                RetrieveEntityName='ACCOUNT', 
+                                                                CSVDelimiter=';')
+        job: BulkJob = bp.bulk_job(bulk_retrieve_response, ResponseFormat='CSV', CSVDelimiter=';')
+        job.wait(timeout=60, poll_interval=0.1)
+
+        _batches: list = list(job.iter_batches(batch_size=25))
+
+        self.assertTrue(len(_batches) > 0)
+        self.assertTrue(all(batch.num_rows <= 25 for batch in _batches))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import logging
+import requests
+import unittest
+
+from billingplatform import BillingPlatform
+from billingplatform.instrumentation import Instrumentation, RequestEvent
+from utils_for_testing import get_credentials
+
+
+"""
+Tests assume an existing credentials file in the root directory. For more information of the expected format,
+see the utils_for_testing.py file.
+
+These tests also assume the mock server, which compresses responses and decodes compressed request bodies.
+"""
+
+class TestBillingPlatformCompression(unittest.TestCase):
+    def setUp(self):
+        self.admin_url: str = f"{get_credentials('credentials.json', 'login')['base_url']}/admin/compression"
+
+    def tearDown(self):
+        requests.put(self.admin_url, json={'responses': True, 'requests': True})
+
+    def test_compressed_responses(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        events: list[RequestEvent] = []
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials, instrumentation=Instrumentation(after_request=[events.append]))
+        self.assertIn('gzip', bp.session.headers['Accept-Encoding'])
+
+        response: dict = bp.query("SELECT Id, Name, Description, Status FROM ACCOUNT WHERE 1=1")
+        self.assertEqual(len(response['queryResponse']), 100)
+        self.assertEqual(events[0].content_encoding, 'gzip')
+        self.assertLess(events[0].bytes_received, events[0].payload_bytes_received)
+
+        stats: dict = bp.instrumentation.snapshot()['GET /query']
+        self.assertGreater(stats['compression']['received_ratio'], 2)
+        self.assertEqual(stats['compression']['bytes_saved'], stats['payload_bytes_received'] - stats['bytes_received'])
+
+        uncompressed: BillingPlatform = BillingPlatform(**session_credentials, compress_responses=False, instrumentation=Instrumentation())
+        self.assertEqual(uncompressed.query("SELECT Id, Name, Description, Status FROM ACCOUNT WHERE 1=1"), response)
+        self.assertEqual(uncompressed.instrumentation.snapshot()['GET /query']['compression']['received_ratio'], 1.0)
+
+    def test_compressed_request_bodies(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials, instrumentation=Instrumentation(), request_compression_threshold=1024)
+        records: list[dict] = [{'Name': f'Test Account {i}', 'Status': 'ACTIVE'} for i in range(100)]
+
+        decompressed: int = requests.get(self.admin_url).json()['stats']['requests_decompressed']
+        self.assertIn('createResponse', bp.create(entity='ACCOUNT', data=records))
+        self.assertEqual(requests.get(self.admin_url).json()['stats']['requests_decompressed'], decompressed + 1)
+
+        stats: dict = bp.instrumentation.snapshot()['POST /{entity}']
+        self.assertGreater(stats['compression']['sent_ratio'], 2)
+
+        # A server that does not accept compressed bodies answers 415: the body is resent as it is, and compression is turned off
+        requests.put(self.admin_url, json={'requests': False})
+        self.assertIn('createResponse', bp.create(entity='ACCOUNT', data=records))
+        self.assertIsNone(bp.request_compression_threshold)
+
+        bp.create(entity='ACCOUNT', data={'Name': 'Test Account 1'}) # Small bodies are never compressed
+
+
+if __name__ == '__main__':
+    unittest.main()
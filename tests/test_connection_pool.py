@@ -0,0 +1,47 @@
+import logging
+import requests
+import unittest
+
+from billingplatform import BillingPlatform
+from concurrent.futures import ThreadPoolExecutor
+from utils_for_testing import get_credentials
+
+
+"""
+Tests assume an existing credentials file in the root directory. For more information of the expected format, 
+see the utils_for_testing.py file.
+"""
+
+class TestBillingPlatformConnectionPool(unittest.TestCase):
+    def test_pool_settings(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials, 
+                                              pool_maxsize=32, 
+                                              pool_block=True, 
+                                              keep_alive=False, 
+                                              timeout=(3.05, 30))
+
+        self.assertIsInstance(bp.session, requests.Session)
+        self.assertEqual(bp.session.get_adapter(bp.base_url)._pool_maxsize, 32)
+        self.assertEqual(bp.session.headers.get('Connection'), 'close')
+        self.assertEqual(bp.requests_parameters.get('timeout'), (3.05, 30))
+
+    def test_shared_session(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials, pool_maxsize=8, timeout=30)
+
+        self.assertEqual(bp.warm_up(4), 4)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            responses: list[dict] = list(executor.map(lambda _: bp.query("SELECT Id, Name FROM ACCOUNT WHERE 1=1", limit=10), range(32)))
+
+        for response in responses:
+            self.assertIsInstance(response, dict)
+
+
+if __name__ == '__main__':
+    unittest.main()
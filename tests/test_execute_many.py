@@ -0,0 +1,72 @@
+import logging
+import requests
+import unittest
+
+from billingplatform import BillingPlatform
+from billingplatform.multi import Operation, OperationResult
+from utils_for_testing import get_credentials
+
+
+"""
+Tests assume an existing credentials file in the root directory. For more information of the expected format,
+see the utils_for_testing.py file.
+
+The deadline test also assumes the mock server, whose /admin/faults endpoint adds latency to requests.
+"""
+
+class TestBillingPlatformExecuteMany(unittest.TestCase):
+    def test_query_many(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials)
+        sqls: list[str] = [f'SELECT Id, Name FROM ACCOUNT WHERE Id = {record_id}' for record_id in range(1, 21)]
+        sqls.append('SELECT Id FROM ACCOUNT WHERE Id = 1000') # No matching rows
+
+        results: list[OperationResult] = bp.query_many(sqls, max_workers=8)
+
+        self.assertEqual([result.index for result in results], list(range(21)))
+        self.assertEqual([result.result['queryResponse'][0]['Id'] for result in results[:20]], list(range(1, 21)))
+        self.assertFalse(results[20].ok)
+        self.assertIsInstance(results[20].exception, Exception)
+
+    def test_execute_many_as_completed(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials)
+        operations: list = [
+            ('query', 'SELECT Id, Name FROM ACCOUNT WHERE 1=1'),
+            ('retrieve_by_id', 'ACCOUNT', 10),
+            Operation('create', kwargs={'entity': 'ACCOUNT', 'data': {'Name': 'Test Account 1'}}),
+        ]
+
+        results: list[OperationResult] = list(bp.execute_many(operations, ordered=False))
+
+        self.assertEqual(sorted(result.index for result in results), [0, 1, 2])
+        self.assertTrue(all(result.ok for result in results))
+
+        with self.assertRaises(ValueError):
+            bp.execute_many([('page_query', 'SELECT Id FROM ACCOUNT WHERE 1=1')])
+
+    def test_deadline(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        admin_url: str = f"{session_credentials['base_url']}/admin/faults"
+        bp: BillingPlatform = BillingPlatform(**session_credentials)
+        requests.put(admin_url, json={'name': 'slow-query', 'routes': {'query': {'latency': {'distribution': 'constant', 'value': 0.5}}}})
+
+        try:
+            operations: list = [('retrieve_by_id', 'ACCOUNT', 10)] + [('query', 'SELECT Id FROM ACCOUNT WHERE 1=1')] * 4
+            results: list[OperationResult] = list(bp.execute_many(operations, max_workers=2, timeout=0.25))
+        finally:
+            requests.delete(admin_url)
+
+        self.assertTrue(results[0].ok)
+        self.assertTrue(all(isinstance(result.exception, TimeoutError) for result in results[1:]))
+        self.assertEqual([result.cancelled for result in results], [False, False, False, True, True]) # Two queries were running
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import logging
+import requests
+import time
+import unittest
+
+from billingplatform import BillingPlatform
+from billingplatform.ratelimit import RetryPolicy
+from utils_for_testing import get_credentials
+
+
+"""
+Tests assume an existing credentials file in the root directory. For more information of the expected format,
+see the utils_for_testing.py file.
+
+These tests also assume the mock server, whose /admin/faults endpoint switches the fault profile at runtime.
+"""
+
+class TestMockServerFaultInjection(unittest.TestCase):
+    def setUp(self):
+        self.session_credentials = get_credentials('credentials.json', 'login')
+        self.admin_url: str = f"{self.session_credentials['base_url']}/admin/faults"
+
+    def tearDown(self):
+        requests.delete(self.admin_url)
+
+    def test_throttled_and_failed_requests(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        profile: dict = {
+            'name': 'always-throttled',
+            'routes': {
+                'query': {'throttle_rate': 1.0, 'retry_after': 0},
+                'retrieve_by_id': {'error_rate': 1.0}
+            }
+        }
+        self.assertEqual(requests.put(self.admin_url, json=profile).status_code, 200)
+
+        bp: BillingPlatform = BillingPlatform(**self.session_credentials, retry_policy=RetryPolicy(max_retries=2, backoff_factor=0.01))
+
+        with self.assertRaises(Exception):
+            bp.query("SELECT Id, Name FROM ACCOUNT WHERE 1=1")
+
+        with self.assertRaises(Exception):
+            bp.retrieve_by_id(entity='ACCOUNT', record_id=10)
+
+        stats: dict = requests.get(self.admin_url).json()['stats']
+        self.assertEqual(stats['query']['throttled'], 3) # The first attempt and two retries
+        self.assertEqual(stats['retrieve_by_id']['errors'], 3)
+
+    def test_session_quota(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        requests.put(self.admin_url, json={'name': 'quota', 'quota': {'requests': 3, 'window': 60}})
+        bp: BillingPlatform = BillingPlatform(**self.session_credentials) # Logging in does not count against the quota
+
+        for _ in range(3):
+            bp.retrieve_by_id(entity='ACCOUNT', record_id=10)
+
+        response: requests.Response = bp.session.get(f"{self.session_credentials['base_url']}/rest/2.0/ACCOUNT/10")
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response.headers['Retry-After']), 0)
+
+    def test_latency_and_slow_drip(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        bp: BillingPlatform = BillingPlatform(**self.session_credentials)
+        expected: dict = bp.query("SELECT Id, Name FROM ACCOUNT WHERE 1=1")
+
+        requests.put(self.admin_url, json={
+            'name': 'slow',
+            'routes': {'query': {'latency': {'distribution': 'constant', 'value': 0.2}, 'drip': {'chunk_size': 256, 'interval': 0.001}}}
+        })
+
+        start: float = time.perf_counter()
+        self.assertEqual(bp.query("SELECT Id, Name FROM ACCOUNT WHERE 1=1"), expected)
+        self.assertGreaterEqual(time.perf_counter() - start, 0.2)
+
+        stats: dict = requests.get(self.admin_url).json()['stats']
+        self.assertEqual(stats['query']['dripped'], 1)
+        self.assertAlmostEqual(stats['query']['latency_added'], 0.2)
+
+    def test_profiles(self):
+        response: requests.Response = requests.put(self.admin_url, json={'profile': 'degraded'})
+        self.assertEqual(response.json()['profile']['name'], 'degraded')
+        self.assertIn('flaky', response.json()['profiles'])
+
+        self.assertEqual(requests.put(self.admin_url, json={'profile': 'unknown'}).status_code, 400)
+        self.assertEqual(requests.put(self.admin_url, json={'default': {'error_rate': 2.0}}).status_code, 400)
+        self.assertEqual(requests.put(self.admin_url, json={'default': {'latency': {'distribution': 'pareto'}}}).status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
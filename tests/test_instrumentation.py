@@ -0,0 +1,102 @@
+import logging
+import unittest
+
+from billingplatform import BillingPlatform
+from billingplatform.instrumentation import Instrumentation, LatencyHistogram, MetricsExporter, RequestEvent, describe_request
+from billingplatform.ratelimit import RetryPolicy
+from utils_for_testing import get_credentials
+
+
+"""
+Tests assume an existing credentials file in the root directory. For more information of the expected format,
+see the utils_for_testing.py file.
+"""
+
+class ListExporter(MetricsExporter):
+    def __init__(self):
+        self.events: list[RequestEvent] = []
+
+    def export(self, event: RequestEvent) -> None:
+        self.events.append(event)
+
+
+class TestBillingPlatformInstrumentation(unittest.TestCase):
+    def test_request_hooks_and_metrics(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        started: list[RequestEvent] = []
+        exporter: ListExporter = ListExporter()
+        instrumentation: Instrumentation = Instrumentation(before_request=[started.append],
+                                                           after_request=[lambda event: 1 / 0], # Failing hooks are only logged
+                                                           exporters=[exporter])
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials, instrumentation=instrumentation)
+
+        bp.query("SELECT Id, Name FROM ACCOUNT WHERE 1=1")
+        bp.retrieve_by_id(entity='ACCOUNT', record_id=10)
+        bp.create(entity='ACCOUNT', data={'Name': 'Test Account 1'})
+
+        self.assertEqual(len(started), 3)
+        self.assertEqual([event.endpoint for event in exporter.events], ['GET /query', 'GET /{entity}/{id}', 'POST /{entity}'])
+
+        for event in exporter.events:
+            self.assertEqual(event.entity, 'ACCOUNT')
+            self.assertEqual(event.status_code, 200)
+            self.assertGreater(event.bytes_received, 0)
+            self.assertGreater(event.elapsed, 0)
+
+        self.assertGreater(exporter.events[2].bytes_sent, 0)
+
+        snapshot: dict = instrumentation.snapshot()
+        self.assertEqual(snapshot['GET /query']['requests'], 1)
+        self.assertEqual(snapshot['GET /query']['latency']['count'], 1)
+        self.assertIn('billingplatform_requests_total{endpoint="POST /{entity}"} 1', instrumentation.prometheus_text())
+
+    def test_errors_and_retries(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        instrumentation: Instrumentation = Instrumentation()
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials,
+                                              instrumentation=instrumentation,
+                                              retry_policy=RetryPolicy(max_retries=2, backoff_factor=0.01))
+
+        with self.assertRaises(Exception):
+            bp.query("NOT VALID SQL") # The mock server returns 500
+
+        stats: dict = instrumentation.snapshot()['GET /query']
+        self.assertEqual(stats['errors'], 1)
+        self.assertEqual(stats['retries'], 2)
+        self.assertEqual(stats['status_codes'], {500: 1})
+
+    def test_describe_request(self):
+        base: str = 'https://sandbox.billingplatform.com/myorg/rest/2.0'
+
+        self.assertEqual(describe_request('DELETE', f'{base}/delete/invoice'), ('DELETE /delete/{entity}', 'INVOICE'))
+        self.assertEqual(describe_request('GET', f'{base}/bulk_api_file/12'), ('GET /bulk_api_file/{id}', None))
+        self.assertEqual(describe_request('POST', 'https://sandbox.billingplatform.com/myorg/auth/1.0/authenticate'), ('POST /authenticate', None))
+
+    def test_latency_histogram(self):
+        histogram: LatencyHistogram = LatencyHistogram()
+
+        for _ in range(98):
+            histogram.observe(0.02)
+        histogram.observe(3.0)
+        histogram.observe(3.0)
+
+        self.assertLessEqual(histogram.quantile(0.5), 0.025)
+        self.assertGreater(histogram.quantile(0.995), 2.5)
+        self.assertEqual(histogram.snapshot()['buckets'][float('inf')], 100)
+
+    def test_incomplete_exporter(self):
+        class NoExportExporter(MetricsExporter):
+            pass
+
+        # An exporter without export() fails when it is created, not on the first request
+        with self.assertRaises(TypeError):
+            NoExportExporter()
+
+
+if __name__ == '__main__':
+    unittest.main()
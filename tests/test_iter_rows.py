@@ -0,0 +1,59 @@
+import json
+import logging
+import unittest
+
+from billingplatform import BillingPlatform
+from billingplatform.streaming import iter_json_array
+from utils_for_testing import get_credentials
+
+
+"""
+Tests assume an existing credentials file in the root directory. For more information of the expected format, 
+see the utils_for_testing.py file.
+"""
+
+class TestBillingPlatformIterRows(unittest.TestCase):
+    def test_iter_rows(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials)
+
+        _rows: list[dict] = list(bp.iter_rows("SELECT Id, Name, Status FROM ACCOUNT WHERE 1=1", page_size=1000))
+
+        self.assertTrue(len(_rows) > 0)
+        for row in _rows:
+            self.assertIsInstance(row, dict)
+
+    def test_iter_rows_row_types(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials)
+
+        _row: tuple = next(bp.iter_rows("SELECT Id, Name, Status FROM ACCOUNT WHERE 1=1", row_type='tuple'))
+        self.assertIsInstance(_row, tuple)
+
+        _row = next(bp.iter_rows("SELECT Id, Name, Status FROM ACCOUNT WHERE 1=1", row_type='namedtuple'))
+        self.assertIsInstance(_row, tuple)
+        self.assertEqual(_row.Id, _row[_row._fields.index('Id')])
+
+        with self.assertRaises(ValueError):
+            next(bp.iter_rows("SELECT Id FROM ACCOUNT WHERE 1=1", row_type='list'))
+
+    def test_iter_json_array_chunking(self):
+        _body: bytes = json.dumps({'queryResponse': [{'Id': i, 'Name': f'Account {i} ]'} for i in range(500)] + [12.5]}).encode()
+
+        for _size in (1, 3, 1024):
+            _chunks: list[bytes] = [_body[i:i + _size] for i in range(0, len(_body), _size)]
+            _elements: list = list(iter_json_array(_chunks, 'queryResponse'))
+
+            self.assertEqual(len(_elements), 501)
+            self.assertEqual(_elements[-1], 12.5)
+
+        self.assertEqual(list(iter_json_array([b'{"queryResponse": []}'], 'queryResponse')), [])
+        self.assertRaises(ValueError, list, iter_json_array([b'{"queryResponse": [{"Id": 1},'], 'queryResponse'))
+
+
+if __name__ == '__main__':
+    unittest.main()
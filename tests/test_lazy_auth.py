@@ -0,0 +1,114 @@
+import logging
+import requests
+import unittest
+
+from billingplatform import BillingPlatform
+from billingplatform.auth import CredentialCache
+from utils_for_testing import get_credentials
+
+
+"""
+Tests assume an existing credentials file in the root directory. For more information of the expected format,
+see the utils_for_testing.py file.
+
+These tests also assume the mock server, whose /admin/sessions endpoint counts logins and revokes sessions.
+"""
+
+class TestBillingPlatformLazyAuth(unittest.TestCase):
+    def setUp(self):
+        self.admin_url: str = f"{get_credentials('credentials.json', 'login')['base_url']}/admin/sessions"
+        requests.put(self.admin_url, json={'validate': True, 'ttl': 3600})
+
+    def tearDown(self):
+        requests.put(self.admin_url, json={'validate': False, 'ttl': 3600})
+
+    def logins(self) -> int:
+        return requests.get(self.admin_url).json()['logins']
+
+    def test_lazy_login(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        logins: int = self.logins()
+        bp: BillingPlatform = BillingPlatform(**session_credentials, lazy_login=True)
+        self.assertEqual(self.logins(), logins) # No login in the constructor
+        self.assertEqual(bp.auth.generation, 0)
+
+        self.assertEqual(bp.retrieve_by_id(entity='ACCOUNT', record_id=10)['retrieveResponse'][0]['Id'], 10)
+        self.assertEqual(self.logins(), logins + 1)
+        self.assertEqual(bp.auth.generation, 1)
+
+        bp.logout()
+
+        # A client that never made a request does not log out either
+        BillingPlatform(**session_credentials, lazy_login=True, logout_at_exit=False).logout()
+        self.assertEqual(self.logins(), logins + 1)
+
+    def test_injected_session(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials, logout_at_exit=False)
+        logins: int = self.logins()
+
+        # A worker reuses the session of another process without logging in
+        worker: BillingPlatform = BillingPlatform(base_url=session_credentials['base_url'], session_id=bp.session.headers['sessionid'])
+        self.assertEqual(worker.retrieve_by_id(entity='ACCOUNT', record_id=10)['retrieveResponse'][0]['Id'], 10)
+        self.assertEqual(self.logins(), logins)
+        self.assertNotIn(bp.session.headers['sessionid'], worker._credential_key) # The cache never keys on the live session ID
+
+        # Without credentials, a rejected session cannot be replaced
+        requests.delete(self.admin_url)
+        with self.assertRaises(Exception):
+            worker.retrieve_by_id(entity='ACCOUNT', record_id=10)
+
+        # With credentials, the client logs in again once the injected token is rejected
+        oauth_credentials = get_credentials('credentials.json', 'oauth')
+        oauth: BillingPlatform = BillingPlatform(**oauth_credentials, token='revoked-token')
+        self.assertEqual(oauth.retrieve_by_id(entity='ACCOUNT', record_id=10)['retrieveResponse'][0]['Id'], 10)
+        self.assertNotEqual(oauth.token, 'revoked-token')
+        self.assertEqual(oauth.auth.logins, 1)
+
+        with self.assertRaises(ValueError):
+            BillingPlatform(base_url=session_credentials['base_url'])
+
+    def test_credential_cache(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        cache: CredentialCache = CredentialCache()
+        session_credentials = get_credentials('credentials.json', 'oauth')
+        logins: int = self.logins()
+
+        cold: BillingPlatform = BillingPlatform(**session_credentials, credential_cache=cache)
+        warm: BillingPlatform = BillingPlatform(**session_credentials, credential_cache=cache)
+        self.assertEqual(self.logins(), logins + 1) # The warm start reused the cached token
+        self.assertEqual(warm.token, cold.token)
+        self.assertEqual(len(cache), 1)
+
+        # A rejected cached token is replaced once, and the new token is shared through the cache
+        requests.delete(self.admin_url)
+        warm.retrieve_by_id(entity='ACCOUNT', record_id=10)
+        cold.retrieve_by_id(entity='ACCOUNT', record_id=10)
+        self.assertEqual(self.logins(), logins + 2)
+        self.assertEqual(warm.token, cold.token)
+
+        # Other logins do not share the cached token
+        BillingPlatform(**get_credentials('credentials.json', 'login'), credential_cache=cache, logout_at_exit=False).logout()
+        self.assertEqual(self.logins(), logins + 3)
+        self.assertEqual(len(cache), 1)
+
+        # The secret is part of the key, so other passwords and client secrets do not reuse a cached credential
+        login_credentials = get_credentials('credentials.json', 'login')
+        first: BillingPlatform = BillingPlatform(**login_credentials, credential_cache=cache, logout_at_exit=False)
+        other: BillingPlatform = BillingPlatform(**{**login_credentials, 'password': 'wrong'}, credential_cache=cache, logout_at_exit=False)
+        oauth: BillingPlatform = BillingPlatform(**{**session_credentials, 'client_secret': 'wrong'}, credential_cache=cache)
+        self.assertEqual(self.logins(), logins + 6)
+        self.assertNotEqual(other.session.headers['sessionid'], first.session.headers['sessionid'])
+        self.assertNotEqual(oauth.token, cold.token)
+        self.assertEqual(len(cache), 4)
+        first.logout()
+        other.logout()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import logging
+import os
+import tempfile
+import unittest
+
+from billingplatform import BillingPlatform
+from billingplatform.instrumentation import Instrumentation, RequestEvent
+from utils_for_testing import get_credentials
+
+
+"""
+Tests assume an existing credentials file in the root directory. For more information of the expected format,
+see the utils_for_testing.py file.
+"""
+
+class TestBillingPlatformMirror(unittest.TestCase):
+    def test_query_pushdown(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        requests_sent: list[RequestEvent] = []
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials, instrumentation=Instrumentation(before_request=[requests_sent.append]))
+        mirror = bp.mirror(entities=['ACCOUNT'])
+
+        sql: str = "SELECT Id, Name FROM ACCOUNT WHERE Id > 90 ORDER BY Id DESC"
+        expected: dict = bp.query(sql)
+        requests_sent.clear()
+
+        self.assertEqual(mirror.query(sql), expected)
+        self.assertEqual(mirror.query(sql, offset=2, limit=3)['queryResponse'], expected['queryResponse'][2:5])
+        self.assertEqual(mirror.query(f'{sql} OFFSET 2 ROWS FETCH NEXT 3 ROWS ONLY')['queryResponse'], expected['queryResponse'][2:5])
+        self.assertEqual(mirror.query("SELECT COUNT(*) AS Total FROM ACCOUNT"), {'queryResponse': [{'Total': 100}]})
+        self.assertEqual(requests_sent, []) # Answered locally
+
+        mirror.query("SELECT Id FROM ACCOUNT WHERE Id = 1", max_age=0) # Too stale for this query
+        mirror.query("SELECT Id FROM CONTACT WHERE 1=1") # Not mirrored
+        self.assertEqual(len(requests_sent), 2)
+
+    def test_persistent_mirror(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path: str = os.path.join(directory, 'mirror.db')
+            mirror = bp.mirror(path, max_age=None)
+            mirror.add('ACCOUNT', columns=['Name'], refresh=False)
+            self.assertFalse(mirror.is_fresh('ACCOUNT'))
+
+            self.assertEqual(mirror.load('ACCOUNT', ({'Id': str(row_id), 'Name': f'Bulk {row_id}'} for row_id in range(1, 81)), batch_size=25), 80)
+            self.assertEqual(mirror.refresh('ACCOUNT')['ACCOUNT'].rows, 20) # Only rows after the loaded high-water mark
+            mirror.close()
+
+            reopened = bp.mirror(path, max_age=None)
+            self.assertEqual(reopened.entities(), ['ACCOUNT'])
+            self.assertTrue(reopened.is_fresh('ACCOUNT'))
+            self.assertEqual(reopened.query_local("SELECT COUNT(*) AS Total FROM ACCOUNT")['queryResponse'][0]['Total'], 100)
+            self.assertEqual(reopened.refresh()['ACCOUNT'].rows, 0)
+            self.assertEqual(reopened.query("SELECT Id, Name FROM ACCOUNT WHERE Id = 80")['queryResponse'], [{'Id': 80, 'Name': 'Bulk 80'}])
+            self.assertIn('Status', reopened.query("SELECT Id, Status FROM ACCOUNT WHERE Id = 1")['queryResponse'][0]) # Not mirrored, read from the API
+            reopened.close()
+
+    def test_load_numeric_columns(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials)
+        mirror = bp.mirror()
+        mirror.add('INVOICE', refresh=False)
+
+        rows: list[dict] = [{'Id': '1', 'Amount': '250.5', 'PostalCode': '02110'},
+                            {'Id': '2', 'Amount': '99', 'PostalCode': '94105'},
+                            {'Id': '3', 'Amount': '1000', 'PostalCode': ''}]
+        self.assertEqual(mirror.load('INVOICE', rows), 3)
+
+        # CSV values are text, and would otherwise compare as text ('1000' < '250.5' < '99')
+        self.assertEqual(mirror.query_local("SELECT Id, Amount FROM INVOICE WHERE Amount > 100 ORDER BY Amount")['queryResponse'],
+                         [{'Id': 1, 'Amount': 250.5}, {'Id': 3, 'Amount': 1000}])
+        self.assertEqual([row['PostalCode'] for row in mirror.query_local("SELECT PostalCode FROM INVOICE ORDER BY Id")['queryResponse']],
+                         ['02110', 94105, ''])
+        mirror.close()
+
+    def test_load_mixed_watermark(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials)
+        mirror = bp.mirror()
+        mirror.add('INVOICE', watermark='Sequence', refresh=False)
+
+        # A high-water mark saved as text by an earlier run
+        state: dict = mirror.store.load('INVOICE')
+        mirror.store.save('INVOICE', {**state, 'high_water_mark': '3'})
+
+        rows: list[dict] = [{'Id': '1', 'Sequence': '5'}, {'Id': '2', 'Sequence': '0007'}, {'Id': '3', 'Sequence': '12'}, {'Id': '4', 'Sequence': 'B-1'}]
+        self.assertEqual(mirror.load('INVOICE', rows, batch_size=2), 4)
+
+        # The high-water mark is the largest value in SQLite's order, where text sorts after numbers
+        high_water_mark: object = mirror.store.load('INVOICE')['high_water_mark']
+        self.assertEqual(high_water_mark, 'B-1')
+        self.assertEqual(mirror.query_local("SELECT MAX(Sequence) AS Sequence FROM INVOICE")['queryResponse'][0]['Sequence'], high_water_mark)
+        mirror.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import logging
+import unittest
+
+from billingplatform import BillingPlatform
+from billingplatform.models import Record, record_type, to_decimal
+from billingplatform.serialization import get_serializer
+from utils_for_testing import get_credentials
+
+
+"""
+Tests assume an existing credentials file in the root directory. For more information of the expected format,
+see the utils_for_testing.py file.
+"""
+
+class TestBillingPlatformRecordTypes(unittest.TestCase):
+    def test_record_type(self):
+        Invoice: type[Record] = record_type('Invoice', ['Id', 'Amount'], {'Amount': to_decimal})
+        invoice: Record = Invoice.from_dict({'Id': 1, 'Amount': '0.10', 'Other': 'ignored'})
+
+        self.assertEqual(invoice.Amount + invoice.Amount + invoice.Amount, to_decimal('0.30')) # Converted on access
+        self.assertEqual(invoice.to_dict(raw=True), {'Id': 1, 'Amount': '0.10'})
+        self.assertEqual(invoice['Id'], 1)
+        self.assertFalse(hasattr(invoice, '__dict__'))
+        self.assertIs(record_type('Invoice', ('Id', 'Amount'), {'Amount': to_decimal}), Invoice)
+        self.assertEqual(Invoice(Id=2).Amount, None)
+
+        # The base class builds records of hand-written subclasses from their fields
+        class Product(Record):
+            __slots__ = ('Id', '_raw_Price')
+            _fields = ('Id', 'Price')
+            _converters = {'Price': to_decimal}
+            Price = property(lambda self: to_decimal(self._raw_Price))
+
+        product: Record = Product.from_dict({'Id': 7, 'Price': '1.50', 'Other': 'ignored'})
+        self.assertEqual(product.to_dict(), {'Id': 7, 'Price': to_decimal('1.50')})
+        self.assertEqual(Record.from_dict({'Id': 1}).to_dict(), {})
+
+        with self.assertRaises(ValueError):
+            record_type('Invoice', ['Account.Name'])
+
+        for backend in ('json', 'orjson', 'msgspec'):
+            try:
+                serializer = get_serializer(backend, entity_types={'INVOICE': Invoice})
+            except ImportError:
+                continue # Optional backend not installed
+
+            response: dict = serializer.loads_response(b'{"queryResponse":[{"Id":1,"Amount":"0.10"}]}', 'invoice')
+            self.assertEqual(response['queryResponse'], [invoice])
+            self.assertEqual(serializer.loads(serializer.dumps(response)), {'queryResponse': [{'Id': 1, 'Amount': '0.10'}]})
+
+    def test_query_and_retrieve_records(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials)
+        Account: type[Record] = record_type('Account', ['Id', 'Name'])
+
+        rows: list[Record] = bp.query("SELECT Id, Name FROM ACCOUNT WHERE Id <= 3", record_type=Account)['queryResponse']
+        self.assertEqual([(row.Id, row.Name) for row in rows], [(1, 'Account 1'), (2, 'Account 2'), (3, 'Account 3')])
+
+        pages: list[dict] = list(bp.page_query("SELECT Id, Status FROM ACCOUNT WHERE Id <= 30", page_size=20, record_type='auto'))
+        self.assertEqual(len(pages), 2)
+        self.assertEqual(type(pages[0]['queryResponse'][0]).__name__, 'Account')
+        self.assertEqual(pages[1]['queryResponse'][0].keys(), ('Id', 'Status'))
+
+        self.assertEqual(bp.retrieve_by_id(entity='ACCOUNT', record_id=10, record_type=Account)['retrieveResponse'][0].Id, 10)
+        self.assertIsInstance(bp.retrieve_by_query(entity='ACCOUNT', queryAnsiSql="Id = 7", record_type='auto')['retrieveResponse'][0], Record)
+        self.assertIsInstance(bp.retrieve_by_ids('ACCOUNT', [4, 5], record_type=Account).records[4], Account)
+
+
+if __name__ == '__main__':
+    unittest.main()
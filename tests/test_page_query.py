@@ -3,6 +3,8 @@ import requests
 import unittest
 
 from billingplatform import BillingPlatform
+from billingplatform.instrumentation import Instrumentation, RequestEvent
+from urllib.parse import unquote
 from utils_for_testing import get_credentials
 
 
@@ -48,6 +50,44 @@ class TestBillingPlatformPageQuery(unittest.TestCase):
             # TODO: Add assertions to check the offset functionality
             break  # Remove this break to test all pages. Used with mock server.
 
+    def test_page_query_all_pages(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials)
+
+        # The mock server pages through its 100 records and returns 404 past the end
+        _ids: list[int] = []
+        for page in bp.page_query("SELECT Id, Name FROM ACCOUNT WHERE Id > 10 ORDER BY Id", page_size=25):
+            _ids.extend(row['Id'] for row in page.get('queryResponse', []))
+
+        self.assertEqual(_ids, list(range(11, 101)))
+
+    def test_page_query_keyset(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        events: list[RequestEvent] = []
+        bp: BillingPlatform = BillingPlatform(**session_credentials, instrumentation=Instrumentation(after_request=[events.append]))
+        sql: str = "SELECT Id, Name FROM ACCOUNT WHERE Name <> 'OFFSET 5 ROWS'"
+
+        # Eligible queries are paged with Id predicates instead of OFFSET
+        keyset_ids: list[int] = [row['Id'] for page in bp.page_query(sql, page_size=30, offset=5) for row in page['queryResponse']]
+        self.assertEqual(keyset_ids, list(range(6, 101)))
+        self.assertIn('Id%20%3E%2095', events[-1].url)
+        self.assertNotIn('OFFSET', unquote(events[-1].url).split("'")[-1]) # Only the first page has an OFFSET
+
+        offset_ids: list[int] = [row['Id'] for page in bp.page_query(sql, page_size=30, offset=5, keyset=False) for row in page['queryResponse']]
+        self.assertEqual(offset_ids, keyset_ids)
+
+        self.assertEqual([row['Id'] for row in bp.iter_rows(sql, page_size=30, keyset=True)], list(range(1, 101)))
+
+        with self.assertRaises(ValueError):
+            list(bp.page_query("SELECT Name FROM ACCOUNT WHERE 1=1", keyset=True)) # Id is not selected
+
+        # A pagination keyword inside a literal no longer disables paging
+        self.assertEqual(len(bp.query(sql, limit=5)['queryResponse']), 5)
+
 
 if __name__ == '__main__':
     unittest.main()
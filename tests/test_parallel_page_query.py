@@ -0,0 +1,128 @@
+import logging
+import requests
+import time
+import unittest
+
+from billingplatform import BillingPlatform
+from billingplatform.instrumentation import Instrumentation, RequestEvent
+from utils_for_testing import get_credentials
+
+
+"""
+Tests assume an existing credentials file in the root directory. For more information of the expected format, 
+see the utils_for_testing.py file.
+"""
+
+class TestBillingPlatformParallelPageQuery(unittest.TestCase):
+    def test_parallel_page_query(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials)
+
+        self.assertIsInstance(bp, BillingPlatform)
+        self.assertIsInstance(bp.session, requests.Session)
+
+        _page_size: int = 10000
+        for page in bp.parallel_page_query("SELECT Id, Name, Status FROM ACCOUNT WHERE 1=1", page_size=_page_size):
+            # Assert that that each page is a dictionary
+            self.assertIsInstance(page, dict)
+
+            # Assert that the data returned is equal to or less than the page size
+            data = page.get('queryResponse', [])
+            self.assertTrue(len(data) <= _page_size)
+
+    def test_parallel_page_query_id_range(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials)
+
+        self.assertIsInstance(bp, BillingPlatform)
+        self.assertIsInstance(bp.session, requests.Session)
+
+        _pages: list[dict] = list(bp.parallel_page_query("SELECT Id, Name, Status FROM ACCOUNT WHERE 1=1", 
+                                                         page_size=1000, 
+                                                         partitions=4, 
+                                                         max_workers=2, 
+                                                         id_range=(1, 100)))
+
+        for page in _pages:
+            self.assertIsInstance(page, dict)
+
+        # Every row exactly once, in ascending Id order
+        _ids: list[int] = [int(row['Id']) for page in _pages for row in page['queryResponse']]
+        self.assertEqual(_ids, list(range(1, 101)))
+
+    def test_parallel_page_query_more_partitions_than_workers(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials)
+
+        _pages: list[dict] = list(bp.parallel_page_query("SELECT Id, Name FROM ACCOUNT WHERE 1=1", 
+                                                         page_size=7, 
+                                                         partitions=9, 
+                                                         max_workers=2, 
+                                                         prefetch=1, 
+                                                         id_range=(1, 100)))
+
+        self.assertTrue(all(len(page['queryResponse']) <= 7 for page in _pages))
+        self.assertEqual([int(row['Id']) for page in _pages for row in page['queryResponse']], list(range(1, 101)))
+
+    def test_parallel_page_query_sparse_range(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials)
+
+        # Most partitions of a range far wider than the data hold no rows
+        _pages: list[dict] = list(bp.parallel_page_query("SELECT Id FROM ACCOUNT WHERE 1=1", 
+                                                         page_size=10, 
+                                                         partitions=8, 
+                                                         max_workers=3, 
+                                                         id_range=(51, 1000)))
+        self.assertEqual([int(row['Id']) for page in _pages for row in page['queryResponse']], list(range(51, 101)))
+
+        # A range without rows yields no pages
+        self.assertEqual(list(bp.parallel_page_query("SELECT Id FROM ACCOUNT WHERE 1=1", partitions=4, id_range=(1000, 2000))), [])
+
+        # Bounds looked up by the client for a filter without rows
+        self.assertEqual(list(bp.parallel_page_query("SELECT Id FROM ACCOUNT WHERE Id > 1000")), [])
+
+    def test_parallel_page_query_early_exit(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        requests_sent: list[RequestEvent] = []
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials, instrumentation=Instrumentation(after_request=[requests_sent.append]))
+
+        for page in bp.parallel_page_query("SELECT Id, Name, Status FROM ACCOUNT WHERE 1=1", 
+                                           page_size=5, 
+                                           partitions=10, 
+                                           max_workers=2, 
+                                           prefetch=1, 
+                                           id_range=(1, 100)):
+            self.assertIsInstance(page, dict)
+            break  # Workers must shut down cleanly when the consumer stops iterating
+
+        # Each of the 2 workers stops after the page it may fetch ahead (prefetch) and the page waiting to be queued,
+        # instead of paging through all 20 pages
+        _sent: int = len(requests_sent)
+        self.assertLessEqual(_sent, 4)
+
+        time.sleep(0.5)
+        self.assertEqual(len(requests_sent), _sent) # No fetches after the generator is closed
+
+    def test_parallel_page_query_ordered_sql(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials)
+
+        with self.assertRaises(ValueError):
+            next(bp.parallel_page_query("SELECT Id, Name FROM ACCOUNT ORDER BY Name"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+import logging
+import requests
+import threading
+import time
+import unittest
+
+from billingplatform import BillingPlatform, pipeline
+from billingplatform.instrumentation import Instrumentation, RequestEvent
+from billingplatform.pipeline import PageError, PageResult
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+from utils_for_testing import get_credentials
+
+
+"""
+Tests assume an existing credentials file in the root directory. For more information of the expected format,
+see the utils_for_testing.py file.
+
+The transforms run in worker processes, so they are defined at module level.
+"""
+
+def to_ids(rows: list[dict]) -> list[int]:
+    return [int(row['Id']) for row in rows]
+
+
+def fail_on_id_41(rows: list[dict]) -> list[int]:
+    if any(int(row['Id']) == 41 for row in rows):
+        raise ValueError('Unexpected Id 41')
+
+    return to_ids(rows)
+
+
+class RecordingProcessPoolExecutor(ProcessPoolExecutor):
+    instances: list['RecordingProcessPoolExecutor'] = []
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.submit_threads: list[threading.Thread] = []
+        self.instances.append(self)
+
+    def submit(self, fn, /, *args, **kwargs):
+        self.submit_threads.append(threading.current_thread())
+        return super().submit(fn, *args, **kwargs)
+
+
+class TestBillingPlatformProcessPages(unittest.TestCase):
+    def test_process_pages(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials)
+        sql: str = "SELECT Id, Name FROM ACCOUNT WHERE 1=1"
+
+        pages: list[PageResult] = list(bp.process_pages(sql, transform=to_ids, page_size=10, processes=2))
+        self.assertEqual([page.offset for page in pages], list(range(0, 100, 10)))
+        self.assertEqual([record_id for page in pages for record_id in page.result], list(range(1, 101)))
+        self.assertTrue(all(page.ok and page.rows == 10 for page in pages))
+
+        # Unordered output, on a process pool shared between calls, ending on a short page
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            pages = list(bp.process_pages(sql, transform=to_ids, page_size=30, offset=5, ordered=False, executor=executor, max_pending=3))
+            self.assertEqual(sorted(page.offset for page in pages), [5, 35, 65, 95])
+            self.assertEqual(sorted(record_id for page in pages for record_id in page.result), list(range(6, 101)))
+
+            # Without a transform, the pages hold the decoded rows
+            pages = list(bp.process_pages(sql, page_size=50, executor=executor))
+            self.assertEqual(pages[0].result[0]['Id'], 1)
+
+        with self.assertRaises(ValueError):
+            bp.process_pages(f'{sql} OFFSET 10 ROWS')
+
+    def test_process_pages_errors(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials)
+        sql: str = "SELECT Id, Name FROM ACCOUNT WHERE 1=1"
+
+        with self.assertRaises(PageError) as context:
+            list(bp.process_pages(sql, transform=fail_on_id_41, page_size=10, processes=2))
+
+        self.assertEqual(context.exception.offset, 40)
+        self.assertEqual(context.exception.stage, 'decode')
+        self.assertIsInstance(context.exception.cause, ValueError)
+
+        # The failed page is reported in its place, and the other pages are still processed
+        pages: list[PageResult] = list(bp.process_pages(sql, transform=fail_on_id_41, page_size=10, processes=2, raise_errors=False))
+        self.assertEqual([page.ok for page in pages], [True] * 4 + [False] + [True] * 5)
+        self.assertEqual(pages[4].exception.offset, 40)
+
+    def test_process_pages_fetch_error(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials)
+        sql: str = "SELECT Id, Name FROM ACCOUNT WHERE 1=1"
+        fetch_page = pipeline._fetch_page
+
+        def fail_at_offset_30(client: BillingPlatform, url: str) -> bytes | None:
+            if 'OFFSET 30 ROWS' in requests.utils.unquote(url):
+                raise requests.ConnectionError('Connection reset')
+
+            return fetch_page(client, url)
+
+        with mock.patch.object(pipeline, '_fetch_page', side_effect=fail_at_offset_30):
+            with self.assertRaises(PageError) as context:
+                list(bp.process_pages(sql, transform=to_ids, page_size=10, processes=2))
+
+            self.assertEqual(context.exception.offset, 30)
+            self.assertEqual(context.exception.stage, 'fetch')
+            self.assertIsInstance(context.exception.cause, requests.ConnectionError)
+
+            # Whether rows follow a page that could not be fetched is unknown, so paging ends with it
+            pages: list[PageResult] = list(bp.process_pages(sql, transform=to_ids, page_size=10, processes=2, raise_errors=False))
+            self.assertEqual([page.offset for page in pages], [0, 10, 20, 30])
+            self.assertEqual([page.ok for page in pages], [True, True, True, False])
+
+    def test_process_pages_close(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        requests_sent: list[RequestEvent] = []
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials, instrumentation=Instrumentation(after_request=[requests_sent.append]))
+        sql: str = "SELECT Id, Name FROM ACCOUNT WHERE 1=1"
+        RecordingProcessPoolExecutor.instances.clear()
+
+        with mock.patch.object(pipeline, 'ProcessPoolExecutor', RecordingProcessPoolExecutor):
+            pages = bp.process_pages(sql, transform=to_ids, page_size=10, io_workers=1, processes=2, max_pending=2)
+            self.assertEqual(next(pages).result, list(range(1, 11)))
+            pages.close()
+
+        # The pool was started from the consuming thread before the I/O threads, and is shut down by close()
+        executor: RecordingProcessPoolExecutor = RecordingProcessPoolExecutor.instances[0]
+        self.assertIs(executor.submit_threads[0], threading.current_thread())
+        self.assertRaises(RuntimeError, executor.submit, to_ids, [])
+
+        # No more than the pending window was fetched, and nothing is fetched once the fetch in flight at close() ends
+        time.sleep(0.5)
+        sent: int = len(requests_sent)
+        self.assertLessEqual(sent, 3)
+        time.sleep(0.5)
+        self.assertEqual(len(requests_sent), sent)
+
+        # Closing early leaves a shared pool usable
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            pages = bp.process_pages(sql, transform=to_ids, page_size=10, executor=executor)
+            next(pages)
+            pages.close()
+            self.assertEqual(executor.submit(to_ids, [{'Id': '7'}]).result(), [7])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import logging
+import requests
+import threading
+import time
+import unittest
+
+from billingplatform import BillingPlatform
+from billingplatform.ratelimit import RateLimiter, RetryPolicy, parse_retry_after
+from unittest import mock
+from utils_for_testing import get_credentials
+
+
+class TestBillingPlatformRateLimiter(unittest.TestCase):
+    def test_backoff_and_recovery(self):
+        limiter: RateLimiter = RateLimiter(rate=20, max_concurrency=8, cooldown=0, rate_increase=50, concurrency_increase=10)
+
+        limiter.acquire()
+        limiter.release(429)
+        self.assertEqual(limiter.rate, 10)
+        self.assertEqual(limiter.concurrency_limit, 4)
+
+        for _ in range(20):
+            limiter.acquire()
+            limiter.release(200)
+
+        # Healthy responses recover throughput, but never above the configured maximums
+        self.assertEqual(limiter.rate, 20)
+        self.assertEqual(limiter.concurrency_limit, 8)
+        self.assertEqual(limiter.stats()['throttled'], 1)
+
+    def test_cooldown(self):
+        limiter: RateLimiter = RateLimiter(rate=16, cooldown=60)
+
+        for _ in range(3):
+            limiter.acquire()
+            limiter.release(429)
+
+        # A burst of throttled responses only counts as one decrease
+        self.assertEqual(limiter.rate, 8)
+
+    def test_retry_after_blocks_callers(self):
+        limiter: RateLimiter = RateLimiter(rate=1000, burst=10)
+
+        limiter.acquire()
+        limiter.release(429, retry_after=0.3)
+
+        _start: float = time.monotonic()
+        limiter.acquire()
+        limiter.release(200)
+        self.assertGreaterEqual(time.monotonic() - _start, 0.25)
+
+    def test_concurrency_limit_and_queue_depth(self):
+        limiter: RateLimiter = RateLimiter(rate=1000, burst=10, max_concurrency=1)
+        limiter.acquire()
+
+        _thread: threading.Thread = threading.Thread(target=lambda: (limiter.acquire(), limiter.release(200)))
+        _thread.start()
+        time.sleep(0.1)
+
+        self.assertEqual(limiter.in_flight, 1)
+        self.assertEqual(limiter.queue_depth, 1)
+
+        limiter.release(200)
+        _thread.join(timeout=1)
+        self.assertEqual(limiter.queue_depth, 0)
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_retry_policy(self):
+        policy: RetryPolicy = RetryPolicy(backoff_factor=1, max_backoff=4)
+
+        self.assertTrue(policy.is_retryable('GET'))
+        self.assertFalse(policy.is_retryable('POST'))
+        self.assertTrue(RetryPolicy(retry_writes=True).is_retryable('POST'))
+
+        for _attempt in range(10):
+            self.assertLessEqual(policy.backoff(_attempt), 4)
+
+        self.assertGreaterEqual(policy.backoff(0, retry_after=2), 2)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after('5'), 5.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after('soon'))
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+
+    def test_client_rate_limiter(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials, 
+                                              rate_limiter=RateLimiter(rate=50), 
+                                              retry_policy=RetryPolicy(max_retries=2))
+
+        response: dict = bp.query("SELECT Id, Name, Status FROM ACCOUNT WHERE 1=1", limit=10)
+
+        self.assertIsInstance(response, dict)
+        self.assertEqual(bp.rate_limiter.in_flight, 0)
+
+    def test_client_rate_limiter_releases_on_errors(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials, rate_limiter=RateLimiter(rate=100, max_concurrency=2))
+        send = bp.session.request
+
+        # Errors other than connection errors and timeouts are not retried, but must still free their slot
+        with mock.patch.object(bp.session, 'request', side_effect=requests.exceptions.ChunkedEncodingError('Connection broken')):
+            for _ in range(2): # As many as the concurrency limit, so a leak fails the check below rather than blocking
+                with self.assertRaises(Exception):
+                    bp.retrieve_by_id(entity='ACCOUNT', record_id=10)
+
+        self.assertEqual(bp.rate_limiter.stats()['in_flight'], 0)
+
+        with mock.patch.object(bp.session, 'request', side_effect=send):
+            self.assertEqual(bp.retrieve_by_id(entity='ACCOUNT', record_id=10)['retrieveResponse'][0]['Id'], 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import logging
+import unittest
+
+from billingplatform import BillingPlatform, exceptions
+from billingplatform.coalesce import RetrieveResult, group_ids
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+from utils_for_testing import get_credentials
+
+
+"""
+Tests assume an existing credentials file in the root directory. For more information of the expected format,
+see the utils_for_testing.py file.
+"""
+
+class TestBillingPlatformRetrieveByIds(unittest.TestCase):
+    def test_retrieve_by_ids(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials)
+
+        ids: list[int] = list(range(1, 61)) + [5, 100000, 100001]
+        result: RetrieveResult = bp.retrieve_by_ids(entity='ACCOUNT', ids=ids, max_url_length=200)
+
+        self.assertEqual(len(result.records), 60)
+        self.assertEqual(result.records[42]['Id'], 42)
+        self.assertEqual(result.missing, [100000, 100001])
+        self.assertGreater(result.requests, 1)
+
+    def test_group_ids(self):
+        groups: list[list] = list(group_ids(range(1000), 50, max_url_length=200))
+
+        self.assertEqual([_id for group in groups for _id in group], list(range(1000)))
+
+        for group in groups:
+            self.assertLessEqual(50 + len(quote(','.join(str(_id) for _id in group))), 200)
+
+        with self.assertRaises(ValueError):
+            list(group_ids(['x' * 300], 50, max_url_length=200))
+
+    def test_coalesced_retrieve_by_id(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials, coalesce_window=0.05)
+        calls: list[list] = []
+        retrieve_by_ids = bp.retrieve_by_ids
+        bp._coalescer.retrieve_many = lambda entity, ids: calls.append(ids) or retrieve_by_ids(entity, ids)
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            responses: list[dict] = list(executor.map(lambda _id: bp.retrieve_by_id(entity='ACCOUNT', record_id=_id), range(1, 17)))
+
+        self.assertEqual([response['retrieveResponse'][0]['Id'] for response in responses], list(range(1, 17)))
+        self.assertLess(len(calls), 16)
+
+        with self.assertRaises(exceptions.BillingPlatform404Exception):
+            bp.retrieve_by_id(entity='ACCOUNT', record_id=100000)
+
+
+if __name__ == '__main__':
+    unittest.main()
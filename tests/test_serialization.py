@@ -0,0 +1,88 @@
+import dataclasses
+import logging
+import unittest
+
+from billingplatform import BillingPlatform
+from billingplatform.cache import ResponseCache
+from billingplatform.serialization import Serializer, get_id, get_serializer
+from utils_for_testing import get_credentials
+
+
+"""
+Tests assume an existing credentials file in the root directory. For more information of the expected format,
+see the utils_for_testing.py file.
+"""
+
+@dataclasses.dataclass
+class Account:
+    Id: int
+    Name: str = ''
+
+
+class TestBillingPlatformSerialization(unittest.TestCase):
+    def test_backends(self):
+        for backend in ('json', 'orjson', 'msgspec'):
+            try:
+                serializer: Serializer = get_serializer(backend)
+            except ImportError:
+                continue # Optional backend not installed
+
+            self.assertEqual(serializer.dumps({'brmObjects': [{'Id': 1, 'Name': 'é'}]}), '{"brmObjects":[{"Id":1,"Name":"é"}]}'.encode('utf-8'))
+            self.assertEqual(serializer.loads(b'{"queryResponse":[{"Id":1}]}'), {'queryResponse': [{'Id': 1}]})
+
+            typed: dict = get_serializer(backend, entity_types={'account': Account}).loads_response(b'{"retrieveResponse":[{"Id":1,"Other":2}]}', 'ACCOUNT')
+            self.assertEqual(typed, {'retrieveResponse': [Account(Id=1)]})
+
+        self.assertIn(get_serializer().name, ('json', 'orjson', 'msgspec'))
+
+        with self.assertRaises(ValueError):
+            get_serializer('yaml')
+
+        with self.assertRaises(TypeError):
+            get_serializer('json', entity_types={'ACCOUNT': dict})
+
+    def test_typed_records(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        cache: ResponseCache = ResponseCache()
+        bp: BillingPlatform = BillingPlatform(**session_credentials,
+                                              cache=cache,
+                                              serializer=get_serializer(entity_types={'ACCOUNT': Account}))
+
+        records: list[Account] = bp.query("SELECT Id, Name FROM ACCOUNT WHERE Id <= 3")['queryResponse']
+        self.assertEqual([record.Id for record in records], [1, 2, 3])
+        self.assertIsInstance(bp.query("SELECT Id, Name FROM ACCOUNT WHERE Id <= 3")['queryResponse'][0], Account) # Cache hit
+        self.assertEqual(cache.stats()['hits'], 1)
+
+        self.assertEqual(bp.retrieve_by_id(entity='ACCOUNT', record_id=10)['retrieveResponse'][0].Id, 10)
+        self.assertEqual(sorted(bp.retrieve_by_ids('ACCOUNT', [4, 5, 1000]).records), [4, 5])
+        self.assertEqual(get_id(bp.retrieve_by_query(entity='ACCOUNT', queryAnsiSql="Id = 7")['retrieveResponse'][0]), 7)
+
+        # Other entities and writes are unaffected
+        self.assertIsInstance(bp.create(entity='INVOICE', data={'Name': 'Test'}), dict)
+
+    def test_request_parameter_headers(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        sent: list[dict] = []
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials,
+                                              request_compression_threshold=1024,
+                                              requests_parameters={
+                                                  'headers': {'X-Trace': 'trace-1'},
+                                                  'hooks': {'response': [lambda response, *args, **kwargs: sent.append(dict(response.request.headers))]},
+                                              })
+
+        bp.query("SELECT Id FROM ACCOUNT WHERE Id = 1")
+        bp.create(entity='ACCOUNT', data={'Name': 'Test Account'})
+        bp.create(entity='ACCOUNT', data=[{'Name': f'Test Account {i}'} for i in range(100)]) # Compressed body
+
+        # Writes add their own headers (ex. Content-Type) without dropping the headers of requests_parameters
+        self.assertEqual([headers.get('X-Trace') for headers in sent[-3:]], ['trace-1'] * 3)
+        self.assertEqual(sent[-2]['Content-Type'], 'application/json')
+        self.assertEqual(sent[-1]['Content-Encoding'], 'gzip')
+
+
+if __name__ == '__main__':
+    unittest.main()
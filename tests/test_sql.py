@@ -0,0 +1,71 @@
+import unittest
+
+from billingplatform.sql import add_predicate, clause_positions, find_clause, has_pagination, keyset_eligible, keyset_page_sql, remove_order_by, set_order_by, use_keyset
+
+
+class TestBillingPlatformSql(unittest.TestCase):
+    def test_clause_positions(self):
+        _keywords: list[str] = [p[0] for p in clause_positions("SELECT Id FROM ACCOUNT WHERE Status = 'ACTIVE' ORDER BY Id")]
+        self.assertEqual(_keywords, ['SELECT', 'FROM', 'WHERE', 'ORDER BY'])
+
+    def test_clause_positions_ignores_literals_and_subqueries(self):
+        _sql: str = "SELECT Id, OffsetDays FROM ACCOUNT WHERE Name = 'LIMIT ORDER BY' AND Id IN (SELECT AccountId FROM INVOICE WHERE 1=1)"
+        _keywords: list[str] = [p[0] for p in clause_positions(_sql)]
+        self.assertEqual(_keywords, ['SELECT', 'FROM', 'WHERE'])
+        self.assertIsNone(find_clause(_sql, 'ORDER BY'))
+
+    def test_add_predicate(self):
+        self.assertEqual(add_predicate('SELECT Id FROM ACCOUNT', 'Id > 5'), 
+                         'SELECT Id FROM ACCOUNT WHERE Id > 5')
+        self.assertEqual(add_predicate('SELECT Id FROM ACCOUNT WHERE A = 1 OR B = 2 ORDER BY Id', 'Id > 5'), 
+                         'SELECT Id FROM ACCOUNT WHERE (A = 1 OR B = 2) AND Id > 5 ORDER BY Id')
+
+    def test_set_order_by(self):
+        self.assertEqual(set_order_by('SELECT Id FROM ACCOUNT WHERE 1=1', 'Id ASC'), 
+                         'SELECT Id FROM ACCOUNT WHERE 1=1 ORDER BY Id ASC')
+        self.assertRaises(ValueError, set_order_by, 'SELECT Id FROM ACCOUNT ORDER BY Name', 'Id ASC')
+
+    def test_has_pagination(self):
+        self.assertTrue(has_pagination('SELECT Id FROM ACCOUNT WHERE 1=1 OFFSET 10 ROWS'))
+        self.assertTrue(has_pagination('SELECT Id FROM ACCOUNT WHERE 1=1 FETCH NEXT 10 ROWS ONLY'))
+        self.assertFalse(has_pagination("SELECT Id, OffsetDays, LimitAmount FROM ACCOUNT WHERE Name = 'OFFSET LIMIT'"))
+        self.assertFalse(has_pagination('SELECT Id FROM ACCOUNT WHERE Id IN (SELECT AccountId FROM INVOICE FETCH NEXT 1 ROWS ONLY)'))
+
+    def test_keyset_eligible(self):
+        self.assertTrue(keyset_eligible("SELECT Id, Name FROM ACCOUNT WHERE Status = 'ACTIVE'"))
+        self.assertTrue(keyset_eligible('SELECT * FROM ACCOUNT'))
+        self.assertTrue(keyset_eligible('SELECT a.Id, a.Name FROM ACCOUNT a WHERE 1=1 ORDER BY a.Id ASC'))
+        self.assertTrue(keyset_eligible("SELECT Name, Id FROM ACCOUNT WHERE Name = 'GROUP BY, Id'"))
+
+        self.assertFalse(keyset_eligible('SELECT Name FROM ACCOUNT'))                                  # Id is not selected
+        self.assertFalse(keyset_eligible('SELECT COUNT(Id) FROM ACCOUNT'))                             # Aggregate
+        self.assertFalse(keyset_eligible('SELECT DISTINCT Id FROM ACCOUNT'))
+        self.assertFalse(keyset_eligible('SELECT Id FROM ACCOUNT ORDER BY Name'))
+        self.assertFalse(keyset_eligible('SELECT Id FROM ACCOUNT ORDER BY Id DESC'))
+        self.assertFalse(keyset_eligible('SELECT Id, Status FROM ACCOUNT GROUP BY Id, Status'))
+        self.assertFalse(keyset_eligible('SELECT Id FROM ACCOUNT OFFSET 10 ROWS'))
+        self.assertFalse(keyset_eligible('SELECT a.Id FROM ACCOUNT a JOIN INVOICE i ON i.AccountId = a.Id'))
+        self.assertFalse(keyset_eligible('SELECT Id FROM ACCOUNT WHERE Id IN (SELECT AccountId FROM INVOICE)'))
+
+    def test_remove_order_by(self):
+        self.assertEqual(remove_order_by('SELECT Id FROM ACCOUNT WHERE 1=1 ORDER BY Id'), 'SELECT Id FROM ACCOUNT WHERE 1=1')
+        self.assertEqual(remove_order_by("SELECT Id FROM ACCOUNT WHERE Name = 'ORDER BY'"), "SELECT Id FROM ACCOUNT WHERE Name = 'ORDER BY'")
+
+    def test_use_keyset(self):
+        self.assertTrue(use_keyset('SELECT Id FROM ACCOUNT WHERE 1=1'))
+        self.assertFalse(use_keyset('SELECT Id FROM ACCOUNT WHERE 1=1', keyset=False))
+        self.assertFalse(use_keyset('SELECT Name FROM ACCOUNT WHERE 1=1'))
+
+        with self.assertRaises(ValueError):
+            use_keyset('SELECT Name FROM ACCOUNT WHERE 1=1', keyset=True)
+
+    def test_keyset_page_sql(self):
+        sql: str = "SELECT Id FROM ACCOUNT WHERE Status = 'ACTIVE' ORDER BY Id"
+
+        self.assertEqual(keyset_page_sql(sql), "SELECT Id FROM ACCOUNT WHERE Status = 'ACTIVE' ORDER BY Id ASC")
+        self.assertEqual(keyset_page_sql(sql, 10), "SELECT Id FROM ACCOUNT WHERE (Status = 'ACTIVE') AND Id > 10 ORDER BY Id ASC")
+        self.assertEqual(keyset_page_sql('SELECT Id FROM ACCOUNT', 10, 20), 'SELECT Id FROM ACCOUNT WHERE Id > 10 AND Id <= 20 ORDER BY Id ASC')
+
+
+if __name__ == '__main__':
+    unittest.main()
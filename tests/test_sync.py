@@ -0,0 +1,102 @@
+import json
+import logging
+import os
+import tempfile
+import unittest
+
+from billingplatform import BillingPlatform
+from billingplatform.sync import IncrementalSync, JSONStateStore, StateStore
+from utils_for_testing import get_credentials
+
+
+"""
+Tests assume an existing credentials file in the root directory. For more information of the expected format,
+see the utils_for_testing.py file.
+"""
+
+class TestBillingPlatformSync(unittest.TestCase):
+    def setUp(self):
+        self.directory: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.state_path: str = os.path.join(self.directory.name, 'sync_state.json')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_incremental_sync(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials)
+        rows: list = []
+
+        result = bp.sync('ACCOUNT', rows.extend, self.state_path, columns=['Name'], page_size=30, partitions=2)
+        self.assertEqual(result.rows, 100)
+        self.assertEqual(result.high_water_mark, 100)
+        self.assertEqual(sorted(row['Id'] for row in rows), list(range(1, 101)))
+
+        result = bp.sync('ACCOUNT', rows.extend, self.state_path)
+        self.assertEqual(result.rows, 0) # Nothing changed since the previous run
+        self.assertEqual(len(rows), 100)
+
+        with open(self.state_path, encoding='utf-8') as file:
+            state: dict = json.load(file)['ACCOUNT']
+
+        self.assertEqual(state['high_water_mark'], 100)
+        self.assertIsNone(state['run'])
+
+        with self.assertRaises(ValueError):
+            bp.sync('ACCOUNT', rows.extend, self.state_path, watermark='Name')
+
+    def test_sync_from_high_water_mark(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials)
+        store: JSONStateStore = JSONStateStore(self.state_path)
+        store.save('ACCOUNT', {'entity': 'ACCOUNT', 'watermark': 'Id', 'high_water_mark': 90, 'run': None})
+        rows: list = []
+
+        result = bp.sync('account', rows.extend, store)
+        self.assertEqual(result.previous_high_water_mark, 90)
+        self.assertEqual([row['Id'] for row in rows], list(range(91, 101)))
+
+    def test_resume_after_failure(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        session_credentials = get_credentials('credentials.json', 'login')
+        bp: BillingPlatform = BillingPlatform(**session_credentials)
+        sync: IncrementalSync = IncrementalSync(bp, self.state_path, page_size=20, partitions=1)
+        rows: list = []
+
+        def failing_sink(page: list) -> None:
+            if len(rows) == 40:
+                raise RuntimeError('Sink unavailable')
+            rows.extend(page)
+
+        with self.assertRaises(RuntimeError):
+            sync.run('ACCOUNT', failing_sink)
+
+        checkpoint: dict = JSONStateStore(self.state_path).load('ACCOUNT')
+        self.assertEqual(checkpoint['run']['last_id'], 40)
+        self.assertIsNone(checkpoint['high_water_mark'])
+
+        result = sync.run('ACCOUNT', rows.extend)
+        self.assertTrue(result.resumed)
+        self.assertEqual(result.rows, 100)
+        self.assertEqual([row['Id'] for row in rows], list(range(1, 101)))
+
+        sync.reset('account')
+        self.assertEqual(sync.run('ACCOUNT', lambda page: None).rows, 100)
+
+    def test_incomplete_state_store(self):
+        class LoadOnlyStateStore(StateStore):
+            def load(self, name: str) -> dict | None:
+                return None
+
+        # A store without save() fails when it is created, not at the first checkpoint
+        with self.assertRaises(TypeError):
+            LoadOnlyStateStore()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import logging
+import threading
+import unittest
+
+from billingplatform import BillingPlatform, BillingPlatformPool
+from billingplatform.multi import OperationResult
+from utils_for_testing import get_credentials
+
+
+"""
+Tests assume an existing credentials file in the root directory. For more information of the expected format,
+see the utils_for_testing.py file.
+
+The tenants of the pool all point at the same server, with either the login or the oauth credentials.
+"""
+
+class TestBillingPlatformPool(unittest.TestCase):
+    def tenants(self) -> dict[str, dict]:
+        return {
+            'tenant_a': get_credentials('credentials.json', 'login'),
+            'tenant_b': get_credentials('credentials.json', 'oauth'),
+            'tenant_c': get_credentials('credentials.json', 'login'),
+        }
+
+    def test_lazy_clients(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        with BillingPlatformPool(self.tenants(), logout_at_exit=False, pool_maxsize=4, timeout=30) as pool:
+            self.assertEqual(pool.created(), []) # No logins until a tenant is used
+
+            with self.assertNoLogs(level=logging.WARNING): # The pool logs its clients out, so no warning about automatic logout
+                client: BillingPlatform = pool['tenant_a']
+            self.assertIs(pool.client('tenant_a'), client)
+            self.assertEqual(client.pool_maxsize, 4)
+            self.assertEqual(client.requests_parameters['timeout'], 30)
+            self.assertIs(client.concurrency_limit, pool.concurrency_limit)
+            self.assertEqual(pool.created(), ['tenant_a'])
+
+            self.assertEqual(pool.execute('tenant_b', 'retrieve_by_id', 'ACCOUNT', 10)['retrieveResponse'][0]['Id'], 10)
+
+            with self.assertRaises(KeyError):
+                pool.client('tenant_z')
+
+        self.assertEqual(pool.created(), []) # Logged out on exit
+
+    def test_concurrent_authentication(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        tenants: dict[str, dict] = self.tenants()
+        tenants['broken'] = {'base_url': tenants['tenant_a']['base_url']} # No credentials
+        pool: BillingPlatformPool = BillingPlatformPool(tenants, logout_at_exit=False)
+
+        failed: dict[str, Exception] = pool.authenticate()
+        self.assertEqual(list(failed), ['broken'])
+        self.assertIsInstance(failed['broken'], ValueError)
+        self.assertEqual(sorted(pool.created()), ['tenant_a', 'tenant_b', 'tenant_c'])
+
+        # Threads asking for the same tenant get the same client
+        clients: list[BillingPlatform] = []
+        threads: list[threading.Thread] = [threading.Thread(target=lambda: clients.append(pool['tenant_b'])) for _ in range(8)]
+        [thread.start() for thread in threads]
+        [thread.join() for thread in threads]
+        self.assertEqual(len({id(client) for client in clients}), 1)
+
+        pool.close()
+
+    def test_map(self):
+        logging.basicConfig(level=logging.DEBUG)
+
+        tenants: dict[str, dict] = self.tenants()
+        tenants['broken'] = {'base_url': tenants['tenant_a']['base_url']}
+
+        with BillingPlatformPool(tenants, max_concurrency=2, logout_at_exit=False) as pool:
+            results: dict[str, OperationResult] = pool.map('query', 'SELECT Id, Name FROM ACCOUNT WHERE Id = 10')
+
+            self.assertEqual(list(results), ['tenant_a', 'tenant_b', 'tenant_c', 'broken'])
+            self.assertTrue(all(results[key].ok for key in ('tenant_a', 'tenant_b', 'tenant_c')))
+            self.assertEqual(results['tenant_c'].result['queryResponse'][0]['Id'], 10)
+            self.assertIsInstance(results['broken'].exception, ValueError)
+
+            results = pool.map('retrieve_by_id', 'ACCOUNT', 1000, keys=['tenant_a']) # No matching record
+            self.assertFalse(results['tenant_a'].ok)
+
+            with self.assertRaises(ValueError):
+                pool.map('logout')
+
+
+if __name__ == '__main__':
+    unittest.main()